@@ -1,109 +1,104 @@
 #!/usr/bin/env python3
 import argparse
+import importlib
 import json
+import os
 import sys
 from pathlib import Path
 
 sys.path.insert(0, str(Path(__file__).parent))
 
+from core.call_graph import CallGraph, CallGraphMetrics
 from core.project import ProjectContext
 from parser.project_parser import JavaProjectParser
-from metrics import ComplexityCalculator, InputMetricsCalculator, OutputMetricsCalculator, MetricsAggregator
+from metrics import DifficultyEngine, MetricsCache
+from metrics.registry import DEFAULT_REGISTRY
+from metrics.store import collect_metric_columns, save_metric_columns
 import pickle
+from typing import Iterable, Iterator, List, Optional, Set, Tuple
+
+
+def calculate_method_difficulty(
+    method_key: str,
+    project: ProjectContext,
+    graph_metrics: Optional[CallGraphMetrics] = None,
+) -> dict:
+    """
+    计算单个方法的难度指标。
+    批量计算时请直接使用 DifficultyEngine，避免重复构建计算器与方法→类映射。
+    """
+    return DifficultyEngine(project, graph_metrics).compute(method_key)
+
+
+def read_completed(path: str, fmt: str) -> Tuple[List[dict], Set[str]]:
+    """
+    读取已有输出文件中已完成的结果，返回 (结果列表, 已完成的方法键)。
+    ndjson 文件若因中断留下不完整的末行，会把该行截掉，便于之后继续追加。
+    """
+    if not os.path.exists(path):
+        return [], set()
+
+    if fmt == 'json':
+        with open(path, 'r', encoding='utf-8') as f:
+            results = json.load(f)
+    else:
+        results = []
+        valid_bytes = 0
+        with open(path, 'rb') as f:
+            for line in f:
+                try:
+                    if not line.endswith(b'\n'):
+                        raise ValueError('incomplete line')
+                    record = json.loads(line)
+                except ValueError:
+                    break
+                results.append(record)
+                valid_bytes += len(line)
+        if valid_bytes < os.path.getsize(path):
+            print(f"Truncating incomplete record at end of {path}", file=sys.stderr)
+            with open(path, 'r+b') as f:
+                f.truncate(valid_bytes)
+
+    completed = {r['method_fqn'] for r in results if 'method_fqn' in r}
+    return results, completed
+
+
+def write_results(results: Iterable[dict], output: Optional[str], fmt: str,
+                  previous: Optional[List[dict]] = None) -> int:
+    """
+    写出结果，返回本次写出的条数。
+    ndjson 每得到一条结果就写一行并及时刷新（断点续算时追加到已有文件末尾）；
+    json 需要完整列表，全部计算完成后一次性写出（previous 为续算前已有的结果）。
+    """
+    count = 0
+    if fmt == 'ndjson':
+        f = open(output, 'a', encoding='utf-8') if output else sys.stdout
+        try:
+            for result in results:
+                f.write(json.dumps(result, ensure_ascii=False))
+                f.write('\n')
+                f.flush()
+                count += 1
+        finally:
+            if output:
+                f.close()
+        return count
+
+    results = list(results)
+    count = len(results)
+    results = (previous or []) + results
+    if output:
+        with open(output, 'w', encoding='utf-8') as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+    else:
+        print(json.dumps(results, ensure_ascii=False, indent=2))
+    return count
 
 
-def calculate_method_difficulty(method_key: str, project: ProjectContext) -> dict:
-    """计算单个方法的难度指标"""
-    method = project.symbols.methods.get(method_key)
-    if not method:
-        return {'error': f'Method not found: {method_key}'}
-
-    # 获取方法所属类
-    class_fqn = None
-    for fqn, cls in project.symbols.classes.items():
-        if method_key in cls.methods:
-            class_fqn = fqn
-            break
-
-    # 初始化计算器
-    complexity_calc = ComplexityCalculator()
-    input_calc = InputMetricsCalculator(project.symbols)
-    output_calc = OutputMetricsCalculator()
-    aggregator = MetricsAggregator()
-
-    # 计算细粒度指标
-    fine_grained = {
-        '函数内部复杂度': {
-            'cyclomatic_complexity': complexity_calc.calculate_cyclomatic_complexity(method),
-            'branch_count': complexity_calc.calculate_branch_count(method),
-            'loop_count': complexity_calc.calculate_loop_count(method),
-            'exception_paths': complexity_calc.calculate_exception_paths(method),
-        },
-        '上下文依赖复杂度': {
-            'field_dependency_count': input_calc.calculate_field_dependency(method),
-            'external_call_count': input_calc.calculate_external_calls(method, class_fqn or ''),
-            'static_dependency_count': input_calc.calculate_static_dependency(method),
-        },
-        '跨文件模块复杂度': {
-            'dependent_class_count': input_calc.calculate_dependent_classes(method),
-            'cross_package_call_count': input_calc.calculate_cross_package_calls(method, class_fqn or ''),
-        },
-    }
-
-    param_metrics = input_calc.calculate_parameter_complexity(method)
-    fine_grained['输入构造复杂度'] = param_metrics
-
-    field_complexity = input_calc.calculate_field_type_complexity(method)
-    mock_complexity = output_calc.calculate_mock_complexity(method, class_fqn or '')
-    fine_grained['测试结构复杂度'] = {
-        'mock_requirement_score': mock_complexity,
-        'setup_complexity': output_calc.calculate_setup_complexity(param_metrics['parameter_type_complexity'], field_complexity),
-    }
-
-    fine_grained['测试范围'] = {
-        'minimum_test_case_count': fine_grained['函数内部复杂度']['cyclomatic_complexity'],
-    }
-
-    fine_grained['交互复杂度'] = {
-        'object_collaboration_count': (
-            param_metrics['parameter_count'] +
-            fine_grained['上下文依赖复杂度']['field_dependency_count'] +
-            fine_grained['跨文件模块复杂度']['dependent_class_count']
-        ),
-    }
-
-    side_effect_count = output_calc.calculate_side_effect_indicator(method)
-    fine_grained['可观测性难度'] = {
-        'return_type_complexity': output_calc.calculate_return_complexity(method.return_type),
-        'side_effect_count': side_effect_count,
-    }
-
-    external_calls = fine_grained['上下文依赖复杂度']['external_call_count']
-    fine_grained['断言构造难度'] = {
-        'assertion_complexity': output_calc.calculate_assertion_complexity(method, external_calls),
-    }
-
-    # 聚合所有指标用于评分
-    all_metrics = {}
-    for category in fine_grained.values():
-        all_metrics.update(category)
-
-    # 计算维度聚合分数
-    input_score = aggregator.aggregate_input_complexity(all_metrics)
-    output_score = aggregator.aggregate_output_complexity(all_metrics)
-    overall_score = aggregator.calculate_overall_difficulty(input_score, output_score)
-    difficulty_level = aggregator.classify_difficulty(overall_score)
-
-    return {
-        'method_fqn': method_key,
-        '细粒度指标': fine_grained,
-        '维度聚合分数': {
-            'input_complexity': round(input_score, 2),
-            'output_complexity': round(output_score, 2),
-        },
-        '总体难度分数': round(overall_score, 2),
-        '难度等级': difficulty_level,
-    }
+def _tee(results: Iterable[dict], kept: List[dict]) -> Iterator[dict]:
+    for result in results:
+        kept.append(result)
+        yield result
 
 
 def main():
@@ -112,44 +107,103 @@ def main():
     parser.add_argument('main_src', nargs='?', help='主代码目录')
     parser.add_argument('test_src', nargs='?', help='测试代码目录')
     parser.add_argument('--method', help='特定方法FQN#signature')
-    parser.add_argument('--output', help='输出JSON文件路径')
+    parser.add_argument('--output', help='输出文件路径')
     parser.add_argument('--load', help='加载已解析的项目JSON文件')
+    parser.add_argument('--format', choices=['json', 'ndjson'], default='json',
+                        help='输出格式：json 为完整列表；ndjson 每行一条结果，边算边写')
+    parser.add_argument('--jobs', type=int, default=1,
+                        help='并行计算的进程数（fork 子进程共享已加载的项目）')
+    parser.add_argument('--resume', action='store_true',
+                        help='跳过 --output 中已有结果的方法，只计算剩余方法')
+    parser.add_argument('--cache', help='细粒度指标缓存文件（SQLite），只重新计算源码或依赖类有变化的方法')
+    parser.add_argument('--columns', help='另存列式细粒度指标（.npz），供 rescore.py 调整权重后重新评分')
+    parser.add_argument('--metrics', help='只计算指定的指标（逗号分隔），不评分，用于筛选等场景')
+    parser.add_argument('--top-k', type=int, help='只输出总体难度最高的 K 个方法（按分数降序），跳过不可能进入前 K 名的方法')
+    parser.add_argument('--plugin', action='append', default=[],
+                        help='加载指标插件模块（模块导入时向 DEFAULT_REGISTRY 注册指标），可重复')
 
     args = parser.parse_args()
 
     if not args.load and not all([args.project_root, args.main_src, args.test_src]):
         parser.error('需要提供 project_root, main_src, test_src 或使用 --load')
+    if args.resume and not args.output:
+        parser.error('--resume 需要同时指定 --output')
+
+    for module in args.plugin:
+        importlib.import_module(module)
+    metric_names = None
+    if args.metrics:
+        metric_names = [name.strip() for name in args.metrics.split(',') if name.strip()]
+        unknown = [name for name in metric_names if name not in DEFAULT_REGISTRY.outputs]
+        if unknown:
+            parser.error(f'未知的指标: {unknown}，可用指标: {DEFAULT_REGISTRY.outputs}')
+        if args.columns or args.cache:
+            parser.error('--metrics 不评分，不能与 --columns / --cache 同时使用')
+    if args.top_k is not None and (args.metrics or args.resume):
+        parser.error('--top-k 不能与 --metrics / --resume 同时使用')
+    if args.top_k is not None and args.jobs > 1:
+        parser.error('--top-k 按上界逐个剪枝计算，只能单进程执行，不能与 --jobs 同时使用')
 
     # 解析或加载项目
     if args.load:
-        print(f"Loading project from {args.load}...")
+        print(f"Loading project from {args.load}...", file=sys.stderr)
         with open(args.load, 'rb') as f:
             project = pickle.load(f)
     else:
-        print(f"Parsing project at {args.project_root}...")
+        print(f"Parsing project at {args.project_root}...", file=sys.stderr)
         parser = JavaProjectParser()
-        project = parser.parse_project(args.project_root, args.main_src, args.test_src)
+        # 只计算单个方法时按需解析
+        project = parser.parse_project(args.project_root, args.main_src, args.test_src, lazy=bool(args.method))
+
+    # 调用图指标需要完整的调用图：对全部方法一次性计算；按需解析模式下调用图不完整，跳过
+    graph_metrics = None
+    if not getattr(project, 'lazy', False) and metric_names is None:
+        graph_metrics = CallGraph.from_symbols(project.symbols).analyze()
+
+    previous: List[dict] = []
+    completed: Set[str] = set()
+    if args.resume:
+        previous, completed = read_completed(args.output, args.format)
+        print(f"Resuming: {len(completed)} methods already in {args.output}", file=sys.stderr)
+    elif args.output and args.format == 'ndjson':
+        # 非续算时覆盖已有文件，之后统一以追加方式写入
+        open(args.output, 'w').close()
 
     # 计算指标
+    cache = MetricsCache(args.cache, project.symbols, DEFAULT_REGISTRY.outputs) if args.cache else None
+    engine = DifficultyEngine(project, graph_metrics, cache)
     if args.method:
-        result = calculate_method_difficulty(args.method, project)
-        results = [result]
+        if getattr(project, 'lazy', False):
+            # 深度与 calculate_nesting_depth 的上限一致
+            project.ensure_method_resolved(args.method, depth=6)
+        method_keys = [args.method]
     else:
-        print(f"Calculating difficulty for {len(project.symbols.methods)} methods...")
-        results = []
-        for method_key in project.symbols.methods:
-            result = calculate_method_difficulty(method_key, project)
-            results.append(result)
+        method_keys = list(project.symbols.methods)
+    method_keys = [key for key in method_keys if key not in completed]
+
+    print(f"Calculating difficulty for {len(method_keys)} methods...", file=sys.stderr)
+    if metric_names is not None:
+        results = engine.iter_metrics(metric_names, method_keys)
+    elif args.top_k is not None:
+        results = engine.top_k(args.top_k, method_keys)
+    else:
+        results = engine.iter_compute(method_keys, jobs=args.jobs)
 
-    # 输出结果
+    # 输出结果；需要列式文件时边写边保留结果
+    kept: List[dict] = []
+    if args.columns:
+        results = _tee(results, kept)
+    count = write_results(results, args.output, args.format, previous)
     if args.output:
-        with open(args.output, 'w', encoding='utf-8') as f:
-            json.dump(results, f, ensure_ascii=False, indent=2)
-        print(f"Results saved to {args.output}")
-    else:
-        print(json.dumps(results, ensure_ascii=False, indent=2))
+        print(f"{count} results saved to {args.output}", file=sys.stderr)
+    if args.columns:
+        method_keys, columns = collect_metric_columns(previous + kept)
+        save_metric_columns(args.columns, method_keys, columns)
+        print(f"{len(method_keys)} x {len(columns)} metric columns saved to {args.columns}", file=sys.stderr)
+    if cache is not None:
+        print(f"Metrics cache: {cache.hits}/{cache.hits + cache.misses} hits ({cache.hit_rate:.1%})", file=sys.stderr)
+        cache.close()
 
 
 if __name__ == '__main__':
     main()
-
@@ -0,0 +1,399 @@
+# core/call_graph.py
+from __future__ import annotations
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from core.symbol_table import GlobalSymbolTable
+
+
+# 可达性按列分块计算时每块的位数（64 的倍数），控制位集矩阵的内存占用
+_REACH_BLOCK_BITS = 4096
+
+
+@dataclass
+class CallGraph:
+    """
+    已解析调用图的 CSR（压缩稀疏行）表示。
+
+    ------------------------------------------------------------
+    节点为符号表中的全部方法，按 symbols.methods 的顺序编号；
+    边为 caller → callee，来自 resolved_method_key，
+    接口调用另外连向 polymorphic_targets 中的每个实现。重复边只保留一条。
+
+    keys / index:
+        节点编号 ↔ 方法键。
+
+    indptr / indices:
+        正向邻接：节点 i 的被调方法为 indices[indptr[i]:indptr[i + 1]]。
+
+    rindptr / rindices:
+        反向邻接：节点 i 的调用者为 rindices[rindptr[i]:rindptr[i + 1]]。
+    """
+
+    keys: List[str]
+    index: Dict[str, int]
+    indptr: np.ndarray
+    indices: np.ndarray
+    rindptr: np.ndarray
+    rindices: np.ndarray
+
+    # SCC 结果缓存：(每个节点所属 SCC 编号, SCC 数量)，编号按逆拓扑序（汇点在前）
+    _scc: Optional[Tuple[np.ndarray, int]] = field(default=None, repr=False)
+
+    # =====================================================================
+    # 构建
+    # =====================================================================
+    @classmethod
+    def from_symbols(cls, symbols: GlobalSymbolTable) -> "CallGraph":
+        keys = list(symbols.methods)
+        index = {k: i for i, k in enumerate(keys)}
+
+        src: List[int] = []
+        dst: List[int] = []
+        for caller_key, calls in symbols.method_calls.items():
+            u = index.get(caller_key)
+            if u is None:
+                continue
+            for call in calls:
+                targets = [call.resolved_method_key] + list(call.polymorphic_targets or ())
+                for callee_key in targets:
+                    v = index.get(callee_key)
+                    if v is not None:
+                        src.append(u)
+                        dst.append(v)
+
+        return cls.from_edges(keys, np.asarray(src, dtype=np.int64), np.asarray(dst, dtype=np.int64))
+
+    @classmethod
+    def from_edges(cls, keys: List[str], src: np.ndarray, dst: np.ndarray) -> "CallGraph":
+        n = len(keys)
+        if len(src):
+            # 去重并按 (src, dst) 排序
+            edge_ids = np.unique(src * n + dst)
+            src, dst = edge_ids // n, edge_ids % n
+
+        indptr, indices = _csr(src, dst, n)
+        rindptr, rindices = _csr(dst, src, n)
+        return cls(
+            keys=keys,
+            index={k: i for i, k in enumerate(keys)},
+            indptr=indptr,
+            indices=indices,
+            rindptr=rindptr,
+            rindices=rindices,
+        )
+
+    @property
+    def node_count(self) -> int:
+        return len(self.keys)
+
+    @property
+    def edge_count(self) -> int:
+        return int(self.indptr[-1])
+
+    def edges(self) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        返回 (src, dst) 边数组，按 src 有序。
+        """
+        src = np.repeat(np.arange(self.node_count, dtype=np.int64), np.diff(self.indptr))
+        return src, self.indices
+
+    def callees(self, i: int) -> np.ndarray:
+        return self.indices[self.indptr[i]:self.indptr[i + 1]]
+
+    def callers(self, i: int) -> np.ndarray:
+        return self.rindices[self.rindptr[i]:self.rindptr[i + 1]]
+
+    # =====================================================================
+    # 度数
+    # =====================================================================
+    def fan_out(self) -> np.ndarray:
+        return np.diff(self.indptr)
+
+    def fan_in(self) -> np.ndarray:
+        return np.diff(self.rindptr)
+
+    # =====================================================================
+    # 强连通分量
+    # =====================================================================
+    def strongly_connected_components(self) -> Tuple[np.ndarray, int]:
+        """
+        迭代式 Tarjan 算法，返回 (每个节点的 SCC 编号, SCC 数量)。
+        SCC 按完成顺序编号，即逆拓扑序：被调方所在的 SCC 编号小于调用方。
+        """
+        if self._scc is not None:
+            return self._scc
+
+        n = self.node_count
+        # 逐元素访问，Python 列表比 ndarray 标量索引快得多
+        indptr, indices = self.indptr.tolist(), self.indices.tolist()
+
+        order = [-1] * n
+        low = [0] * n
+        labels = [-1] * n
+        on_stack = [False] * n
+        stack: List[int] = []
+        counter = 0
+        count = 0
+
+        for root in range(n):
+            if order[root] != -1:
+                continue
+
+            # 调用栈元素：(节点, 下一条待访问边的位置)
+            work = [(root, indptr[root])]
+            order[root] = low[root] = counter
+            counter += 1
+            stack.append(root)
+            on_stack[root] = True
+
+            while work:
+                v, pos = work[-1]
+                end = indptr[v + 1]
+
+                descended = False
+                while pos < end:
+                    w = indices[pos]
+                    pos += 1
+                    if order[w] == -1:
+                        work[-1] = (v, pos)
+                        order[w] = low[w] = counter
+                        counter += 1
+                        stack.append(w)
+                        on_stack[w] = True
+                        work.append((w, indptr[w]))
+                        descended = True
+                        break
+                    if on_stack[w] and order[w] < low[v]:
+                        low[v] = order[w]
+                if descended:
+                    continue
+
+                work.pop()
+                if work:
+                    parent = work[-1][0]
+                    if low[v] < low[parent]:
+                        low[parent] = low[v]
+
+                if low[v] == order[v]:
+                    while True:
+                        w = stack.pop()
+                        on_stack[w] = False
+                        labels[w] = count
+                        if w == v:
+                            break
+                    count += 1
+
+        self._scc = (np.asarray(labels, dtype=np.int64), count)
+        return self._scc
+
+    def condensation(self, reverse: bool = False) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        SCC 缩点后的 DAG：返回 (indptr, indices, 每个 SCC 的节点数)，不含自环。
+        reverse=True 时返回反向邻接（SCC → 调用它的 SCC）。
+        """
+        labels, count = self.strongly_connected_components()
+        src, dst = self.edges()
+        csrc, cdst = labels[src], labels[dst]
+        keep = csrc != cdst
+        csrc, cdst = csrc[keep], cdst[keep]
+        if len(csrc):
+            edge_ids = np.unique(csrc * count + cdst)
+            csrc, cdst = edge_ids // count, edge_ids % count
+        if reverse:
+            csrc, cdst = cdst, csrc
+        indptr, indices = _csr(csrc, cdst, count)
+        sizes = np.bincount(labels, minlength=count)
+        return indptr, indices, sizes
+
+    # =====================================================================
+    # 可达性
+    # =====================================================================
+    def reachability_counts(self) -> np.ndarray:
+        """
+        每个方法可传递调用到的不同方法数（不含自身；处于递归环上时环内其他方法计入）。
+
+        在缩点 DAG 上按层计算：层号为到汇点的最长路径长度，
+        同一层的 SCC 只依赖更低层，因此每层用一次 bitwise_or.reduceat 合并后继的位集。
+        位集按列分块，内存占用为 SCC 数 × 块大小 / 8 字节。
+        """
+        labels, count = self.strongly_connected_components()
+        if count == 0:
+            return np.zeros(0, dtype=np.int64)
+
+        cindptr, cindices, sizes = self.condensation()
+        levels = _dag_levels(cindptr, cindices, count)
+        level_groups = _group_by_level(levels, cindptr, cindices)
+
+        reach = np.zeros(count, dtype=np.int64)
+        words_per_block = _REACH_BLOCK_BITS // 64
+        for start in range(0, count, _REACH_BLOCK_BITS):
+            stop = min(start + _REACH_BLOCK_BITS, count)
+            bits = np.zeros((count, words_per_block), dtype=np.uint64)
+
+            # 每个 SCC 先包含自身
+            own = np.arange(start, stop)
+            offset = own - start
+            bits[own, offset // 64] = np.left_shift(np.uint64(1), (offset % 64).astype(np.uint64))
+
+            for nodes, seg_starts, succ in level_groups:
+                merged = np.bitwise_or.reduceat(bits[succ], seg_starts, axis=0)
+                bits[nodes] |= merged
+
+            block_sizes = np.zeros(words_per_block * 64, dtype=np.int64)
+            block_sizes[:stop - start] = sizes[start:stop]
+            reach += _weighted_popcount(bits, block_sizes)
+
+        # 减去自身
+        return reach[labels] - 1
+
+    # =====================================================================
+    # 中心度
+    # =====================================================================
+    def pagerank(self, damping: float = 0.85, tol: float = 1e-10, max_iter: int = 100) -> np.ndarray:
+        """
+        幂迭代计算 PageRank；无出边方法的得分均匀分配给所有方法。
+        得分沿调用方向流动，被越多（越重要的）方法调用，得分越高。
+        """
+        n = self.node_count
+        if n == 0:
+            return np.zeros(0, dtype=np.float64)
+
+        src, dst = self.edges()
+        out_deg = self.fan_out().astype(np.float64)
+        dangling = out_deg == 0
+        inv_out = np.divide(1.0, out_deg, out=np.zeros(n), where=~dangling)
+
+        rank = np.full(n, 1.0 / n)
+        for _ in range(max_iter):
+            incoming = np.bincount(dst, weights=(rank * inv_out)[src], minlength=n)
+            new_rank = (1.0 - damping) / n + damping * (incoming + rank[dangling].sum() / n)
+            delta = np.abs(new_rank - rank).sum()
+            rank = new_rank
+            if delta < tol:
+                break
+        return rank
+
+    def analyze(self) -> "CallGraphMetrics":
+        """
+        一次性计算全部方法的图指标。
+        """
+        labels, _ = self.strongly_connected_components()
+        return CallGraphMetrics(
+            graph=self,
+            fan_in=self.fan_in(),
+            fan_out=self.fan_out(),
+            scc_size=np.bincount(labels)[labels] if len(labels) else labels,
+            reachable=self.reachability_counts(),
+            pagerank=self.pagerank(),
+        )
+
+
+@dataclass
+class CallGraphMetrics:
+    """
+    CallGraph.analyze() 的结果，各数组按 graph.keys 的顺序对齐。
+
+    scc_size:
+        方法所在强连通分量的大小；大于 1 表示处于（间接）递归环上。
+
+    reachable:
+        可传递调用到的不同方法数。
+
+    pagerank:
+        调用图上的 PageRank 中心度，所有方法之和为 1。
+    """
+
+    graph: CallGraph
+    fan_in: np.ndarray
+    fan_out: np.ndarray
+    scc_size: np.ndarray
+    reachable: np.ndarray
+    pagerank: np.ndarray
+
+    def for_method(self, method_key: str) -> Optional[dict]:
+        i = self.graph.index.get(method_key)
+        if i is None:
+            return None
+        return {
+            'fan_in': int(self.fan_in[i]),
+            'fan_out': int(self.fan_out[i]),
+            'recursive_cluster_size': int(self.scc_size[i]),
+            'reachable_method_count': int(self.reachable[i]),
+            'pagerank': float(self.pagerank[i]),
+        }
+
+
+# =========================================================================
+# 内部实现
+# =========================================================================
+def _csr(src: np.ndarray, dst: np.ndarray, n: int) -> Tuple[np.ndarray, np.ndarray]:
+    order = np.argsort(src, kind="stable")
+    indptr = np.zeros(n + 1, dtype=np.int64)
+    np.cumsum(np.bincount(src, minlength=n), out=indptr[1:])
+    return indptr, np.asarray(dst, dtype=np.int64)[order]
+
+
+def _dag_levels(indptr: np.ndarray, indices: np.ndarray, count: int) -> np.ndarray:
+    """
+    DAG 中每个节点到汇点的最长路径长度。
+    节点编号为逆拓扑序（后继编号更小），按编号递增即可保证后继先完成。
+    """
+    levels = np.zeros(count, dtype=np.int64)
+    for c in range(count):
+        lo, hi = indptr[c], indptr[c + 1]
+        if lo < hi:
+            levels[c] = levels[indices[lo:hi]].max() + 1
+    return levels
+
+
+def _group_by_level(
+    levels: np.ndarray, indptr: np.ndarray, indices: np.ndarray
+) -> List[Tuple[np.ndarray, np.ndarray, np.ndarray]]:
+    """
+    按层（从 1 开始）分组，返回每层的 (节点, 各节点后继段在 succ 中的起点, 拼接后的后继 succ)。
+    """
+    groups = []
+    for level in range(1, int(levels.max()) + 1 if len(levels) else 0):
+        nodes = np.flatnonzero(levels == level)
+        seg_starts, succ = gather_neighbors(indptr, indices, nodes)
+        groups.append((nodes, seg_starts, succ))
+    return groups
+
+
+def gather_neighbors(indptr: np.ndarray, indices: np.ndarray, nodes: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    拼接 nodes 中各节点的邻接区间，返回 (各节点区间在结果中的起点, 拼接后的邻居)。
+    """
+    deg = indptr[nodes + 1] - indptr[nodes]
+    seg_starts = np.zeros(len(nodes), dtype=np.int64)
+    np.cumsum(deg[:-1], out=seg_starts[1:])
+    starts = np.repeat(indptr[nodes] - seg_starts, deg)
+    positions = starts + np.arange(int(deg.sum()), dtype=np.int64)
+    return seg_starts, indices[positions]
+
+
+def _popcount(words: np.ndarray) -> np.ndarray:
+    if hasattr(np, "bitwise_count"):
+        return np.bitwise_count(words)
+    # NumPy < 2.0：按字节查表
+    return _BYTE_POPCOUNT[words.view(np.uint8)]
+
+
+_BYTE_POPCOUNT = np.array([bin(i).count("1") for i in range(256)], dtype=np.uint8)
+
+
+def _weighted_popcount(bits: np.ndarray, weights: np.ndarray) -> np.ndarray:
+    """
+    对每一行位集求 Σ weights[置位的位]。
+    绝大多数 SCC 只含一个方法，因此先按位计数，再对 weights > 1 的少数列补上差值。
+    """
+    out = _popcount(bits).sum(axis=1, dtype=np.int64)
+    heavy = np.flatnonzero(weights > 1)
+    for start in range(0, len(heavy), 256):
+        cols = heavy[start:start + 256]
+        hits = (bits[:, cols // 64] >> (cols % 64).astype(np.uint64)) & np.uint64(1)
+        out += hits.astype(np.int64) @ (weights[cols] - 1)
+    return out
@@ -0,0 +1,315 @@
+# core/classpath.py
+from __future__ import annotations
+import json
+import os
+import re
+import zipfile
+from xml.etree import ElementTree
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set
+
+from loguru import logger
+
+
+DEFAULT_CACHE_PATH = Path.home() / ".cache" / "java-parser" / "classpath-index.json"
+
+CACHE_VERSION = 1
+
+# 多版本 jar 中的类条目前缀，例如 META-INF/versions/11/
+_VERSIONS_PREFIX = "META-INF/versions/"
+
+
+@dataclass
+class ClasspathIndex:
+    """
+    外部类路径索引：包名 → 该包下的类简单名集合。
+
+    ------------------------------------------------------------
+    来源为本地的 jar / jmod 文件（~/.m2、JDK 的 lib/ 或 jmods/、用户指定列表），
+    只读取 zip 中央目录中的条目名，不解压任何类文件。
+
+    packages:
+        包名 → 简单名集合。内部类以 "Outer.Inner" 形式记录，
+        匿名类与局部类（$1、$1Local）被忽略。
+
+    索引结果按 jar 的路径 + 修改时间 + 大小缓存在磁盘上（JSON），
+    再次构建时未变化的 jar 直接复用缓存。
+    """
+
+    packages: Dict[str, Set[str]] = field(default_factory=dict)
+
+    # =====================================================================
+    # 查询
+    # =====================================================================
+    def contains(self, package: str, name: str) -> bool:
+        names = self.packages.get(package)
+        return names is not None and name in names
+
+    def has_class(self, fqn: str) -> bool:
+        """
+        判断 FQN 是否为索引中的类。FQN 中包名与（内部）类名的分界未知，
+        因此从右向左逐个尝试，例如 java.util.Map.Entry。
+        """
+        pos = fqn.rfind(".")
+        while pos > 0:
+            if self.contains(fqn[:pos], fqn[pos + 1:]):
+                return True
+            pos = fqn.rfind(".", 0, pos)
+        return False
+
+    def __len__(self):
+        return sum(len(names) for names in self.packages.values())
+
+    def __repr__(self):
+        return f"ClasspathIndex(packages={len(self.packages)}, classes={len(self)})"
+
+    # =====================================================================
+    # 构建
+    # =====================================================================
+    @classmethod
+    def build(cls, paths: Iterable[str], cache_path: Optional[str] = None) -> "ClasspathIndex":
+        """
+        为给定的 jar / jmod 文件或目录（递归查找其中的 *.jar、*.jmod）构建索引。
+        cache_path 为 None 时使用 DEFAULT_CACHE_PATH。
+        """
+        cache_file = Path(cache_path) if cache_path else DEFAULT_CACHE_PATH
+        cache = _load_cache(cache_file)
+        cached_archives = cache.setdefault("archives", {})
+
+        index = cls()
+        archives = _expand_archives(paths)
+        changed = False
+        hits = 0
+
+        for archive in archives:
+            stat = archive.stat()
+            key = str(archive.resolve())
+            entry = cached_archives.get(key)
+
+            if entry and entry.get("mtime") == stat.st_mtime and entry.get("size") == stat.st_size:
+                packages = entry["packages"]
+                hits += 1
+            else:
+                packages = _index_archive(archive)
+                if packages is None:
+                    continue
+                cached_archives[key] = {
+                    "mtime": stat.st_mtime,
+                    "size": stat.st_size,
+                    "packages": packages,
+                }
+                changed = True
+
+            for pkg, names in packages.items():
+                index.packages.setdefault(pkg, set()).update(names.split())
+
+        if changed:
+            _save_cache(cache_file, cache)
+
+        logger.info(f"类路径索引完成: {len(archives)} 个归档（缓存命中 {hits}），{index}")
+        return index
+
+
+def default_m2_archives(project_root: Optional[str] = None) -> List[str]:
+    """
+    本地 Maven 仓库（~/.m2/repository）中的 jar，每个构件只取一个版本，避免同一个类的多个版本互相冲突。
+
+    project_root 下有 pom.xml 时只取其中声明的依赖：版本写明（含 ${属性}）且本地存在时取该版本，
+    否则取本地最高版本；不展开传递依赖。没有 pom.xml 时取仓库中每个构件的最高版本。
+    """
+    repo = Path.home() / ".m2" / "repository"
+    if not repo.is_dir():
+        return []
+
+    pom = Path(project_root) / "pom.xml" if project_root else None
+    if pom is not None and pom.is_file():
+        dependencies = _pom_dependencies(pom)
+        if dependencies is not None:
+            archives = []
+            for group, artifact, version in dependencies:
+                jar = _m2_artifact_jar(repo / Path(*group.split(".")) / artifact, version)
+                if jar is not None:
+                    archives.append(str(jar))
+            return archives
+
+    # 构件目录 group/.../artifact/version/artifact-version.jar：按 artifact 目录分组取最高版本
+    archives = []
+    artifact_dirs = {jar.parent.parent for jar in repo.rglob("*.jar")}
+    for artifact_dir in sorted(artifact_dirs):
+        jar = _m2_artifact_jar(artifact_dir, None)
+        if jar is not None:
+            archives.append(str(jar))
+    return archives
+
+
+def jdk_archives(java_home: str) -> List[str]:
+    """
+    JDK 的类归档：JDK 9+ 为 jmods/*.jmod，JDK 8 为 jre/lib/ 或 lib/ 下的 jar。
+    """
+    home = Path(java_home)
+    for sub in ("jmods", "jre/lib", "lib"):
+        d = home / sub
+        if d.is_dir() and (any(d.glob("*.jmod")) or any(d.glob("*.jar"))):
+            return [str(d)]
+    return []
+
+
+# =========================================================================
+# 内部实现
+# =========================================================================
+def _expand_archives(paths: Iterable[str]) -> List[Path]:
+    archives: List[Path] = []
+    for p in paths:
+        path = Path(os.path.expanduser(p))
+        if path.is_dir():
+            archives.extend(sorted(path.rglob("*.jar")))
+            archives.extend(sorted(path.rglob("*.jmod")))
+        elif path.is_file():
+            archives.append(path)
+        else:
+            logger.warning(f"类路径不存在，已跳过: {p}")
+    return archives
+
+
+def _index_archive(archive: Path) -> Optional[Dict[str, str]]:
+    """
+    读取归档的中央目录，返回 包名 → 以空格分隔的简单名（紧凑形式，便于缓存）。
+    jmod 文件在 zip 数据前带有 4 字节头，zipfile 会按中央目录偏移自动处理。
+    """
+    try:
+        with zipfile.ZipFile(archive) as zf:
+            names = zf.namelist()
+    except (zipfile.BadZipFile, OSError) as e:
+        logger.warning(f"无法读取归档 {archive}: {e}")
+        return None
+
+    packages: Dict[str, Set[str]] = {}
+    for entry in names:
+        if not entry.endswith(".class"):
+            continue
+
+        if entry.startswith(_VERSIONS_PREFIX):
+            # META-INF/versions/<N>/a/b/C.class → a/b/C.class
+            parts = entry.split("/", 3)
+            if len(parts) < 4:
+                continue
+            entry = parts[3]
+        elif entry.startswith("classes/"):
+            # jmod 中的类位于 classes/ 下
+            entry = entry[len("classes/"):]
+
+        path = entry[:-len(".class")]
+        pkg_path, _, simple = path.rpartition("/")
+        if simple in ("module-info", "package-info"):
+            continue
+
+        # 匿名类 / 局部类：$ 之后以数字开头
+        segments = simple.split("$")
+        if any(not s or s[0].isdigit() for s in segments):
+            continue
+
+        packages.setdefault(pkg_path.replace("/", "."), set()).add(".".join(segments))
+
+    return {pkg: " ".join(sorted(names)) for pkg, names in packages.items()}
+
+
+def _version_key(version: str):
+    """
+    按段比较版本号：数字段按数值（1.10.0 > 1.9.2），版本结束 > 文字段，
+    因此 1.0.1 > 1.0 > 1.0-beta、1.0-SNAPSHOT。
+    """
+    parts = [(2, int(part), "") if part.isdigit() else (0, 0, part) for part in re.split(r"[.\-_]", version)]
+    return parts + [(1, 0, "")]
+
+
+def _m2_artifact_jar(artifact_dir: Path, version: Optional[str]) -> Optional[Path]:
+    """
+    构件目录下指定版本（None 或本地不存在时取最高版本）的主 jar，
+    即 artifact-version.jar，不含 -sources / -javadoc / -tests 等附属 jar。
+    """
+    if not artifact_dir.is_dir():
+        return None
+    artifact = artifact_dir.name
+    versions = [d.name for d in artifact_dir.iterdir() if (d / f"{artifact}-{d.name}.jar").is_file()]
+    if not versions:
+        return None
+    if version not in versions:
+        version = max(versions, key=_version_key)
+    return artifact_dir / version / f"{artifact}-{version}.jar"
+
+
+def _pom_dependencies(pom: Path) -> Optional[List[tuple]]:
+    """
+    读取 pom.xml 中直接声明的依赖 (groupId, artifactId, version)。version 中的 ${属性} 按 <properties>
+    与 project.version 替换，未写时取 dependencyManagement 中的版本，仍无法确定时为 None。
+    pom 无法解析时返回 None。
+    """
+    try:
+        root = ElementTree.parse(pom).getroot()
+    except (ElementTree.ParseError, OSError) as e:
+        logger.warning(f"无法读取 {pom}: {e}")
+        return None
+
+    ns = root.tag[:root.tag.index("}") + 1] if root.tag.startswith("{") else ""
+
+    def text(node, tag):
+        child = node.find(f"{ns}{tag}")
+        return child.text.strip() if child is not None and child.text else None
+
+    properties = {}
+    props = root.find(f"{ns}properties")
+    if props is not None:
+        for prop in props:
+            properties[prop.tag[len(ns):]] = (prop.text or "").strip()
+    parent = root.find(f"{ns}parent")
+    project_version = text(root, "version") or (text(parent, "version") if parent is not None else None)
+    if project_version:
+        properties.setdefault("project.version", project_version)
+
+    def substitute(value):
+        if value is None:
+            return None
+        value = re.sub(r"\$\{([^}]+)\}", lambda m: properties.get(m.group(1), m.group(0)), value)
+        return None if "${" in value else value
+
+    def declared(path):
+        for dep in root.findall(path):
+            group, artifact = substitute(text(dep, "groupId")), substitute(text(dep, "artifactId"))
+            if group and artifact:
+                yield group, artifact, substitute(text(dep, "version"))
+
+    # 未写版本的依赖使用 dependencyManagement 中的版本
+    managed = {
+        (group, artifact): version
+        for group, artifact, version in declared(f"{ns}dependencyManagement/{ns}dependencies/{ns}dependency")
+    }
+    return [
+        (group, artifact, version or managed.get((group, artifact)))
+        for group, artifact, version in declared(f"{ns}dependencies/{ns}dependency")
+    ]
+
+
+def _load_cache(cache_file: Path) -> dict:
+    if not cache_file.exists():
+        return {"version": CACHE_VERSION}
+    try:
+        with open(cache_file, "r", encoding="utf-8") as f:
+            cache = json.load(f)
+    except (OSError, ValueError) as e:
+        logger.warning(f"类路径索引缓存读取失败，将重新构建: {e}")
+        return {"version": CACHE_VERSION}
+    if cache.get("version") != CACHE_VERSION:
+        return {"version": CACHE_VERSION}
+    return cache
+
+
+def _save_cache(cache_file: Path, cache: dict):
+    try:
+        cache_file.parent.mkdir(parents=True, exist_ok=True)
+        tmp = cache_file.with_suffix(".tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(cache, f, separators=(",", ":"))
+        tmp.replace(cache_file)
+    except OSError as e:
+        logger.warning(f"类路径索引缓存写入失败: {e}")
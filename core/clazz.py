@@ -1,11 +1,11 @@
 # core/class.py
 from __future__ import annotations
 from dataclasses import dataclass, field
-from typing import Dict, List, Optional, Set
+from typing import Dict, List, Optional, Set, Tuple
 
 from core.variables import FieldInfo
 from core.method import MethodInfo
-from core.types import TypeInfo
+from core.types import TypeInfo, erase_type_parameters
 
 
 @dataclass
@@ -23,6 +23,7 @@ class ClassInfo:
 
         - superclass_name      → extends 后面的名字（仅名字，未解析）
         - interface_names      → implements 后面的名字列表（未解析）
+        - type_parameters      → 类声明的类型参数及其上界
 
         - fields               → 所有字段 FieldInfo（类型尚未解析）
         - methods              → 所有方法 MethodInfo（返回值和参数类型尚未解析）
@@ -36,6 +37,7 @@ class ClassInfo:
         - interfaces           → 解析后的接口列表 ClassInfo
         - children             → 当前类的所有直接子类
         - interface_impls      → 当前接口被哪些类实现
+        - supertype_arguments  → extends / implements 中给出的类型实参
 
         - field.type.resolved_fqn        → 字段类型解析后的 FQN
         - method.return_type.resolved_fqn → 返回值最终类型
@@ -61,6 +63,10 @@ class ClassInfo:
     interface_names:
         implements 后原始出现的接口名列表，如 ["Runnable", "Serializable"]。
 
+    type_parameters:
+        类型参数名 → 第一个上界（没有上界时为 None），如 class Box<T extends Number> → {"T": Number}。
+        上界与字段类型一样在类型解析阶段填入 resolved_fqn。
+
     fields:
         字段表。键是字段名，值是 FieldInfo。
         FieldInfo.type.raw 是源码类型，比如 "List<User>"（未解析）。
@@ -87,6 +93,33 @@ class ClassInfo:
     interface_impls:
         若当前 ClassInfo 表示接口，则该字段存所有实现该接口的类。
 
+    supertype_arguments:
+        父类型 FQN → extends / implements 中给出的类型实参，如 implements Handler<String> →
+        {"...Handler": ["java.lang.String"]}。实参取解析后的 FQN（无法解析时取基础类型名，数组维度以 "[]" 保留），
+        本类自身的类型变量保留变量名，通配符为 None；原始类型（未给出实参）不记录。
+
+    types_resolved / inheritance_resolved:
+        第二阶段对应步骤是否已对本类执行，按需解析（lazy）模式据此避免重复解析。
+
+    ancestors:
+        线性化后的全部祖先（父类链优先，其次按声明顺序的接口，去重，不含自身）。
+        由 GlobalSymbolTable.ensure_member_tables() 计算，未计算时为 None。
+
+    member_fields:
+        字段名 → (声明类FQN, FieldInfo)，包含继承来的字段，自身字段优先。
+
+    member_methods:
+        方法名 → 方法键列表（由近及远，同签名只保留最近的声明），包含继承来的方法。
+
+    override_index:
+        可被 override 的签名 (方法名, 擦除后的参数类型) → 该签名在本类中可见的最近声明的方法键，
+        包含继承来的方法。由 GlobalSymbolTable.ensure_override_index() 在类型解析后计算。
+
+    type_bindings:
+        祖先中的泛型类型 FQN → {其类型参数: 在本类中代入的类型}，值的写法同 supertype_arguments；
+        原始类型继承时为擦除结果。由 GlobalSymbolTable.ensure_override_index() 计算，
+        用于把泛型祖先的方法签名代入类型实参后与本类方法比较。
+
     ------------------------------------------------------------
     """
 
@@ -97,6 +130,7 @@ class ClassInfo:
 
     superclass_name: Optional[str] = None
     interface_names: List[str] = field(default_factory=list)
+    type_parameters: Dict[str, Optional[TypeInfo]] = field(default_factory=dict)
 
     modifiers: Set[str] = field(default_factory=set)
     annotations: List[str] = field(default_factory=list)
@@ -114,17 +148,61 @@ class ClassInfo:
     interfaces: List["ClassInfo"] = field(default_factory=list)
     children: List["ClassInfo"] = field(default_factory=list)
     interface_impls: List["ClassInfo"] = field(default_factory=list)
+    supertype_arguments: Dict[str, List[Optional[str]]] = field(default_factory=dict)
+
+    types_resolved: bool = field(default=False, repr=False)
+    inheritance_resolved: bool = field(default=False, repr=False)
+
+    ancestors: Optional[List["ClassInfo"]] = field(default=None, repr=False)
+    member_fields: Optional[Dict[str, Tuple[str, FieldInfo]]] = field(default=None, repr=False)
+    member_methods: Optional[Dict[str, List[str]]] = field(default=None, repr=False)
+    override_index: Optional[Dict[Tuple[str, Tuple[str, ...]], str]] = field(default=None, repr=False)
+    type_bindings: Optional[Dict[str, Dict[str, str]]] = field(default=None, repr=False)
+    _fqn: Optional[str] = field(default=None, init=False, repr=False, compare=False)
+
+    @property
+    def name_chain(self) -> Tuple[str, ...]:
+        """
+        从最外层类到当前类的简单名序列。
+        例如 Outer.Middle.Inner → ("Outer", "Middle", "Inner")。
+        """
+        chain = []
+        cur: Optional[ClassInfo] = self
+        while cur is not None:
+            chain.append(cur.name)
+            cur = cur.outer_class
+        return tuple(reversed(chain))
 
     @property
     def fqn(self) -> str:
         """
         构建类的完全限定名。
-        对内部类使用：package.Outer.Inner 的形式。
+        对内部类沿 outer_class 链逐层拼接：package.Outer.Middle.Inner 的形式。
+        package 与 outer_class 在文件解析完成时即已确定，首次访问时计算并缓存。
+        """
+        if self._fqn is None:
+            pkg = f"{self.package}." if self.package else ""
+            self._fqn = pkg + ".".join(self.name_chain)
+        return self._fqn
+
+    def type_variable_erasures(self) -> Dict[str, str]:
+        """
+        类体内可见的类型变量 → 擦除结果（第一个上界，没有上界时为 java.lang.Object）。
+        非静态内部类还能看到外部类的类型变量，内层的同名类型变量遮蔽外层。要求上界已解析。
         """
-        pkg = f"{self.package}." if self.package else ""
-        if self.outer_class:
-            return f"{pkg}{self.outer_class.name}.{self.name}"
-        return f"{pkg}{self.name}"
+        chain = []
+        cur: Optional[ClassInfo] = self
+        while cur is not None:
+            chain.append(cur)
+            if cur.kind != "class" or "static" in cur.modifiers:
+                break
+            cur = cur.outer_class
+
+        erasures: Dict[str, str] = {}
+        for c in reversed(chain):
+            if c.type_parameters:
+                erasures.update(erase_type_parameters(c.type_parameters, erasures))
+        return erasures
 
     def add_method(self, method: MethodInfo):
         """
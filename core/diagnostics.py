@@ -0,0 +1,71 @@
+# core/diagnostics.py
+from __future__ import annotations
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Dict, List, Tuple
+
+from loguru import logger
+
+
+@dataclass
+class ResolutionDiagnostics:
+    """
+    类型解析诊断信息的汇总。
+
+    解析过程中不再逐处输出告警，而是按 (文件, 类型名) 计数，
+    在 resolve_all 结束时输出一份按出现次数排序的摘要。
+    同一文件内同名类型只真正解析一次（失败结果缓存在 ImportScope.resolved），
+    这里只做计数。
+
+    ------------------------------------------------------------
+    字段含义：
+
+    unresolved:
+        (文件路径, 类型名) → 解析失败的出现次数。
+
+    resolved_count:
+        成功解析的类型出现次数。
+    """
+
+    unresolved: Dict[Tuple[str, str], int] = field(default_factory=dict)
+    resolved_count: int = 0
+
+    def record_resolved(self):
+        self.resolved_count += 1
+
+    def record_unresolved(self, file_path: str, name: str):
+        key = (file_path, name)
+        self.unresolved[key] = self.unresolved.get(key, 0) + 1
+
+    @property
+    def unresolved_count(self) -> int:
+        return sum(self.unresolved.values())
+
+    def ranked_names(self) -> List[Tuple[str, int, int]]:
+        """
+        按出现次数降序返回 (类型名, 出现次数, 涉及文件数)。
+        """
+        occurrences: Counter = Counter()
+        files: Counter = Counter()
+        for (_, name), count in self.unresolved.items():
+            occurrences[name] += count
+            files[name] += 1
+        return sorted(
+            ((name, count, files[name]) for name, count in occurrences.items()),
+            key=lambda x: (-x[1], x[0]),
+        )
+
+    def log_summary(self, top: int = 20):
+        total = self.resolved_count + self.unresolved_count
+        if not self.unresolved:
+            logger.info(f"【类型解析】{total} 处类型全部解析成功")
+            return
+
+        ranked = self.ranked_names()
+        file_count = len({path for path, _ in self.unresolved})
+        logger.warning(
+            f"【类型解析】{self.unresolved_count}/{total} 处类型无法解析为已知类"
+            f"（{len(ranked)} 个不同类型名，涉及 {file_count} 个文件），出现最多的 {min(top, len(ranked))} 个："
+        )
+        for name, count, files in ranked[:top]:
+            logger.warning(f"    {name:<40} {count:>8} 次  {files:>6} 个文件")
@@ -33,6 +33,42 @@ class ImportInfo:
         return f"ImportInfo(path={self.path})"
 
 
+@dataclass
+class ImportScope:
+    """
+    文件级 import 作用域，由 FileInfo.get_import_scope() 构建一次后复用。
+
+    ------------------------------------------------------------
+    字段含义：
+
+    explicit:
+        精确导入：简单名 → FQN，例如：
+            {"List": "java.util.List"}
+
+    wildcards:
+        通配导入对应的包名列表，例如：
+            import com.example.repo.*;  →  ["com.example.repo"]
+
+    resolved:
+        类型解析缓存：简单名 → 解析结果。
+        值为 None 表示已确认无法解析（负结果同样缓存）。
+    """
+
+    explicit: Dict[str, str] = field(default_factory=dict)
+    wildcards: List[str] = field(default_factory=list)
+    resolved: Dict[str, Optional[str]] = field(default_factory=dict)
+
+    @classmethod
+    def from_imports(cls, imports: List[ImportInfo]) -> "ImportScope":
+        scope = cls()
+        for imp in imports:
+            if imp.is_asterisk:
+                scope.wildcards.append(imp.path[:-2])
+            else:
+                scope.explicit.setdefault(imp.path.split(".")[-1], imp.path)
+        return scope
+
+
 @dataclass
 class FileInfo:
     """
@@ -54,6 +90,9 @@ class FileInfo:
     classes:
         当前文件中所有顶级 class/interface/enum/record。
         每个节点都是一个 ClassInfo。
+
+    import_scope:
+        由 imports 构建的 ImportScope 缓存，通过 get_import_scope() 访问。
     """
 
     path: str
@@ -62,5 +101,15 @@ class FileInfo:
     classes: List[ClassInfo] = field(default_factory=list)
     content: Optional[str] = None
 
+    import_scope: Optional[ImportScope] = field(default=None, repr=False, compare=False)
+
+    def get_import_scope(self) -> ImportScope:
+        """
+        返回文件的 import 作用域，首次访问时由 imports 构建。
+        """
+        if self.import_scope is None:
+            self.import_scope = ImportScope.from_imports(self.imports)
+        return self.import_scope
+
     def __repr__(self):
         return f"FileInfo(path={self.path}, classes={len(self.classes)})"
\ No newline at end of file
@@ -0,0 +1,177 @@
+# core/impact.py
+from __future__ import annotations
+import os
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from core.call_graph import CallGraph, gather_neighbors
+from core.project import ProjectContext
+
+
+@dataclass
+class ImpactResult:
+    """
+    变更影响分析结果。
+
+    ------------------------------------------------------------
+    changed:
+        作为起点的变更方法键（已去掉不在符号表中的键）。
+
+    affected:
+        受影响的方法键 → 距离（沿调用者方向的跳数，变更方法本身为 0），按距离、方法键排序。
+        距离在 SCC 缩点图上计算，同一递归环内的方法距离相同。
+
+    tests:
+        affected 中属于测试代码的方法键。
+
+    unmatched:
+        无法对应到方法的输入（未知方法键，或不落在任何方法内的文件行范围）。
+    """
+
+    changed: List[str] = field(default_factory=list)
+    affected: Dict[str, int] = field(default_factory=dict)
+    tests: List[str] = field(default_factory=list)
+    unmatched: List[str] = field(default_factory=list)
+
+    def to_dict(self) -> dict:
+        return {
+            'changed': self.changed,
+            'affected': [{'method': k, 'distance': d} for k, d in self.affected.items()],
+            'tests': self.tests,
+            'unmatched': self.unmatched,
+        }
+
+
+class ImpactAnalyzer:
+    """
+    基于反向调用图的变更影响分析。
+
+    反向邻接在 SCC 缩点后的 DAG 上遍历，每个 SCC 至多访问一次，
+    总代价与调用图规模成线性，大的递归环不会被反复展开。
+    """
+
+    def __init__(self, project: ProjectContext, graph: Optional[CallGraph] = None):
+        self.project = project
+        self.graph = graph or CallGraph.from_symbols(project.symbols)
+
+        self.labels, _ = self.graph.strongly_connected_components()
+        self.rindptr, self.rindices, _ = self.graph.condensation(reverse=True)
+
+        self.is_test = self._test_method_mask()
+        self._file_methods: Optional[Dict[str, List[Tuple[int, int, str]]]] = None
+
+    # =====================================================================
+    # 输入映射
+    # =====================================================================
+    def methods_in_range(self, file_path: str, start_line: int, end_line: int) -> List[str]:
+        """
+        返回与文件行范围 [start_line, end_line]（从 1 开始，含两端）相交的方法键。
+        file_path 可以是解析时的路径，也可以是其后缀（如仓库内的相对路径）。
+        """
+        keys = []
+        for path, spans in self._methods_by_file().items():
+            if not _same_file(path, file_path):
+                continue
+            keys.extend(
+                key for first, last, key in spans
+                if first <= end_line and last >= start_line
+            )
+        return keys
+
+    def _methods_by_file(self) -> Dict[str, List[Tuple[int, int, str]]]:
+        """
+        文件路径 → [(起始行, 结束行, 方法键)]，行号从 1 开始。
+        """
+        if self._file_methods is None:
+            by_file: Dict[str, List[Tuple[int, int, str]]] = {}
+            for key, m in self.project.symbols.methods.items():
+                fctx = self.project.class_files.get(key.split("#", 1)[0])
+                if fctx is None or not m.span:
+                    continue
+                by_file.setdefault(fctx.path, []).append(
+                    (m.span["start_line"] + 1, m.span["end_line"] + 1, key)
+                )
+            self._file_methods = by_file
+        return self._file_methods
+
+    def _test_method_mask(self) -> np.ndarray:
+        test_paths = set(self.project.test_files)
+        mask = np.zeros(self.graph.node_count, dtype=bool)
+        for i, key in enumerate(self.graph.keys):
+            fctx = self.project.class_files.get(key.split("#", 1)[0])
+            mask[i] = fctx is not None and fctx.path in test_paths
+        return mask
+
+    # =====================================================================
+    # 分析
+    # =====================================================================
+    def analyze(
+        self,
+        method_keys: Iterable[str] = (),
+        ranges: Iterable[Tuple[str, int, int]] = (),
+        max_depth: Optional[int] = None,
+    ) -> ImpactResult:
+        """
+        method_keys:  变更的方法键。
+        ranges:       变更的 (文件路径, 起始行, 结束行)，行号从 1 开始。
+        max_depth:    沿调用者方向最多展开的层数；None 表示不限。
+        """
+        result = ImpactResult()
+
+        seeds: Dict[str, None] = {}
+        for key in method_keys:
+            if key in self.graph.index:
+                seeds[key] = None
+            else:
+                result.unmatched.append(key)
+        for path, start, end in ranges:
+            keys = self.methods_in_range(path, start, end)
+            if not keys:
+                result.unmatched.append(f"{path}:{start}-{end}")
+            seeds.update(dict.fromkeys(keys))
+        result.changed = list(seeds)
+
+        if not seeds:
+            return result
+
+        distance = self._scc_distances(
+            np.array([self.graph.index[k] for k in seeds], dtype=np.int64), max_depth
+        )
+
+        node_distance = distance[self.labels]
+        nodes = np.flatnonzero(node_distance >= 0)
+        node_distance = node_distance[nodes]
+
+        keys = self.graph.keys
+        affected = sorted(
+            (int(d), keys[i], bool(self.is_test[i]))
+            for i, d in zip(nodes.tolist(), node_distance.tolist())
+        )
+        result.affected = {key: d for d, key, _ in affected}
+        result.tests = [key for _, key, is_test in affected if is_test]
+        return result
+
+    def _scc_distances(self, seed_nodes: np.ndarray, max_depth: Optional[int]) -> np.ndarray:
+        """
+        在反向缩点 DAG 上做分层 BFS，返回每个 SCC 的距离（未到达为 -1）。
+        """
+        distance = np.full(len(self.rindptr) - 1, -1, dtype=np.int64)
+        frontier = np.unique(self.labels[seed_nodes])
+        distance[frontier] = 0
+
+        depth = 0
+        while len(frontier) and (max_depth is None or depth < max_depth):
+            depth += 1
+            _, callers = gather_neighbors(self.rindptr, self.rindices, frontier)
+            callers = np.unique(callers)
+            frontier = callers[distance[callers] < 0]
+            distance[frontier] = depth
+        return distance
+
+
+def _same_file(path: str, query: str) -> bool:
+    path = os.path.normpath(path)
+    query = os.path.normpath(query)
+    return path == query or path.endswith(os.sep + query.lstrip(os.sep))
@@ -1,15 +1,26 @@
 # core/method.py
 from __future__ import annotations
+from array import array
 from dataclasses import dataclass, field
-from typing import List, Optional, Set
+import math
+from typing import Dict, List, Mapping, NamedTuple, Optional, Set, Tuple
 
-from core.types import TypeInfo
-from core.variables import ParameterInfo, LocalVariableInfo
+from core.types import TypeInfo, erase_type_parameters, erased_name
+from core.variables import ParameterInfo, LocalVariableInfo, FieldInfo
 
 
 @dataclass
 class ControlFlowInfo:
-    """控制流信息"""
+    """
+    控制流信息
+
+    field_accesses:
+        方法体中出现的字段访问原文（去重），例如 "this.repo"、"user.name"。
+
+    resolved_field_accesses:
+        第二阶段解析结果，与 field_accesses 一一对应：(声明类FQN, FieldInfo)，无法解析时为 None。
+        尚未解析时整个字段为 None。
+    """
     if_count: int = 0
     switch_count: int = 0
     for_count: int = 0
@@ -21,6 +32,55 @@ class ControlFlowInfo:
     logical_and_count: int = 0
     logical_or_count: int = 0
     field_accesses: List[str] = field(default_factory=list)
+    resolved_field_accesses: Optional[List[Optional[Tuple[str, FieldInfo]]]] = None
+
+
+class TokenStats(NamedTuple):
+    """
+    解析方法体时一次遍历得到的词法/结构统计（Halstead 基础计数与控制结构最大嵌套深度）。
+    以定长元组保存，派生指标按需计算。
+
+    distinct_operators / distinct_operands:
+        不同运算符（含关键字、运算与分隔符号）/ 不同操作数（标识符、字面量、this/super）的个数，即 η1 / η2。
+
+    total_operators / total_operands:
+        运算符 / 操作数出现的总次数，即 N1 / N2。
+
+    max_control_depth:
+        if / for / while / do / switch / try / synchronized 的最大嵌套层数；else if 与外层 if 同级。
+    """
+
+    distinct_operators: int = 0
+    distinct_operands: int = 0
+    total_operators: int = 0
+    total_operands: int = 0
+    max_control_depth: int = 0
+
+    @property
+    def vocabulary(self) -> int:
+        return self.distinct_operators + self.distinct_operands
+
+    @property
+    def length(self) -> int:
+        return self.total_operators + self.total_operands
+
+    @property
+    def volume(self) -> float:
+        """V = N · log2(η)"""
+        vocabulary = self.vocabulary
+        return self.length * math.log2(vocabulary) if vocabulary > 1 else 0.0
+
+    @property
+    def difficulty(self) -> float:
+        """D = (η1 / 2) · (N2 / η2)"""
+        if not self.distinct_operands:
+            return 0.0
+        return self.distinct_operators / 2 * self.total_operands / self.distinct_operands
+
+    @property
+    def effort(self) -> float:
+        """E = D · V"""
+        return self.difficulty * self.volume
 
 
 @dataclass
@@ -42,6 +102,10 @@ class MethodCallInfo:
         调用参数的类型列表（TypeInfo 列表）。
         第一阶段通常为空，第二阶段做类型推断后填入。
 
+    argument_count:
+        调用处实参个数，第一阶段由 argument_list 节点得到；
+        用于在同名重载中按参数个数筛选被调方法。
+
     span:
         在源代码中的具体位置。
 
@@ -52,6 +116,15 @@ class MethodCallInfo:
         推断出的唯一方法签名键，例如
         "save(com.example.User)"
 
+    resolved_method_key:
+        被调方法在符号表中的完整键（声明类FQN#签名）。
+        对继承来的方法，声明类可能是 resolved_fqn 的父类或接口。
+
+    polymorphic_targets:
+        接收者静态类型为接口时，运行时可能分派到的全部方法键
+        （接收者及其所有子类型上该签名的最近实现，不含抽象声明）；
+        其他调用为 None。
+
     ------------------------------------------------------------
     示例：
 
@@ -69,10 +142,13 @@ class MethodCallInfo:
     method_name: str
     content: Optional[str] = None
     argument_types: List[TypeInfo] = field(default_factory=list)
+    argument_count: Optional[int] = None
     span: Optional[object] = None
 
     resolved_fqn: Optional[str] = None
     resolved_method_signature: Optional[str] = None
+    resolved_method_key: Optional[str] = None
+    polymorphic_targets: Optional[List[str]] = None
 
 
 @dataclass
@@ -94,6 +170,9 @@ class MethodInfo:
     parameters:
         方法参数列表 ParameterInfo。
 
+    type_parameters:
+        方法自身声明的类型参数名 → 第一个上界（没有上界时为 None），如 <T extends Number> → {"T": Number}。
+
     modifiers:
         方法修饰符，例如 {"public", "static"}。
 
@@ -114,15 +193,32 @@ class MethodInfo:
 
     override_parent:
         若此方法是 override 的方法，则指向父类的方法。
+        父类与接口都声明了同一签名时，优先指向父类链上的方法。
 
     override_children:
-        所有 override 当前方法的子类方法。
+        所有直接 override 当前方法的子类方法。
+
+    bridge_signatures:
+        本方法经泛型替换后 override 的祖先方法的擦除签名中，与自身擦除签名不同的那些
+        （即编译器会为其生成桥方法的签名），所属类的 override_index 在这些签名下同样指向本方法。
+
+    token_stats:
+        解析方法体时统计的 Halstead 计数与控制结构最大嵌套深度（见 TokenStats）；
+        没有方法体的方法为全 0，旧版本解析结果为 None。
+
+    structure_fingerprint:
+        方法体的结构指纹：标识符归一化后各语法子树的哈希（去重排序的 array('I')），
+        用于结构克隆检测（见 filters.clone_index）。没有方法体的方法为空数组，旧版本解析结果为 None。
+
+    calls_resolved:
+        method_calls 的调用目标是否已解析（按需解析模式使用）。
     """
 
     name: str
     return_type: Optional[TypeInfo]
     content: Optional[str] = None
     parameters: List[ParameterInfo] = field(default_factory=list)
+    type_parameters: Dict[str, Optional[TypeInfo]] = field(default_factory=dict)
 
     modifiers: Set[str] = field(default_factory=set)
     annotations: List[str] = field(default_factory=list)
@@ -139,6 +235,12 @@ class MethodInfo:
 
     override_parent: Optional["MethodInfo"] = None
     override_children: List["MethodInfo"] = field(default_factory=list)
+    bridge_signatures: Tuple[Tuple[str, Tuple[str, ...]], ...] = field(default=(), repr=False)
+
+    token_stats: Optional[TokenStats] = field(default=None, repr=False)
+    structure_fingerprint: Optional[array] = field(default=None, repr=False)
+
+    calls_resolved: bool = field(default=False, repr=False)
 
     def signature_key(self) -> str:
         """
@@ -149,5 +251,26 @@ class MethodInfo:
         )
         return f"{self.name}({arg_types})"
 
+    def erased_signature(self, type_vars: Optional[Mapping[str, str]] = None) -> Tuple[str, Tuple[str, ...]]:
+        """
+        用于判定 override 的签名：(方法名, 擦除泛型后的参数类型)。
+        参数类型取解析后的 FQN（无法解析时取基础类型名），数组维度以 "[]" 保留。
+        type_vars 为所属类作用域中的类型变量 → 替换结果（通常是 ClassInfo.type_variable_erasures()，
+        匹配泛型祖先的方法时为代入类型实参后的类型）；方法自身的类型参数擦除为其第一个上界。
+        """
+        scope: Dict[str, str] = dict(type_vars) if type_vars else {}
+        if self.type_parameters:
+            scope.update(erase_type_parameters(self.type_parameters, scope))
+        return self.name, tuple(
+            erased_name(p.type, scope) + "[]" * p.type.array_dimension
+            for p in self.parameters
+        )
+
+    def is_overridable(self) -> bool:
+        """
+        构造器、static 方法与 private 方法不参与 override。
+        """
+        return not self.is_constructor and not ({"static", "private"} & self.modifiers)
+
     def __repr__(self):
         return f"MethodInfo(name={self.name}, return={self.return_type})"
\ No newline at end of file
@@ -1,14 +1,93 @@
 # core/project.py
 from __future__ import annotations
+import multiprocessing
+from collections import deque
 from dataclasses import dataclass, field
-from typing import Dict, Optional, List
+from typing import Dict, Iterator, Optional, List, Tuple
 from loguru import logger
 
-from core.file import FileInfo
+from core.classpath import ClasspathIndex
+from core.diagnostics import ResolutionDiagnostics
+from core.file import FileInfo, ImportScope
+from core.variables import FieldInfo
 from core.package import PackageInfo
 from core.symbol_table import GlobalSymbolTable
 from core.clazz import ClassInfo
-from core.types import TypeInfo
+from core.types import OBJECT_FQN, TypeInfo, type_arguments
+from core.method import MethodInfo, MethodCallInfo
+
+
+# 并行 resolve 时，fork 出的子进程通过该全局变量以 copy-on-write 方式共享项目
+_WORKER_PROJECT: Optional["ProjectContext"] = None
+
+
+def _resolve_types_worker(paths: List[str]) -> List[Tuple[str, List[Optional[str]]]]:
+    """
+    子进程：对一组文件做类型解析，按 _iter_type_slots 的顺序返回每个类型槽位的解析结果。
+    """
+    project = _WORKER_PROJECT
+    results = []
+    for path in paths:
+        fctx = project.main_files.get(path) or project.test_files[path]
+        project._resolve_types_in_file(fctx)
+        results.append((path, [
+            t.resolved_fqn for cls in fctx.classes for t in _iter_type_slots(cls)
+        ]))
+    return results
+
+
+def _resolve_calls_worker(caller_keys: List[str]) -> List[Tuple[str, List[Tuple[Optional[str], ...]], List]]:
+    """
+    子进程：对一组方法做调用解析，返回每个调用的 (resolved_fqn, 签名, 方法键)，
+    以及每个字段访问的 (声明类FQN, 字段名)（无法解析时为 None）。
+    """
+    project = _WORKER_PROJECT
+    results = []
+    for caller_key in caller_keys:
+        m = project.symbols.methods[caller_key]
+        project._resolve_calls_in_method(caller_key, m)
+        accesses = m.control_flow.resolved_field_accesses
+        results.append((caller_key, [
+            (c.resolved_fqn, c.resolved_method_signature, c.resolved_method_key)
+            for c in m.method_calls
+        ], None if accesses is None else [
+            (member[0], member[1].name) if member else None
+            for member in accesses
+        ]))
+    return results
+
+
+def _iter_type_slots(cls: ClassInfo) -> Iterator[TypeInfo]:
+    """
+    按固定顺序产出类中需要解析的类型：类型参数上界、字段、返回值、参数、局部变量。
+    """
+    for bound in cls.type_parameters.values():
+        if bound is not None:
+            yield bound
+    for f in cls.fields.values():
+        if f.type is not None:
+            yield f.type
+    for method_group in cls.methods.values():
+        for m in method_group:
+            for bound in m.type_parameters.values():
+                if bound is not None:
+                    yield bound
+            if m.return_type is not None:
+                yield m.return_type
+            for p in m.parameters:
+                yield p.type
+            for lv in m.local_variables:
+                yield lv.type
+
+
+def _shard(items: List, jobs: int) -> List[List]:
+    """
+    把 items 切成连续的分片（每个 worker 约 4 片，便于负载均衡且结果顺序确定）。
+    """
+    if not items:
+        return []
+    size = max(1, -(-len(items) // (jobs * 4)))
+    return [items[i:i + size] for i in range(0, len(items), size)]
 
 
 @dataclass
@@ -32,11 +111,26 @@ class ProjectContext:
     # 全局符号表：用于类型解析与继承解析
     symbols: GlobalSymbolTable = field(default_factory=GlobalSymbolTable)
 
+    # 类 FQN → 声明该类的文件（含内部类），用于取得类所在文件的 import 作用域
+    class_files: Dict[str, FileInfo] = field(default_factory=dict)
+
+    # 按需解析模式：类型/继承/调用在首次访问时解析（见 resolve_lazy）
+    lazy: bool = False
+
+    # 外部类路径索引（JDK / 依赖 jar），项目符号表中找不到的类型再到这里查找
+    classpath: Optional[ClasspathIndex] = None
+
+    # 类型解析诊断：无法解析的类型按 (文件, 类型名) 计数，resolve_all 结束时输出摘要
+    diagnostics: Optional[ResolutionDiagnostics] = field(default=None, repr=False)
+
+    # 按需解析模式：父类型简单名 → 声明了该父类型的类，用于按需找到子类型（见 _link_subtypes）
+    _subtype_candidates: Optional[Dict[str, List[ClassInfo]]] = field(default=None, repr=False)
+
     # =====================================================================
     # 文件注册（main/test）
     # =====================================================================
     def add_main_file(self, file_ctx: FileInfo):
-        logger.debug(f"[main] 注册文件: {file_ctx.path}")
+        logger.debug("[main] 注册文件: {}", file_ctx.path)
 
         self.main_files[file_ctx.path] = file_ctx
 
@@ -49,11 +143,12 @@ class ProjectContext:
 
         for cls in file_ctx.classes:
             pkg.classes[cls.name] = cls
+            self.class_files[cls.fqn] = file_ctx
             self.symbols.register_class(cls)
             self.symbols.register_methods(cls)
 
     def add_test_file(self, file_ctx: FileInfo):
-        logger.debug(f"[test] 注册文件: {file_ctx.path}")
+        logger.debug("[test] 注册文件: {}", file_ctx.path)
 
         self.test_files[file_ctx.path] = file_ctx
 
@@ -66,49 +161,159 @@ class ProjectContext:
 
         for cls in file_ctx.classes:
             pkg.classes[cls.name] = cls
+            self.class_files[cls.fqn] = file_ctx
             self.symbols.register_class(cls)
             self.symbols.register_methods(cls)
 
     # =====================================================================
     # 二阶段解析入口
     # =====================================================================
-    def resolve_all(self):
-        logger.info("【resolve】步骤 1/4：解析内部类结构 ...")
-        self._resolve_inner_classes()
+    def resolve_all(self, jobs: int = 1):
+        """
+        jobs > 1 时，类型解析与调用解析按分片交给 jobs 个子进程并行执行，
+        结果以普通元组返回，由父进程按原顺序合并；继承关系仍在父进程串行完成。
+        内部类与外部类的绑定在文件解析时（parse_single_class）已完成，这里不再处理。
+        """
+        if jobs > 1 and "fork" not in multiprocessing.get_all_start_methods():
+            logger.warning("当前平台不支持 fork，resolve_all 退回单进程执行")
+            jobs = 1
+
+        self.diagnostics = ResolutionDiagnostics()
+
+        logger.info("【resolve】步骤 1/3：解析类型信息 ...")
+        if jobs > 1:
+            self._resolve_type_info_parallel(jobs)
+        else:
+            self._resolve_type_info()
         logger.info("【resolve】步骤 1 完成")
 
-        logger.info("【resolve】步骤 2/4：解析类型信息 ...")
-        self._resolve_type_info()
+        logger.info("【resolve】步骤 2/3：解析继承关系 ...")
+        self._resolve_inheritance()
         logger.info("【resolve】步骤 2 完成")
 
-        logger.info("【resolve】步骤 3/4：解析继承关系 ...")
-        self._resolve_inheritance()
+        logger.info("【resolve】步骤 3/3：解析方法调用（call graph） ...")
+        if jobs > 1:
+            self._resolve_method_calls_parallel(jobs)
+        else:
+            self._resolve_method_calls()
         logger.info("【resolve】步骤 3 完成")
 
-        logger.info("【resolve】步骤 4/4：解析方法调用（call graph） ...")
-        self._resolve_method_calls()
-        logger.info("【resolve】步骤 4 完成")
+        self.diagnostics.log_summary()
 
     # =====================================================================
-    # 内部类结构
+    # 按需解析（lazy）
     # =====================================================================
-    def _resolve_inner_classes(self):
-        logger.debug("  正在处理内部类 ↔ 外部类 的绑定关系 ...")
+    def resolve_lazy(self):
+        """
+        不做任何解析，三个步骤全部推迟到 ensure_class_resolved / ensure_method_resolved
+        首次访问时按需执行，结果直接记在 ClassInfo / MethodInfo 上。
+        注意：该模式下 children / interface_impls、override_children 与调用图只包含已访问部分；
+        polymorphic_targets 计算时会按需挂上接收者的全部子类型，与完整解析一致。
+        """
+        logger.info("【resolve】按需解析模式：类型、继承与调用在首次访问时解析")
+        self.diagnostics = ResolutionDiagnostics()
+        self.lazy = True
 
-        for cls in self.symbols.classes.values():
-            parts = cls.fqn.split(".")
-            if len(parts) <= 2:
-                continue
+    def ensure_class_resolved(self, cls: ClassInfo) -> ClassInfo:
+        """
+        确保 cls 及其祖先的成员类型已解析，父类/接口链与 override 关系已建立。
+        """
+        self._ensure_types(cls)
+        self._ensure_hierarchy(cls)
+        self.symbols.ensure_member_tables(cls)
+        for ancestor in cls.ancestors:
+            self._ensure_types(ancestor)
+        self.symbols.ensure_override_index(cls)
+        return cls
+
+    def _ensure_types(self, cls: ClassInfo):
+        # 外部类的类型参数也在内部类的作用域内，其上界一并解析
+        cur: Optional[ClassInfo] = cls
+        while cur is not None:
+            if not cur.types_resolved:
+                file_ctx = self.class_files.get(cur.fqn)
+                if file_ctx is not None:
+                    self._resolve_types_in_class(cur, file_ctx)
+            cur = cur.outer_class
+
+    def ensure_method_resolved(self, method_key: str, depth: int = 1) -> Optional[MethodInfo]:
+        """
+        按需解析单个方法所需的信息：
+            - 所属类的类型与继承链
+            - 方法内的调用目标
+            - 参数/返回值类型对应的项目类，并沿字段类型向外展开 depth 层
+        """
+        m = self.symbols.get_method(method_key)
+        if m is None:
+            return None
+
+        cls = self.symbols.get_class(method_key.split("#", 1)[0])
+        if cls is not None:
+            self.ensure_class_resolved(cls)
+
+        if not m.calls_resolved:
+            self._resolve_calls_in_method(method_key, m)
+            dispatch_cache = {}
+            for call in m.method_calls:
+                if call.resolved_method_key:
+                    self.symbols.add_method_call(method_key, call)
+                self._set_polymorphic_targets(call, dispatch_cache)
+
+        types = [m.return_type] + [p.type for p in m.parameters]
+        frontier = [t.resolved_fqn for t in types if t is not None and t.resolved_fqn]
+        seen = set()
+        for _ in range(depth):
+            next_frontier = []
+            for fqn in frontier:
+                dep = self.symbols.get_class(fqn)
+                if fqn in seen or dep is None:
+                    continue
+                seen.add(fqn)
+                self.ensure_class_resolved(dep)
+                next_frontier.extend(
+                    f.type.resolved_fqn for f in dep.fields.values() if f.type.resolved_fqn
+                )
+            frontier = next_frontier
+
+        return m
+
+    def _ensure_lookup_ready(self, fqn: Optional[str]):
+        """
+        按需解析模式下，在某个类上查找字段/方法之前，确保该类及其祖先的成员类型与继承链已解析；
+        否则查到的成员类型尚未解析（resolved_fqn 为 None），字段链会在第一跳中断。
+        """
+        if not self.lazy or fqn is None:
+            return
+        cls = self.symbols.get_class(fqn)
+        if cls is not None:
+            self.ensure_class_resolved(cls)
 
-            outer_name = parts[-2]
-            simple = parts[-1]
+    def _ensure_hierarchy(self, cls: ClassInfo):
+        """
+        为 cls 及其所有祖先建立 extends / implements 关系（每个类只解析一次）。
+        """
+        stack = [cls]
+        while stack:
+            cur = stack.pop()
+            if cur.inheritance_resolved:
+                continue
+            self._resolve_class_inheritance(cur)
+            if cur.superclass is not None:
+                stack.append(cur.superclass)
+            stack.extend(cur.interfaces)
 
-            for candidate in self.symbols.classes.values():
-                if candidate.name == outer_name and candidate.package == cls.package:
-                    cls.outer_class = candidate
-                    candidate.inner_classes[simple] = cls
-                    logger.debug(f"    [内部类] {cls.fqn} 的外部类 = {candidate.fqn}")
-                    break
+    def _run_sharded(self, worker, items: List, jobs: int) -> List:
+        """
+        fork jobs 个子进程，以分片方式执行 worker；返回值按分片顺序拼接。
+        """
+        global _WORKER_PROJECT
+        shards = _shard(items, jobs)
+        _WORKER_PROJECT = self
+        try:
+            with multiprocessing.get_context("fork").Pool(jobs) as pool:
+                return [r for chunk in pool.map(worker, shards) for r in chunk]
+        finally:
+            _WORKER_PROJECT = None
 
     # =====================================================================
     # 类型解析
@@ -118,76 +323,107 @@ class ProjectContext:
 
         all_files = list(self.main_files.values()) + list(self.test_files.values())
         for fctx in all_files:
+            self._resolve_types_in_file(fctx)
+
+    def _resolve_type_info_parallel(self, jobs: int):
+        logger.debug(f"  使用 {jobs} 个进程并行解析类型 ...")
+
+        paths = list(self.main_files) + list(self.test_files)
+        for path, resolved in self._run_sharded(_resolve_types_worker, paths, jobs):
+            fctx = self.main_files.get(path) or self.test_files[path]
+            slots = [t for cls in fctx.classes for t in _iter_type_slots(cls)]
+            # 与串行的 resolve_type 相同：已有结果的槽位不重复计数
+            for t, fqn in zip(slots, resolved):
+                if t.is_primitive or t.base == "void" or t.resolved_fqn:
+                    continue
+                t.resolved_fqn = fqn
+                if fqn:
+                    self.diagnostics.record_resolved()
+                else:
+                    self.diagnostics.record_unresolved(path, t.base)
             for cls in fctx.classes:
-                self._resolve_types_in_class(cls, fctx)
+                cls.types_resolved = True
+
+    def _resolve_types_in_file(self, fctx: FileInfo):
+        # 每轮解析重建作用域，避免沿用符号表变化前的缓存结果
+        fctx.import_scope = None
+        for cls in fctx.classes:
+            self._resolve_types_in_class(cls, fctx)
+
+    def _resolve_simple_name(self, file_ctx: FileInfo, base: str) -> Optional[str]:
+        """
+        在 file_ctx 的作用域内把类型名解析为项目中的 FQN。
+        同一文件中每个不同的名字只解析一次，结果（含失败）缓存在 ImportScope 上。
+        """
+        scope = file_ctx.get_import_scope()
+        if base in scope.resolved:
+            return scope.resolved[base]
+
+        fqn = self._lookup_simple_name(scope, file_ctx.package_name or "", base)
+        scope.resolved[base] = fqn
+        return fqn
+
+    def _lookup_simple_name(self, scope: ImportScope, package: str, base: str) -> Optional[str]:
+        """
+        按 JLS 的遮蔽顺序查找：单类型导入 > 当前包 > 按需导入（import * 与 java.lang）。
+        每一级都同时查项目与外部类路径，外部类不会被较低优先级的项目同名类抢先匹配。
+        """
+        classes = self.symbols.classes
+        cp = self.classpath
+
+        # 1) base 是全限定名
+        if "." in base and (base in classes or (cp is not None and cp.has_class(base))):
+            return base
+
+        # 2) import 精确导入：遮蔽同名的当前包类与按需导入；导入的类未知时不再回退
+        imported = scope.explicit.get(base)
+        if imported:
+            if imported in classes or (cp is not None and cp.has_class(imported)):
+                return imported
+            return None
+
+        # 3) 当前包
+        candidate = f"{package}.{base}" if package else base
+        if candidate in classes:
+            return candidate
+
+        # 4) import * 与 java.lang 默认包
+        for pkg in scope.wildcards + ["java.lang"]:
+            cand = f"{pkg}.{base}"
+            if cand in classes or (cp is not None and cp.contains(pkg, base)):
+                return cand
+
+        return None
 
     def _resolve_types_in_class(self, cls: ClassInfo, file_ctx: FileInfo):
-        package = file_ctx.package_name or ""
-        imports = file_ctx.imports
+        diagnostics = self.diagnostics
 
         def resolve_type(t: Optional[TypeInfo]):
             if t is None:
                 return
-            if t.is_primitive:
+            if t.is_primitive or t.base == "void":
                 return
             if t.resolved_fqn:
                 return
 
-            base = t.base
-
-            # 1) base 是全限定名
-            if "." in base and self.symbols.get_class(base):
-                t.resolved_fqn = base
-                logger.debug(f"    [类型解析] {t.raw} 解析为 {base}")
-                return
-
-            # 2) 当前包
-            candidate = f"{package}.{base}" if package else base
-            if self.symbols.get_class(candidate):
-                t.resolved_fqn = candidate
-                logger.debug(f"    [类型解析] {t.raw} 解析为 {candidate}")
+            # 失败结果同样缓存在 ImportScope 上，同一文件中的同名类型不会重复查找
+            fqn = self._resolve_simple_name(file_ctx, t.base)
+            if fqn:
+                t.resolved_fqn = fqn
+                if diagnostics is not None:
+                    diagnostics.record_resolved()
+                # 使用延迟格式化：debug 未开启时不产生字符串拼接开销
+                logger.debug("    [类型解析] {} 解析为 {}", t.raw, fqn)
                 return
 
-            # 3) import 精确导入
-            for imp in imports:
-                if not imp.is_asterisk:
-                    if imp.path.split(".")[-1] == base:
-                        if self.symbols.get_class(imp.path):
-                            t.resolved_fqn = imp.path
-                            logger.debug(f"    [类型解析] {t.raw} 解析为 {imp.path}")
-                            return
-
-            # 4) import *
-            for imp in imports:
-                if imp.is_asterisk:
-                    pkg = imp.path[:-2]
-                    cand = f"{pkg}.{base}"
-                    if self.symbols.get_class(cand):
-                        t.resolved_fqn = cand
-                        logger.debug(f"    [类型解析] {t.raw} 解析为 {cand}")
-                        return
-
-            # 5) java.lang 默认包
-            jl = f"java.lang.{base}"
-            if self.symbols.get_class(jl):
-                t.resolved_fqn = jl
-                logger.debug(f"    [类型解析] {t.raw} 解析为 {jl}")
-                return
-
-            logger.warning(f"    [类型解析失败] {t.raw} 无法解析为已知类")
+            if diagnostics is not None:
+                diagnostics.record_unresolved(file_ctx.path, t.base)
 
-        # 字段
-        for field in cls.fields.values():
-            resolve_type(field.type)
+        # 字段、返回值、参数、局部变量
+        for t in _iter_type_slots(cls):
+            resolve_type(t)
 
-        # 方法
-        for method_group in cls.methods.values():
-            for m in method_group:
-                resolve_type(m.return_type)
-                for p in m.parameters:
-                    resolve_type(p.type)
-                for lv in m.local_variables:
-                    resolve_type(lv.type)
+        cls.types_resolved = True
 
     # =====================================================================
     # 继承链解析：extends & implements
@@ -196,80 +432,343 @@ class ProjectContext:
         logger.debug("  开始为所有类建立 extends / implements 关系 ...")
 
         for cls in self.symbols.classes.values():
+            self._resolve_class_inheritance(cls)
 
-            # ----------------- superclass -----------------
-            if cls.superclass_name:
-                fq = self._resolve_fqn(cls, cls.superclass_name)
-                sup = self.symbols.get_class(fq) if fq else None
-                if sup:
-                    cls.superclass = sup
-                    sup.children.append(cls)
-                    logger.debug(f"    [继承] {cls.fqn} extends {sup.fqn}")
-
-            # ----------------- interfaces -----------------
-            for name in cls.interface_names:
-                fq = self._resolve_fqn(cls, name)
-                itf = self.symbols.get_class(fq) if fq else None
-                if itf:
-                    cls.interfaces.append(itf)
-                    itf.interface_impls.append(cls)
-                    logger.debug(f"    [实现] {cls.fqn} implements {itf.fqn}")
+        # 继承关系建立后，按拓扑序为每个类计算祖先列表与继承成员表，
+        # 再按同一顺序以签名索引建立 override 关系
+        for cls in self.symbols.classes.values():
+            self.symbols.ensure_member_tables(cls)
+        for cls in self.symbols.classes.values():
+            self.symbols.ensure_override_index(cls)
+
+    def _resolve_class_inheritance(self, cls: ClassInfo):
+        if cls.inheritance_resolved:
+            return
+        cls.inheritance_resolved = True
+
+        # ----------------- superclass -----------------
+        if cls.superclass_name:
+            fq = self._resolve_fqn(cls, cls.superclass_name)
+            sup = self.symbols.get_class(fq) if fq else None
+            if sup:
+                cls.superclass = sup
+                sup.children.append(cls)
+                self._record_type_arguments(cls, sup, cls.superclass_name)
+                logger.debug("    [继承] {} extends {}", cls.fqn, sup.fqn)
+
+        # ----------------- interfaces -----------------
+        for name in cls.interface_names:
+            fq = self._resolve_fqn(cls, name)
+            itf = self.symbols.get_class(fq) if fq else None
+            if itf:
+                cls.interfaces.append(itf)
+                itf.interface_impls.append(cls)
+                self._record_type_arguments(cls, itf, name)
+                logger.debug("    [实现] {} implements {}", cls.fqn, itf.fqn)
+
+    def _record_type_arguments(self, cls: ClassInfo, sup: ClassInfo, name: str):
+        """
+        把 extends / implements 原文 name 中的类型实参解析后记入 cls.supertype_arguments[sup.fqn]。
+        cls 自身的类型变量保留变量名，外部类的类型变量取其擦除结果。
+        """
+        args = type_arguments(name)
+        if not args:
+            return
+        if self.lazy:
+            self._ensure_types(cls)
+        own = cls.type_parameters
+        erasures = cls.type_variable_erasures()
+
+        resolved: List[Optional[str]] = []
+        for arg in args:
+            if arg.startswith("?"):
+                resolved.append(None)
+                continue
+            base = arg.split("<", 1)[0].replace("[]", "").strip()
+            dims = "[]" * arg[arg.rfind(">") + 1:].count("[]")
+            if base in own:
+                resolved.append(base + dims)
+            elif base in erasures:
+                resolved.append(erasures[base] + dims)
+            else:
+                fqn = self._resolve_fqn(cls, base) or (OBJECT_FQN if base == "Object" else base)
+                resolved.append(fqn + dims)
+        cls.supertype_arguments[sup.fqn] = resolved
 
     def _resolve_fqn(self, cls: ClassInfo, name: str) -> Optional[str]:
         """
-        尝试把一个简单类名解析成全限定名。
+        尝试把 extends / implements 中出现的类名解析成全限定名。
+        与字段、参数类型共用声明文件的作用域解析（当前包、import、通配 import、java.lang）。
         """
-        # 如果 name 已经是 FQN
-        if "." in name and self.symbols.get_class(name):
-            return name
+        base = name.split("<", 1)[0].strip()
 
-        # 当前包
-        if cls.package:
-            cand = f"{cls.package}.{name}"
-            if self.symbols.get_class(cand):
-                return cand
+        file_ctx = self.class_files.get(cls.fqn)
+        if file_ctx is None:
+            return base if base in self.symbols.classes else None
 
-        # import 查找
-        for fctx in list(self.main_files.values()) + list(self.test_files.values()):
-            if cls in fctx.classes:
-                for imp in fctx.imports:
-                    if not imp.is_asterisk and imp.path.split(".")[-1] == name:
-                        return imp.path
+        return self._resolve_simple_name(file_ctx, base)
+
+    # =====================================================================
+    # 方法调用解析（call graph）
+    # =====================================================================
+    def _resolve_method_calls(self):
+        logger.debug("  开始解析方法调用目标 ...")
+
+        for caller_key, m in self.symbols.methods.items():
+            self._resolve_calls_in_method(caller_key, m)
+        self._register_call_edges()
+        self._resolve_polymorphic_targets()
+
+    def _resolve_method_calls_parallel(self, jobs: int):
+        logger.debug(f"  使用 {jobs} 个进程并行解析方法调用 ...")
+
+        caller_keys = list(self.symbols.methods)
+        for caller_key, resolved, fields in self._run_sharded(_resolve_calls_worker, caller_keys, jobs):
+            m = self.symbols.methods[caller_key]
+            for call, (fqn, signature, callee_key) in zip(m.method_calls, resolved):
+                call.resolved_fqn = fqn
+                call.resolved_method_signature = signature
+                call.resolved_method_key = callee_key
+            # 子进程返回的是副本，按 (声明类, 字段名) 取回父进程中的 FieldInfo
+            if fields is not None:
+                m.control_flow.resolved_field_accesses = [
+                    (f[0], self.symbols.classes[f[0]].fields[f[1]]) if f else None
+                    for f in fields
+                ]
+            m.calls_resolved = True
+        self._register_call_edges()
+        self._resolve_polymorphic_targets()
+
+    def _register_call_edges(self):
+        """
+        按方法表顺序把已解析出被调方法的调用登记到调用图。
+        """
+        for caller_key, m in self.symbols.methods.items():
+            for call in m.method_calls:
+                if call.resolved_method_key:
+                    self.symbols.add_method_call(caller_key, call)
+
+    def _resolve_polymorphic_targets(self):
+        """
+        为接收者静态类型是接口的调用填入 polymorphic_targets。
+        同一 (接口, 签名) 的分派目标只计算一次，结果列表在调用之间共享（只读）。
+        """
+        dispatch_cache = {}
+        for m in self.symbols.methods.values():
+            for call in m.method_calls:
+                self._set_polymorphic_targets(call, dispatch_cache)
+
+    def _set_polymorphic_targets(self, call: MethodCallInfo, dispatch_cache: Dict):
+        if not call.resolved_method_key:
+            return
+        receiver = self.symbols.get_class(call.resolved_fqn)
+        if receiver is None or receiver.kind != "interface":
+            return
+        callee = self.symbols.methods[call.resolved_method_key]
+        if not callee.is_overridable():
+            return
+
+        # 擦除签名依赖参数类型的解析结果：按需解析模式下先解析接收者与被调方法声明类（含祖先）
+        if self.lazy:
+            self.ensure_class_resolved(receiver)
+            self._ensure_lookup_ready(call.resolved_method_key.split("#", 1)[0])
+
+        sig = self.symbols.erased_signature(call.resolved_method_key)
+        targets = dispatch_cache.get((receiver.fqn, sig))
+        if targets is None:
+            targets = self._dispatch_targets(receiver, sig)
+            dispatch_cache[(receiver.fqn, sig)] = targets
+        call.polymorphic_targets = targets
+
+    def _dispatch_targets(self, receiver: ClassInfo, sig) -> List[str]:
+        """
+        沿 children / interface_impls 广度优先遍历 receiver 的所有子类型，
+        收集每个子类型上 sig 的最近实现（去重，跳过没有方法体的抽象声明）。
+        """
+        targets: List[str] = []
+        seen_keys = set()
+        seen_classes = {id(receiver)}
+        queue = deque([receiver])
+        while queue:
+            cur = queue.popleft()
+            if self.lazy:
+                self.ensure_class_resolved(cur)
+                self._link_subtypes(cur)
+            key = self.symbols.ensure_override_index(cur).override_index.get(sig)
+            if key is not None and key not in seen_keys:
+                seen_keys.add(key)
+                if self.symbols.methods[key].body_span is not None:
+                    targets.append(key)
+
+            for sub in cur.children + cur.interface_impls:
+                if id(sub) not in seen_classes:
+                    seen_classes.add(id(sub))
+                    queue.append(sub)
+        return targets
+
+    def _link_subtypes(self, cls: ClassInfo):
+        """
+        按需解析模式下，children / interface_impls 只包含继承链已解析的类。
+        这里为所有声明的父类/接口简单名与 cls 同名的类解析继承链，使 cls 的直接子类型全部挂上。
+        """
+        if self._subtype_candidates is None:
+            index: Dict[str, List[ClassInfo]] = {}
+            for c in self.symbols.classes.values():
+                names = ([c.superclass_name] if c.superclass_name else []) + list(c.interface_names)
+                for name in names:
+                    simple = name.split("<", 1)[0].strip().rsplit(".", 1)[-1]
+                    index.setdefault(simple, []).append(c)
+            self._subtype_candidates = index
+
+        for candidate in self._subtype_candidates.get(cls.name, ()):
+            self._ensure_hierarchy(candidate)
+
+    def _resolve_calls_in_method(self, caller_key: str, m: MethodInfo):
+        cls_fqn = caller_key.split("#", 1)[0]
+        cls = self.symbols.get_class(cls_fqn)
+        if cls is None:
+            return
+
+        file_ctx = self.class_files.get(cls_fqn)
+        scope = self._local_scope(m)
+
+        for call in m.method_calls:
+            receiver = self._resolve_call_receiver(call, cls, scope, file_ctx)
+
+            # 无 qualifier 或 qualifier 无法解析 → 默认是当前类
+            call.resolved_fqn = receiver or cls_fqn
+
+            # qualifier 无法解析时不猜测被调方法
+            if call.qualifier and not receiver:
+                continue
+
+            callee_key = self._find_callee(call.resolved_fqn, call.method_name, call.argument_count)
+            if callee_key:
+                call.resolved_method_signature = callee_key.split("#", 1)[1]
+                call.resolved_method_key = callee_key
+
+        # 字段访问与调用共用同一作用域解析
+        m.control_flow.resolved_field_accesses = [
+            self._resolve_field_access(text, cls, scope, file_ctx)
+            for text in m.control_flow.field_accesses
+        ]
+
+        m.calls_resolved = True
+
+    @staticmethod
+    def _local_scope(m: MethodInfo) -> Dict[str, TypeInfo]:
+        """
+        方法内的名字 → 类型：参数与局部变量（同名时先声明者优先）。
+        """
+        scope: Dict[str, TypeInfo] = {}
+        for p in m.parameters:
+            scope.setdefault(p.name, p.type)
+        for lv in m.local_variables:
+            scope.setdefault(lv.name, lv.type)
+        return scope
+
+    def _resolve_call_receiver(
+        self,
+        call: MethodCallInfo,
+        cls: ClassInfo,
+        scope: Dict[str, TypeInfo],
+        file_ctx: Optional[FileInfo],
+    ) -> Optional[str]:
+        """
+        推断调用接收者的静态类型 FQN；无 qualifier 或无法推断时返回 None。
+        """
+        qualifier = call.qualifier
+        if not qualifier:
+            return None
+        return self._resolve_qualifier_type(qualifier, cls, scope, file_ctx)
+
+    def _resolve_qualifier_type(
+        self,
+        qualifier: str,
+        cls: ClassInfo,
+        scope: Dict[str, TypeInfo],
+        file_ctx: Optional[FileInfo],
+    ) -> Optional[str]:
+        """
+        推断调用接收者或字段访问前缀表达式的静态类型 FQN。
+        支持 this / super / 名字 / 类名，以及由它们组成的字段访问链（a.b.c）。
+        """
+        if qualifier == "this":
+            return cls.fqn
+        if qualifier == "super":
+            return cls.superclass.fqn if cls.superclass else None
+
+        # 字段访问链：this.xxx、a.b 等，取最后一个字段的类型；否则可能是限定类名（Outer.Inner、com.foo.Bar）
+        if "." in qualifier:
+            member = self._resolve_field_access(qualifier, cls, scope, file_ctx)
+            if member is not None:
+                return member[1].type.resolved_fqn
+            if file_ctx is not None and not qualifier.startswith("this."):
+                return self._resolve_simple_name(file_ctx, qualifier)
+            return None
+
+        # 局部变量 / 参数优先于字段
+        t = scope.get(qualifier)
+        if t is not None:
+            return t.resolved_fqn
+
+        self._ensure_lookup_ready(cls.fqn)
+        member = self.symbols.lookup_field(cls.fqn, qualifier)
+        if member is not None:
+            return member[1].type.resolved_fqn
+
+        # 类名 → 静态调用
+        if qualifier[0].isupper() and file_ctx is not None:
+            return self._resolve_simple_name(file_ctx, qualifier)
 
         return None
 
-    def _resolve_method_calls(self):
-        for cls_fqn, cls in self.symbols.classes.items():
-            for _, mlist in cls.methods.items():
-                for m in mlist:
-                    caller_key = f"{cls_fqn}#{m.signature_key()}"
-
-                    for call in m.method_calls:
-                        target_fqn = None
-
-                        # qualifier 处理
-                        if call.qualifier:
-                            if call.qualifier in cls.fields:
-                                target_fqn = cls.fields[call.qualifier].type.resolved_fqn
-                            else:
-                                for lv in m.local_variables:
-                                    if lv.name == call.qualifier:
-                                        target_fqn = lv.type.resolved_fqn
-                                        break
-
-                        # 无 qualifier → 默认是当前类
-                        if not target_fqn:
-                            target_fqn = cls_fqn
-
-                        call.resolved_fqn = target_fqn
-
-                        # 找被调方法
-                        candidates = []
-                        for key in self.symbols.methods:
-                            if key.startswith(f"{target_fqn}#{call.method_name}("):
-                                candidates.append(key)
-
-                        if len(candidates) == 1:
-                            callee_key = candidates[0]
-                            call.resolved_method_signature = callee_key.split("#", 1)[1]
-                            self.symbols.add_method_call(caller_key, call)
\ No newline at end of file
+    def _resolve_field_access(
+        self,
+        text: str,
+        cls: ClassInfo,
+        scope: Dict[str, TypeInfo],
+        file_ctx: Optional[FileInfo],
+    ) -> Optional[Tuple[str, FieldInfo]]:
+        """
+        把字段访问表达式（如 this.repo、user.address.city、Foo.BAR）解析为 (声明类FQN, FieldInfo)。
+        前缀的类型由 _resolve_qualifier_type 推断，字段在该类型及其祖先中查找；
+        前缀含调用、下标等无法推断的表达式时返回 None。
+        """
+        qualifier, _, name = text.rpartition(".")
+        if not qualifier or not name.isidentifier():
+            return None
+
+        owner = self._resolve_qualifier_type(qualifier, cls, scope, file_ctx)
+        if owner is None:
+            return None
+        self._ensure_lookup_ready(owner)
+        return self.symbols.lookup_field(owner, name)
+
+    def _find_callee(self, target_fqn: str, method_name: str, argument_count: Optional[int]) -> Optional[str]:
+        """
+        在 target_fqn 及其祖先的继承成员表中查找被调方法，返回唯一匹配的方法键。
+        同名重载先按实参个数筛选：与 JLS 一样先找定长匹配，没有时再考虑可变参数方法
+        （实参个数 ≥ 形参个数 - 1）；仍不唯一时放弃。
+        """
+        target = self.symbols.get_class(target_fqn)
+        if target is None:
+            return None
+        self._ensure_lookup_ready(target_fqn)
+
+        keys = self.symbols.lookup_methods(target_fqn, method_name)
+        if not keys:
+            return None
+
+        candidates = keys
+        if argument_count is not None and len(keys) > 1:
+            methods = self.symbols.methods
+            candidates = [k for k in keys if len(methods[k].parameters) == argument_count]
+            if not candidates:
+                candidates = [
+                    k for k in keys
+                    if methods[k].parameters and methods[k].parameters[-1].is_varargs
+                    and argument_count >= len(methods[k].parameters) - 1
+                ]
+
+        return candidates[0] if len(candidates) == 1 else None
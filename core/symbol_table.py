@@ -1,19 +1,25 @@
 from __future__ import annotations
 from dataclasses import dataclass, field
-from typing import Dict, Optional, List
+from typing import Dict, Optional, List, Tuple
 
 from core.clazz import ClassInfo
 from core.method import MethodInfo, MethodCallInfo
+from core.variables import FieldInfo
 
 
 @dataclass
 class GlobalSymbolTable:
     """
     全局符号表：类表 + 方法表 + 调用图
+
+    methods_by_name:
+        (类FQN, 方法名) → 该类中同名重载的方法键列表，
+        用于调用解析时按名字定位候选方法。
     """
     classes: Dict[str, ClassInfo] = field(default_factory=dict)
     methods: Dict[str, MethodInfo] = field(default_factory=dict)
     method_calls: Dict[str, List[MethodCallInfo]] = field(default_factory=dict)
+    methods_by_name: Dict[Tuple[str, str], List[str]] = field(default_factory=dict)
 
     # 注册类
     def register_class(self, cls: ClassInfo):
@@ -31,9 +37,228 @@ class GlobalSymbolTable:
                 if key not in self.method_calls:
                     self.method_calls[key] = []
 
+                overloads = self.methods_by_name.setdefault((cls.fqn, m.name), [])
+                if key not in overloads:
+                    overloads.append(key)
+
     def get_method(self, key: str):
         return self.methods.get(key)
 
+    def get_overloads(self, class_fqn: str, method_name: str) -> List[str]:
+        return self.methods_by_name.get((class_fqn, method_name), [])
+
+    def erased_signature(self, method_key: str) -> Tuple[str, Tuple[str, ...]]:
+        """
+        方法在其声明类中的擦除签名（override_index 的键），类型变量按声明类的作用域擦除。
+        """
+        cls = self.classes.get(method_key.split("#", 1)[0])
+        return self.methods[method_key].erased_signature(cls.type_variable_erasures() if cls else None)
+
+    # 继承成员表
+    def ensure_member_tables(self, cls: ClassInfo) -> ClassInfo:
+        """
+        计算 cls 的 ancestors / member_fields / member_methods 并缓存在 ClassInfo 上。
+        沿 superclass / interfaces 做后序遍历，祖先总是先于子类计算，
+        每个类只计算一次；继承环上回指的祖先被忽略。
+        """
+        self._walk_ancestors_first(
+            cls, lambda c: c.ancestors is not None, self._build_member_tables
+        )
+        return cls
+
+    def ensure_override_index(self, cls: ClassInfo) -> ClassInfo:
+        """
+        计算 cls 的 override_index，并为 cls 中 override 祖先方法的方法
+        填入 override_parent / override_children。
+        与 ensure_member_tables 相同按拓扑序遍历，每个方法只做一次哈希查找，
+        总代价与方法数成线性。要求 cls 及其祖先的参数类型已解析。
+        """
+        self._walk_ancestors_first(
+            cls, lambda c: c.override_index is not None, self._build_override_index
+        )
+        return cls
+
+    @staticmethod
+    def _walk_ancestors_first(cls: ClassInfo, is_done, build):
+        """
+        迭代式后序遍历 cls 的继承图，对每个未完成的类调用 build(类, 已完成的直接父类型列表)。
+        """
+        if is_done(cls):
+            return
+
+        in_progress = set()
+        stack = [(cls, False)]
+        while stack:
+            cur, expanded = stack.pop()
+            if is_done(cur):
+                continue
+
+            supers = ([cur.superclass] if cur.superclass else []) + list(cur.interfaces)
+            if not expanded:
+                in_progress.add(id(cur))
+                stack.append((cur, True))
+                for sup in supers:
+                    if not is_done(sup) and id(sup) not in in_progress:
+                        stack.append((sup, False))
+                continue
+
+            build(cur, [sup for sup in supers if is_done(sup)])
+            in_progress.discard(id(cur))
+
+    def _build_member_tables(self, cls: ClassInfo, supers: List[ClassInfo]):
+        ancestors: List[ClassInfo] = []
+        seen = {id(cls)}
+        for sup in supers:
+            for a in [sup] + sup.ancestors:
+                if id(a) not in seen:
+                    seen.add(id(a))
+                    ancestors.append(a)
+
+        # 父类优先于接口，自身字段优先于继承字段
+        fields: Dict[str, Tuple[str, FieldInfo]] = {}
+        for sup in reversed(supers):
+            fields.update(sup.member_fields)
+        for name, f in cls.fields.items():
+            fields[name] = (cls.fqn, f)
+
+        # 未被合并的列表直接与父类共享，只在需要合并时新建，因此这些列表只读
+        methods: Dict[str, List[str]] = {
+            name: self.get_overloads(cls.fqn, name) for name in cls.methods
+        }
+        for sup in supers:
+            for name, keys in sup.member_methods.items():
+                existing = methods.get(name)
+                if existing is None:
+                    methods[name] = keys
+                    continue
+                signatures = {k.split("#", 1)[1] for k in existing}
+                inherited = [k for k in keys if k.split("#", 1)[1] not in signatures]
+                if inherited:
+                    methods[name] = existing + inherited
+
+        cls.ancestors = ancestors
+        cls.member_fields = fields
+        cls.member_methods = methods
+
+    def _build_override_index(self, cls: ClassInfo, supers: List[ClassInfo]):
+        cls.type_bindings = self._type_bindings(cls, supers)
+
+        # 父类先于接口合并：同一签名以父类链上的实现为准
+        if len(supers) == 1:
+            inherited = supers[0].override_index
+        else:
+            inherited = {}
+            for sup in supers:
+                for sig, key in sup.override_index.items():
+                    inherited.setdefault(sig, key)
+
+        own = [
+            key
+            for name in cls.methods
+            for key in self.get_overloads(cls.fqn, name)
+            if self.methods[key].is_overridable()
+        ]
+        if not own:
+            # 没有自身方法时与父类型共享索引，因此索引只读
+            cls.override_index = inherited
+            return
+
+        erasures = cls.type_variable_erasures()
+        index = dict(inherited)
+        for key in own:
+            m = self.methods[key]
+            sig = m.erased_signature(erasures)
+            parent_key = inherited.get(sig)
+
+            # 代入类型实参后与泛型祖先的方法签名相同，同样是 override（如 Handler<String>.handle(T)），
+            # 祖先方法的擦除签名（以及它已有的桥签名）在本类中也指向 m
+            bridges = set(self.methods[parent_key].bridge_signatures) if parent_key is not None else set()
+            if cls.type_bindings:
+                for parent_sig in self._generic_overrides(m, sig, cls, erasures):
+                    generic_parent = inherited.get(parent_sig)
+                    if generic_parent is None:
+                        continue
+                    if parent_key is None:
+                        parent_key = generic_parent
+                    bridges.add(parent_sig)
+                    bridges.update(self.methods[generic_parent].bridge_signatures)
+            bridges.discard(sig)
+
+            if parent_key is not None and m.override_parent is None:
+                parent = self.methods[parent_key]
+                m.override_parent = parent
+                parent.override_children.append(m)
+            index[sig] = key
+            for bridge in bridges:
+                index[bridge] = key
+            m.bridge_signatures = tuple(sorted(bridges))
+
+        cls.override_index = index
+
+    def _type_bindings(self, cls: ClassInfo, supers: List[ClassInfo]) -> Dict[str, Dict[str, str]]:
+        """
+        cls 的 type_bindings：直接父类型的类型参数代入 supertype_arguments（原始类型或实参个数不符时取擦除结果），
+        更远的泛型祖先沿父类型的 type_bindings 逐层代入。
+        """
+        bindings: Dict[str, Dict[str, str]] = {}
+        for sup in supers:
+            local: Dict[str, str] = {}
+            if sup.type_parameters:
+                erasures = sup.type_variable_erasures()
+                args = cls.supertype_arguments.get(sup.fqn)
+                if args is None or len(args) != len(sup.type_parameters):
+                    args = [None] * len(sup.type_parameters)
+                local = {
+                    var: arg if arg is not None else erasures[var]
+                    for var, arg in zip(sup.type_parameters, args)
+                }
+                bindings.setdefault(sup.fqn, local)
+            for ancestor, binding in (sup.type_bindings or {}).items():
+                if ancestor not in bindings:
+                    bindings[ancestor] = {var: _substitute(t, local) for var, t in binding.items()}
+        return bindings
+
+    def _generic_overrides(self, m: MethodInfo, sig, cls: ClassInfo, erasures: Dict[str, str]):
+        """
+        产出 cls 的泛型祖先中、代入类型实参后签名与 m 的擦除签名 sig 相同的方法的擦除签名。
+        """
+        for ancestor_fqn, binding in cls.type_bindings.items():
+            ancestor = self.classes.get(ancestor_fqn)
+            if ancestor is None:
+                continue
+            candidates = [
+                pm for pm in ancestor.methods.get(m.name, ())
+                if len(pm.parameters) == len(m.parameters) and pm.is_overridable()
+            ]
+            if not candidates:
+                continue
+
+            # 代入后仍是 cls 自身的类型变量时，与 m 一样按 cls 的作用域擦除
+            ancestor_erasures = ancestor.type_variable_erasures()
+            scope = dict(ancestor_erasures)
+            scope.update({var: _substitute(t, erasures) for var, t in binding.items()})
+            for pm in candidates:
+                if pm.erased_signature(scope) == sig:
+                    yield pm.erased_signature(ancestor_erasures)
+
+    def lookup_field(self, class_fqn: str, name: str) -> Optional[Tuple[str, FieldInfo]]:
+        """
+        在类及其祖先中查找字段，返回 (声明类FQN, FieldInfo)。
+        """
+        cls = self.get_class(class_fqn)
+        if cls is None:
+            return None
+        return self.ensure_member_tables(cls).member_fields.get(name)
+
+    def lookup_methods(self, class_fqn: str, name: str) -> List[str]:
+        """
+        在类及其祖先中查找同名方法，返回方法键列表（由近及远）。
+        """
+        cls = self.get_class(class_fqn)
+        if cls is None:
+            return []
+        return self.ensure_member_tables(cls).member_methods.get(name, [])
+
     def add_method_call(self, caller_key: str, call_info: MethodCallInfo):
         if caller_key not in self.method_calls:
             self.method_calls[caller_key] = []
@@ -44,4 +269,12 @@ class GlobalSymbolTable:
             caller
             for caller, calls in self.method_calls.items()
             if any(call.resolved_method_signature == callee_key for call in calls)
-        ]
\ No newline at end of file
+        ]
+
+
+def _substitute(t: str, type_vars: Dict[str, str]) -> str:
+    """把类型写法 t（可能带 "[]"）中作为整体出现的类型变量替换为 type_vars 中的类型"""
+    base = t.rstrip("[]")
+    if base in type_vars:
+        return type_vars[base] + t[len(base):]
+    return t
@@ -1,7 +1,10 @@
 # core/types.py
 from __future__ import annotations
 from dataclasses import dataclass, field
-from typing import List, Optional
+from typing import Dict, FrozenSet, List, Mapping, Optional
+
+# 没有上界的类型变量、无法解析的 Object 都擦除为它
+OBJECT_FQN = "java.lang.Object"
 
 
 @dataclass
@@ -77,4 +80,65 @@ class TypeInfo:
     resolved_fqn: Optional[str] = None
 
     def __repr__(self):
-        return f"TypeInfo(raw={self.raw}, resolved={self.resolved_fqn})"
\ No newline at end of file
+        return f"TypeInfo(raw={self.raw}, resolved={self.resolved_fqn})"
+
+
+def erased_name(t: TypeInfo, type_vars: Mapping[str, str]) -> str:
+    """
+    类型擦除后的名字（不含数组维度）：作用域内的类型变量取 type_vars 中的结果（类型变量遮蔽同名类），
+    其余取解析后的 FQN，无法解析时取基础类型名；未解析的 Object 视为 java.lang.Object。
+    """
+    if not t.is_fqn and t.base in type_vars:
+        return type_vars[t.base]
+    if t.resolved_fqn:
+        return t.resolved_fqn
+    return OBJECT_FQN if t.base == "Object" else t.base
+
+
+def erase_type_parameters(params: Mapping[str, Optional[TypeInfo]], type_vars: Mapping[str, str]) -> Dict[str, str]:
+    """
+    把一组类型参数擦除为各自的第一个上界（没有上界时为 java.lang.Object）。
+    上界可以引用同组的其他类型参数（<T, U extends T>）或外层作用域 type_vars 中的类型变量。
+    """
+    erased: Dict[str, str] = {}
+
+    def erase(name: str, visiting: FrozenSet[str]) -> str:
+        if name not in erased:
+            bound = params[name]
+            if bound is None or name in visiting:
+                erased[name] = OBJECT_FQN
+            elif not bound.is_fqn and bound.base in params:
+                erased[name] = erase(bound.base, visiting | {name})
+            else:
+                erased[name] = erased_name(bound, type_vars)
+        return erased[name]
+
+    for name in params:
+        erase(name, frozenset())
+    return erased
+
+
+def type_arguments(raw: str) -> List[str]:
+    """
+    拆出类型原文最外层的类型实参文本，例如 "Map<String, List<T>>" → ["String", "List<T>"]；
+    没有类型实参时返回空列表。
+    """
+    start = raw.find("<")
+    if start < 0:
+        return []
+    args: List[str] = []
+    depth = 0
+    begin = start + 1
+    for i in range(start, len(raw)):
+        ch = raw[i]
+        if ch == "<":
+            depth += 1
+        elif ch == ">":
+            depth -= 1
+            if depth == 0:
+                args.append(raw[begin:i].strip())
+                break
+        elif ch == "," and depth == 1:
+            args.append(raw[begin:i].strip())
+            begin = i + 1
+    return args
@@ -94,10 +94,14 @@ class ParameterInfo:
 
     span:
         参数在代码中的位置。
+
+    is_varargs:
+        是否为可变参数（String... xs），只可能是最后一个参数；type 的 array_dimension 已包含这一维。
     """
 
     name: str
     type: TypeInfo
     content: Optional[str] = None
     annotations: List[str] = field(default_factory=list)
-    span: Optional[object] = None
\ No newline at end of file
+    span: Optional[object] = None
+    is_varargs: bool = False
\ No newline at end of file
@@ -7,6 +7,7 @@ from .method_filter import (
 )
 from .config_filter import ConfigFilter
 from .test_coverage_filter import TestCoverageFilter
+from .clone_index import CloneIndex
 
 __all__ = [
     'MethodFilter',
@@ -15,5 +16,6 @@ __all__ = [
     'MetricBasedFilter',
     'SimilarityFilter',
     'ConfigFilter',
-    'TestCoverageFilter'
+    'TestCoverageFilter',
+    'CloneIndex'
 ]
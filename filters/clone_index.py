@@ -0,0 +1,184 @@
+from array import array
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from .minhash import pairs_within_groups
+
+
+# Methods whose fingerprint has fewer subtree hashes (getters, one-line delegates) are not indexed
+MIN_CLONE_SHINGLES = 3
+
+
+class CloneIndex:
+    """
+    Structural clone index: an inverted index from subtree hash to methods.
+
+    Fingerprints come from MethodInfo.structure_fingerprint, computed while
+    parsing with identifiers and literals normalized, so renamed-variable
+    clones share a fingerprint and methods that merely share vocabulary do not.
+    Several projects can be added (method keys distinguished by a prefix)
+    before searching the whole corpus for clone groups.
+
+    Clone groups avoid a pairwise scan: identical fingerprints are merged
+    first, the rest go through prefix filtering. With subtree hashes ordered by
+    ascending document frequency, two sets with Jaccard >= t must share an
+    element among their first |A| - ceil(t*|A|) + 1, and only such candidate
+    pairs get an exact Jaccard.
+    """
+
+    def __init__(self, min_shingles: int = MIN_CLONE_SHINGLES):
+        self.min_shingles = min_shingles
+        self.keys: List[str] = []
+        self.fingerprints: List[array] = []
+        self.postings: Dict[int, List[int]] = {}
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def add(self, method_key: str, fingerprint: Optional[array]) -> bool:
+        """Add one method; skipped when it has no fingerprint (older parse) or a too small one. Return whether it was added"""
+        if fingerprint is None or len(fingerprint) < self.min_shingles:
+            return False
+        idx = len(self.keys)
+        self.keys.append(method_key)
+        self.fingerprints.append(fingerprint)
+        for shingle in fingerprint:
+            self.postings.setdefault(shingle, []).append(idx)
+        return True
+
+    def add_project(self, project, prefix: Optional[str] = None) -> int:
+        """Add every method of a project keyed "prefix:method_key" (no prefix when empty); return the number added"""
+        added = 0
+        for key, method in project.symbols.methods.items():
+            if self.add(f"{prefix}:{key}" if prefix else key, getattr(method, 'structure_fingerprint', None)):
+                added += 1
+        return added
+
+    def lookup(self, shingle: int) -> List[str]:
+        """Method keys whose fingerprint contains the subtree hash"""
+        return [self.keys[i] for i in self.postings.get(shingle, ())]
+
+    def query(self, fingerprint: array, threshold: float = 0.8) -> List[Tuple[str, float]]:
+        """Methods whose Jaccard similarity to the fingerprint reaches threshold, most similar first"""
+        if not fingerprint:
+            return []
+        shared: Dict[int, int] = {}
+        for shingle in set(fingerprint):
+            for idx in self.postings.get(shingle, ()):
+                shared[idx] = shared.get(idx, 0) + 1
+
+        size = len(set(fingerprint))
+        matches = []
+        for idx, common in shared.items():
+            similarity = common / (size + len(self.fingerprints[idx]) - common)
+            if similarity >= threshold:
+                matches.append((self.keys[idx], similarity))
+        matches.sort(key=lambda m: (-m[1], m[0]))
+        return matches
+
+    def clone_pairs(self, threshold: float = 0.8) -> List[Tuple[str, str, float]]:
+        """
+        Every (method_key, method_key, similarity) pair whose Jaccard similarity
+        reaches threshold. Methods with identical fingerprints pair up at 1.0.
+        """
+        groups, pairs = self._unique_pairs(threshold)
+        result = []
+        for members in groups:
+            for a in range(len(members)):
+                for b in range(a + 1, len(members)):
+                    result.append((self.keys[members[a]], self.keys[members[b]], 1.0))
+        for i, j, similarity in pairs:
+            for a in groups[i]:
+                for b in groups[j]:
+                    result.append((self.keys[a], self.keys[b], similarity))
+        return result
+
+    def clone_groups(self, threshold: float = 0.8) -> List[List[str]]:
+        """
+        Clone groups: connected components (two or more methods) of the similar
+        pairs. Keys are sorted within a group; groups are ordered by size
+        descending, then by first key.
+        """
+        groups, pairs = self._unique_pairs(threshold)
+
+        parent = list(range(len(groups)))
+
+        def find(x):
+            while parent[x] != x:
+                parent[x] = parent[parent[x]]
+                x = parent[x]
+            return x
+
+        for i, j, _ in pairs:
+            ri, rj = find(i), find(j)
+            if ri != rj:
+                parent[max(ri, rj)] = min(ri, rj)
+
+        components: Dict[int, List[str]] = {}
+        for u, members in enumerate(groups):
+            components.setdefault(find(u), []).extend(self.keys[m] for m in members)
+
+        result = [sorted(keys) for keys in components.values() if len(keys) > 1]
+        result.sort(key=lambda keys: (-len(keys), keys[0]))
+        return result
+
+    def _unique_pairs(self, threshold: float) -> Tuple[List[List[int]], List[Tuple[int, int, float]]]:
+        """
+        Return (distinct fingerprint -> method indices, (u, v, similarity) for
+        distinct fingerprints whose similarity reaches threshold).
+        """
+        if not 0.0 < threshold <= 1.0:
+            raise ValueError(f'threshold must be in (0, 1]: {threshold}')
+
+        # Merge identical fingerprints
+        unique: Dict[bytes, int] = {}
+        groups: List[List[int]] = []
+        for idx, fingerprint in enumerate(self.fingerprints):
+            u = unique.setdefault(fingerprint.tobytes(), len(groups))
+            if u == len(groups):
+                groups.append([])
+            groups[u].append(idx)
+        if threshold == 1.0 or len(groups) < 2:
+            return groups, []
+
+        sets = [np.frombuffer(self.fingerprints[members[0]], dtype=np.uint32) for members in groups]
+        lengths = np.fromiter((len(s) for s in sets), dtype=np.int64, count=len(sets))
+        tokens = np.concatenate(sets)
+        owners = np.repeat(np.arange(len(sets)), lengths)
+
+        # Global order: rare subtree hashes first, ties broken by hash value
+        values, inverse, df = np.unique(tokens, return_inverse=True, return_counts=True)
+        rank = np.empty(len(values), dtype=np.int64)
+        rank[np.lexsort((values, df))] = np.arange(len(values))
+        token_rank = rank[inverse]
+
+        # Keep each set's prefix in that order; the epsilon keeps float error in t*|A| from shortening it
+        order = np.lexsort((token_rank, owners))
+        starts = np.concatenate(([0], np.cumsum(lengths)[:-1]))
+        positions = np.arange(len(tokens)) - np.repeat(starts, lengths)
+        prefix = lengths - np.ceil(threshold * lengths - 1e-9).astype(np.int64) + 1
+        keep = order[positions < np.repeat(prefix, lengths)]
+
+        # Sets sharing a subtree hash in the prefix postings are candidate pairs
+        keep = keep[np.argsort(token_rank[keep], kind='stable')]
+        kept_ranks = token_rank[keep]
+        boundaries = np.flatnonzero(kept_ranks[1:] != kept_ranks[:-1]) + 1
+        first, second = pairs_within_groups(np.concatenate(([0], boundaries)), len(keep))
+        if not len(first):
+            return groups, []
+        i, j = owners[keep[first]], owners[keep[second]]
+        n = len(sets)
+        candidates = np.unique(np.minimum(i, j) * n + np.maximum(i, j))
+
+        pairs = []
+        for u, v in zip((candidates // n).tolist(), (candidates % n).tolist()):
+            # Length filter: |B| < t*|A| can never reach the threshold
+            smaller, larger = sorted((lengths[u], lengths[v]))
+            if smaller < threshold * larger - 1e-9:
+                continue
+            common = len(np.intersect1d(sets[u], sets[v], assume_unique=True))
+            similarity = common / (lengths[u] + lengths[v] - common)
+            if similarity >= threshold - 1e-12:
+                pairs.append((u, v, float(similarity)))
+        return groups, pairs
@@ -42,7 +42,10 @@ class ConfigFilter:
         similarity_config = filter_config.get('similarity', {})
         if similarity_config.get('enabled', False):
             self.filters.append(SimilarityFilter(
-                threshold=similarity_config.get('threshold', 0.85)
+                threshold=similarity_config.get('threshold', 0.85),
+                num_perm=similarity_config.get('num_perm', 128),
+                bands=similarity_config.get('bands', 32),
+                seed=similarity_config.get('seed', 1)
             ))
 
         test_coverage_config = filter_config.get('test_coverage', {})
@@ -1,6 +1,9 @@
 from abc import ABC, abstractmethod
+from bisect import bisect_right
 import re
-from typing import List, Set, Dict
+from typing import List, Set, Dict, Optional, Tuple
+
+from .minhash import MinHasher, lsh_candidate_pairs
 
 
 class MethodFilter(ABC):
@@ -107,12 +110,35 @@ class MetricBasedFilter(MethodFilter):
 
 
 class SimilarityFilter(MethodFilter):
-    """Filter similar methods based on code similarity"""
-
-    def __init__(self, threshold=0.85):
+    """
+    Filter similar methods based on code similarity.
+
+    Candidate pairs come from MinHash signatures with LSH banding and are then
+    verified with exact token Jaccard, so only near-duplicates are compared.
+    A pair with similarity s becomes a candidate with probability
+    1 - (1 - s^r)^b (b = bands, r = num_perm / bands); more bands raise recall.
+    Methods with identical token sets (trivial getters, `return null;`) are
+    collapsed into one group before hashing, so they never fill an LSH bucket.
+    Methods are keyed by their full key (package.Class#signature), so overloads
+    are kept apart.
+    """
+
+    def __init__(self, threshold=0.85, num_perm=128, bands=32, seed=1):
         self.threshold = threshold
+        self.num_perm = num_perm
+        self.bands = bands
+        self.seed = seed
         self.methods_to_filter: Set[str] = set()
 
+    @staticmethod
+    def _method_key(method) -> str:
+        key = getattr(method, 'method_key', None)
+        if key:
+            return key
+        owner = f"{method.package_name}.{method.class_name}" if getattr(method, 'package_name', None) else method.class_name
+        signature = getattr(method, 'signature', None) or f"{method.name}()"
+        return f"{owner}#{signature}"
+
     def _tokenize(self, body: str) -> Set[str]:
         if not body:
             return set()
@@ -126,30 +152,74 @@ class SimilarityFilter(MethodFilter):
         union = len(tokens1 | tokens2)
         return intersection / union if union > 0 else 0.0
 
+    def similar_groups(self, methods: List) -> Tuple[List[List[int]], Dict[int, List[int]]]:
+        """
+        Group methods by identical token set, then find similar groups.
+
+        Returns (groups, neighbors): groups[g] lists the indices of the methods
+        sharing one token set in ascending order, and neighbors maps g to the
+        sorted h > g whose exact Jaccard similarity reaches the threshold.
+        Methods with an empty token set are never similar and belong to no group.
+        """
+        token_sets: List[Set[str]] = []
+        groups: List[List[int]] = []
+        unique: Dict[frozenset, int] = {}
+        for idx, method in enumerate(methods):
+            tokens = frozenset(self._tokenize(method.body))
+            if not tokens:
+                continue
+            g = unique.setdefault(tokens, len(groups))
+            if g == len(groups):
+                groups.append([])
+                token_sets.append(tokens)
+            groups[g].append(idx)
+
+        signatures = MinHasher(self.num_perm, self.seed).signatures(token_sets)
+        neighbors: Dict[int, List[int]] = {}
+        for g, h in lsh_candidate_pairs(signatures, self.bands).tolist():
+            if self._jaccard_similarity(token_sets[g], token_sets[h]) >= self.threshold:
+                neighbors.setdefault(g, []).append(h)
+        return groups, neighbors
+
     def analyze_similarity(self, methods: List) -> None:
-        method_tokens: Dict[str, Set[str]] = {}
+        # Keep the first occurrence of each key; later duplicates are the same method
+        unique: Dict[str, object] = {}
         for method in methods:
-            key = f"{method.class_name}.{method.name}"
-            method_tokens[key] = self._tokenize(method.body)
-
-        keys = list(method_tokens.keys())
-        for i in range(len(keys)):
-            if keys[i] in self.methods_to_filter:
+            unique.setdefault(self._method_key(method), method)
+        keys = list(unique)
+        methods = list(unique.values())
+        complexity = [getattr(m, 'cyclomatic_complexity', 1) for m in methods]
+
+        groups, neighbors = self.similar_groups(methods)
+        group_of: List[Optional[int]] = [None] * len(methods)
+        for g, members in enumerate(groups):
+            for idx in members:
+                group_of[idx] = g
+        # Groups whose members are similar to the methods of group g, g included
+        adjacent: List[Set[int]] = [{g} for g in range(len(groups))]
+        for g, similar in neighbors.items():
+            for h in similar:
+                adjacent[g].add(h)
+                adjacent[h].add(g)
+
+        # Same greedy order as the pairwise scan: for each unfiltered i, walk its
+        # similar j > i and drop the less complex method of each pair. Filtered
+        # members are pruned from each group as it is walked.
+        filtered = [keys[i] in self.methods_to_filter for i in range(len(keys))]
+        alive = [list(members) for members in groups]
+        for i in range(len(methods)):
+            if filtered[i] or group_of[i] is None:
                 continue
-            for j in range(i + 1, len(keys)):
-                if keys[j] in self.methods_to_filter:
-                    continue
-                similarity = self._jaccard_similarity(method_tokens[keys[i]], method_tokens[keys[j]])
-                if similarity >= self.threshold:
-                    method_i = next(m for m in methods if f"{m.class_name}.{m.name}" == keys[i])
-                    method_j = next(m for m in methods if f"{m.class_name}.{m.name}" == keys[j])
-                    complexity_i = getattr(method_i, 'cyclomatic_complexity', 1)
-                    complexity_j = getattr(method_j, 'cyclomatic_complexity', 1)
-                    if complexity_i >= complexity_j:
-                        self.methods_to_filter.add(keys[j])
-                    else:
-                        self.methods_to_filter.add(keys[i])
+            candidates = []
+            for h in adjacent[group_of[i]]:
+                alive[h] = [j for j in alive[h] if not filtered[j]]
+                candidates.extend(alive[h][bisect_right(alive[h], i):])
+            for j in sorted(candidates):
+                if complexity[i] >= complexity[j]:
+                    filtered[j] = True
+                else:
+                    filtered[i] = True
+        self.methods_to_filter.update(key for key, f in zip(keys, filtered) if f)
 
     def should_keep(self, method) -> bool:
-        key = f"{method.class_name}.{method.name}"
-        return key not in self.methods_to_filter
+        return self._method_key(method) not in self.methods_to_filter
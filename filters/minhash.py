@@ -0,0 +1,130 @@
+import zlib
+from typing import Dict, List, Set, Tuple
+
+import numpy as np
+
+
+# Mersenne prime 2^31 - 1; token hashes are 32-bit crc32, so a*x + b fits in int64
+MERSENNE_PRIME = (1 << 31) - 1
+
+# Tokens hashed per vectorized chunk, bounding the (tokens x num_perm) intermediate
+_TOKEN_CHUNK = 1 << 16
+
+# Candidate pair ids buffered across bands before they are deduplicated
+_PAIR_CHUNK = 1 << 22
+
+
+class MinHasher:
+    """
+    MinHash signatures: for each token set, the minimum of num_perm hash
+    functions h_i(x) = (a_i * x + b_i) mod p. The fraction of equal positions
+    in two signatures is an unbiased estimate of the sets' Jaccard similarity.
+    """
+
+    def __init__(self, num_perm: int = 128, seed: int = 1):
+        rng = np.random.default_rng(seed)
+        self.num_perm = num_perm
+        self.a = rng.integers(1, MERSENNE_PRIME, size=num_perm, dtype=np.int64)
+        self.b = rng.integers(0, MERSENNE_PRIME, size=num_perm, dtype=np.int64)
+
+    def signatures(self, token_sets: List[Set[str]]) -> np.ndarray:
+        """
+        Return an int64 matrix of shape (len(token_sets), num_perm). Empty sets
+        get a signature of all p, which never equals another set's.
+        """
+        n = len(token_sets)
+        result = np.full((n, self.num_perm), MERSENNE_PRIME, dtype=np.int64)
+
+        # crc32 each distinct token once
+        vocabulary: Dict[str, int] = {}
+        token_ids: List[int] = []
+        for tokens in token_sets:
+            token_ids.extend(vocabulary.setdefault(token, len(vocabulary)) for token in tokens)
+        if not token_ids:
+            return result
+        vocab_hashes = np.fromiter(
+            (zlib.crc32(token.encode('utf-8')) for token in vocabulary), dtype=np.int64, count=len(vocabulary)
+        )
+        hashes = vocab_hashes[np.asarray(token_ids, dtype=np.int64)]
+        lengths = np.fromiter((len(tokens) for tokens in token_sets), dtype=np.int64, count=n)
+        offsets = np.concatenate(([0], np.cumsum(lengths)))
+        a, b = self.a[:, None], self.b[:, None]
+
+        # Chunk on set boundaries; hash in (num_perm, tokens) layout and take per-set minima with reduceat
+        nonempty = np.flatnonzero(lengths)
+        starts, ends = offsets[nonempty], offsets[nonempty + 1]
+        start = 0
+        while start < len(nonempty):
+            base = starts[start]
+            end = max(start + 1, int(np.searchsorted(ends, base + _TOKEN_CHUNK, side='right')))
+            sets = nonempty[start:end]
+            values = a * hashes[base:ends[end - 1]]
+            values += b
+            np.remainder(values, MERSENNE_PRIME, out=values)
+            result[sets] = np.minimum.reduceat(values, starts[start:end] - base, axis=1).T
+            start = end
+        return result
+
+
+def pairs_within_groups(starts: np.ndarray, total: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Elements are sorted by group; starts holds the group offsets (ascending,
+    first is 0) and total the element count. Return every (earlier, later)
+    position pair within a group as two equal-length arrays.
+    """
+    sizes = np.diff(np.concatenate((starts, [total])))
+
+    # Member a of a group pairs with the size - 1 - a members after it
+    group_start = np.repeat(starts, sizes)
+    group_size = np.repeat(sizes, sizes)
+    positions = np.arange(total)
+    counts = group_size - 1 - (positions - group_start)
+    first = np.repeat(positions, counts)
+    step = np.arange(len(first)) - np.repeat(np.cumsum(counts) - counts, counts)
+    return first, first + 1 + step
+
+
+def lsh_candidate_pairs(signatures: np.ndarray, bands: int) -> np.ndarray:
+    """
+    LSH banding: split signatures into bands; two rows equal on any band are a
+    candidate pair. Return the distinct pairs (i, i < j) as an array of shape
+    (pairs, 2). Rows with similarity s become candidates with probability
+    1 - (1 - s^r)^b, r = num_perm / bands.
+
+    Pairs are deduplicated band by band, so memory holds the distinct pairs
+    plus one band's buckets. Callers should collapse identical rows first: a
+    bucket of k equal rows still yields k^2 / 2 pairs per band.
+    """
+    n, num_perm = signatures.shape
+    if num_perm % bands:
+        raise ValueError(f'num_perm ({num_perm}) must be a multiple of bands ({bands})')
+    rows = num_perm // bands
+
+    # Empty sets (all-p signatures) take no part
+    valid = np.flatnonzero(signatures[:, 0] != MERSENNE_PRIME)
+    pair_ids = np.empty(0, dtype=np.int64)
+    pending: List[np.ndarray] = []
+    pending_size = 0
+    for band in range(bands):
+        block = np.ascontiguousarray(signatures[valid, band * rows:(band + 1) * rows])
+        keys = block.view(np.dtype((np.void, block.dtype.itemsize * rows))).ravel()
+        order = np.argsort(keys, kind='stable')
+        sorted_keys = keys[order]
+        boundaries = np.flatnonzero(sorted_keys[1:] != sorted_keys[:-1]) + 1
+        first, second = pairs_within_groups(np.concatenate(([0], boundaries)), len(order))
+        if not len(first):
+            continue
+
+        members = valid[order]
+        i, j = members[first], members[second]
+        pending.append(np.minimum(i, j) * n + np.maximum(i, j))
+        pending_size += len(pending[-1])
+        # Deduplicate once the buffered bands outgrow the distinct pairs so far,
+        # keeping memory within a small multiple of the distinct pairs
+        if pending_size > max(len(pair_ids), _PAIR_CHUNK):
+            pair_ids = np.unique(np.concatenate([pair_ids] + pending))
+            pending, pending_size = [], 0
+
+    if pending:
+        pair_ids = np.unique(np.concatenate([pair_ids] + pending))
+    return np.stack((pair_ids // n, pair_ids % n), axis=1)
@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+import argparse
+import json
+import pickle
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from filters.clone_index import CloneIndex, MIN_CLONE_SHINGLES
+
+
+def main():
+    parser = argparse.ArgumentParser(description='基于语法结构指纹查找一个或多个项目中的克隆方法组')
+    parser.add_argument('load', nargs='+', help='已解析的项目文件（.pkl），可指定多个')
+    parser.add_argument('--threshold', type=float, default=0.8, help='结构指纹的 Jaccard 相似度阈值（默认 0.8）')
+    parser.add_argument('--min-shingles', type=int, default=MIN_CLONE_SHINGLES,
+                        help=f'参与检测的最小指纹大小（默认 {MIN_CLONE_SHINGLES}）')
+    parser.add_argument('--pairs', action='store_true', help='输出相似方法对及相似度，而不是克隆组')
+    parser.add_argument('--output', help='输出JSON文件路径')
+
+    args = parser.parse_args()
+
+    # 多个项目时方法键加上项目文件名前缀，区分同名类
+    index = CloneIndex(min_shingles=args.min_shingles)
+    for path in args.load:
+        print(f"Loading project from {path}...", file=sys.stderr)
+        with open(path, 'rb') as f:
+            project = pickle.load(f)
+        added = index.add_project(project, prefix=Path(path).stem if len(args.load) > 1 else None)
+        print(f"  {added} methods indexed", file=sys.stderr)
+
+    if args.pairs:
+        pairs = index.clone_pairs(args.threshold)
+        output = [{'methods': [a, b], 'similarity': round(s, 4)} for a, b, s in pairs]
+        print(f"相似方法对 {len(pairs)} 个", file=sys.stderr)
+    else:
+        groups = index.clone_groups(args.threshold)
+        output = [{'size': len(group), 'methods': group} for group in groups]
+        print(f"克隆组 {len(groups)} 个，涉及方法 {sum(len(g) for g in groups)} 个", file=sys.stderr)
+
+    text = json.dumps(output, ensure_ascii=False, indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(text)
+        print(f"Results saved to {args.output}", file=sys.stderr)
+    else:
+        print(text)
+
+
+if __name__ == '__main__':
+    main()
@@ -295,9 +295,10 @@ def main():
         from parser_main import load_project
         project = load_project(args.load)
     if not project:
+        # 只提取单个方法的上下文，按需解析即可
         parser_inst = JavaProjectParser()
         project = parser_inst.parse_project(
-            args.project_root, args.main_src, args.test_src
+            args.project_root, args.main_src, args.test_src, lazy=True
         )
     symbol_table = project.symbols
     try:
@@ -305,6 +306,9 @@ def main():
     except KeyError as e:
         print(str(e))
         sys.exit(1)
+    if getattr(project, "lazy", False):
+        # 所属类 + 参数/返回值类型对应的类
+        project.ensure_method_resolved(args.method_key, depth=1)
     context_json = collect_method_context(method, cls, symbol_table)
     out_json = json.dumps(context_json, ensure_ascii=False, indent=2)
     if args.output:
@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+import argparse
+import json
+import pickle
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from core.impact import ImpactAnalyzer
+from parser.project_parser import JavaProjectParser
+
+
+def parse_range(spec: str):
+    """
+    解析 "path:start-end" 或 "path:line" 形式的变更范围，行号从 1 开始。
+    """
+    path, sep, lines = spec.rpartition(':')
+    if not sep or not path:
+        raise argparse.ArgumentTypeError(f'无效的变更范围: {spec}（应为 path:start-end）')
+    start, _, end = lines.partition('-')
+    try:
+        start = int(start)
+        end = int(end) if end else start
+    except ValueError:
+        raise argparse.ArgumentTypeError(f'无效的行号: {spec}')
+    return path, start, end
+
+
+def main():
+    parser = argparse.ArgumentParser(description='根据变更的方法或文件行范围，分析受影响的调用者与测试')
+    parser.add_argument('project_root', nargs='?', help='项目根目录')
+    parser.add_argument('main_src', nargs='?', help='主代码目录')
+    parser.add_argument('test_src', nargs='?', help='测试代码目录')
+    parser.add_argument('--load', help='加载已解析的项目文件')
+    parser.add_argument('--method', action='append', default=[], help='变更的方法FQN#signature，可重复')
+    parser.add_argument('--changes', action='append', default=[], type=parse_range,
+                        help='变更的文件行范围 path:start-end，可重复')
+    parser.add_argument('--max-depth', type=int, default=None, help='沿调用者方向最多展开的层数（默认不限）')
+    parser.add_argument('--tests-only', action='store_true', help='只输出受影响的测试方法')
+    parser.add_argument('--output', help='输出JSON文件路径')
+
+    args = parser.parse_args()
+
+    if not args.load and not all([args.project_root, args.main_src, args.test_src]):
+        parser.error('需要提供 project_root, main_src, test_src 或使用 --load')
+    if not args.method and not args.changes:
+        parser.error('需要至少提供一个 --method 或 --changes')
+
+    # 影响分析需要完整的调用图，不使用按需解析
+    if args.load:
+        print(f"Loading project from {args.load}...", file=sys.stderr)
+        with open(args.load, 'rb') as f:
+            project = pickle.load(f)
+    else:
+        print(f"Parsing project at {args.project_root}...", file=sys.stderr)
+        project = JavaProjectParser().parse_project(args.project_root, args.main_src, args.test_src)
+
+    analyzer = ImpactAnalyzer(project)
+    result = analyzer.analyze(args.method, args.changes, max_depth=args.max_depth)
+
+    if result.unmatched:
+        print(f"未能对应到方法的输入: {result.unmatched}", file=sys.stderr)
+    print(f"变更方法 {len(result.changed)} 个，受影响方法 {len(result.affected)} 个，"
+          f"受影响测试 {len(result.tests)} 个", file=sys.stderr)
+
+    output = {'tests': result.tests} if args.tests_only else result.to_dict()
+    text = json.dumps(output, ensure_ascii=False, indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(text)
+        print(f"Results saved to {args.output}", file=sys.stderr)
+    else:
+        print(text)
+
+
+if __name__ == '__main__':
+    main()
@@ -2,10 +2,18 @@ from .complexity_calculator import ComplexityCalculator
 from .input_metrics import InputMetricsCalculator
 from .output_metrics import OutputMetricsCalculator
 from .aggregator import MetricsAggregator
+from .cache import MetricsCache
+from .registry import MetricRegistry, DEFAULT_REGISTRY, register_metric
+from .engine import DifficultyEngine
 
 __all__ = [
     'ComplexityCalculator',
     'InputMetricsCalculator',
     'OutputMetricsCalculator',
     'MetricsAggregator',
+    'MetricsCache',
+    'MetricRegistry',
+    'DEFAULT_REGISTRY',
+    'register_metric',
+    'DifficultyEngine',
 ]
@@ -1,65 +1,243 @@
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Dict, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+import yaml
+
+if TYPE_CHECKING:
+    from .quantiles import PercentileNormalizer
+
+
+# 归一化项 → (细粒度指标名, 归一化上限)：normalized = min(value / cap, 1.0)
+INPUT_NORMALIZATION: Dict[str, Tuple[str, float]] = {
+    'cyclomatic': ('cyclomatic_complexity', 20),
+    'branches': ('branch_count', 10),
+    'loops': ('loop_count', 5),
+    'exceptions': ('exception_paths', 5),
+    'field_deps': ('field_dependency_count', 10),
+    'external_calls': ('external_call_count', 15),
+    'dependent_classes': ('dependent_class_count', 10),
+    'param_complexity': ('parameter_type_complexity', 20),
+    'nesting': ('object_nesting_depth', 5),
+}
+
+INPUT_WEIGHTS: Dict[str, float] = {
+    'cyclomatic': 0.20,
+    'branches': 0.10,
+    'loops': 0.10,
+    'exceptions': 0.05,
+    'field_deps': 0.10,
+    'external_calls': 0.15,
+    'dependent_classes': 0.10,
+    'param_complexity': 0.15,
+    'nesting': 0.05,
+}
+
+OUTPUT_NORMALIZATION: Dict[str, Tuple[str, float]] = {
+    'mock': ('mock_requirement_score', 10),
+    'setup': ('setup_complexity', 20),
+    'return': ('return_type_complexity', 5),
+    'assertion': ('assertion_complexity', 5),
+}
+
+OUTPUT_WEIGHTS: Dict[str, float] = {
+    'mock': 0.30,
+    'setup': 0.30,
+    'return': 0.20,
+    'assertion': 0.20,
+}
+
+# 总体难度 = input * 0.6 + output * 0.4
+OVERALL_WEIGHTS: Tuple[float, float] = (0.6, 0.4)
+
+# 分数 < 0.33 为 easy，< 0.67 为 medium，其余为 hard
+DIFFICULTY_THRESHOLDS: Tuple[float, float] = (0.33, 0.67)
+DIFFICULTY_LEVELS: Tuple[str, str, str] = ('easy', 'medium', 'hard')
+
+# 参与评分的全部细粒度指标名
+SCORED_METRICS = tuple(
+    name for name, _ in list(INPUT_NORMALIZATION.values()) + list(OUTPUT_NORMALIZATION.values())
+)
+
+
+@dataclass
+class ScoringConfig:
+    """
+    评分参数：归一化上限、权重与分级阈值。默认值即上面的模块常量。
+
+    YAML 格式（各项均可省略，省略时取默认值；新增的项需同时给出 metric 与 cap）：
+
+        input:
+          cyclomatic: {metric: cyclomatic_complexity, cap: 20, weight: 0.20}
+          ...
+        output:
+          mock: {weight: 0.35}
+          ...
+        overall_weights: {input: 0.6, output: 0.4}
+        thresholds: {easy: 0.33, medium: 0.67}
+        normalization: cap        # 或 percentile：按语料上的百分位归一化，忽略 cap
+    """
+
+    input_normalization: Dict[str, Tuple[str, float]] = field(default_factory=lambda: dict(INPUT_NORMALIZATION))
+    input_weights: Dict[str, float] = field(default_factory=lambda: dict(INPUT_WEIGHTS))
+    output_normalization: Dict[str, Tuple[str, float]] = field(default_factory=lambda: dict(OUTPUT_NORMALIZATION))
+    output_weights: Dict[str, float] = field(default_factory=lambda: dict(OUTPUT_WEIGHTS))
+    overall_weights: Tuple[float, float] = OVERALL_WEIGHTS
+    thresholds: Tuple[float, float] = DIFFICULTY_THRESHOLDS
+    normalization: str = 'cap'
+
+    @classmethod
+    def from_yaml(cls, path: str) -> "ScoringConfig":
+        with open(path, 'r') as f:
+            return cls.from_dict(yaml.safe_load(f) or {})
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "ScoringConfig":
+        config = cls()
+        _merge_terms(config.input_normalization, config.input_weights, data.get('input') or {})
+        _merge_terms(config.output_normalization, config.output_weights, data.get('output') or {})
+
+        overall = data.get('overall_weights') or {}
+        config.overall_weights = (
+            float(overall.get('input', config.overall_weights[0])),
+            float(overall.get('output', config.overall_weights[1])),
+        )
+        thresholds = data.get('thresholds') or {}
+        config.thresholds = (
+            float(thresholds.get('easy', config.thresholds[0])),
+            float(thresholds.get('medium', config.thresholds[1])),
+        )
+        if config.thresholds[0] > config.thresholds[1]:
+            raise ValueError(f'thresholds.easy 不能大于 thresholds.medium: {config.thresholds}')
+
+        config.normalization = data.get('normalization', config.normalization)
+        if config.normalization not in ('cap', 'percentile'):
+            raise ValueError(f'未知的归一化方式: {config.normalization}（应为 cap 或 percentile）')
+        return config
+
+    @property
+    def metric_names(self) -> Tuple[str, ...]:
+        """参与评分的全部细粒度指标名"""
+        names = [self.input_normalization[k][0] for k in self.input_weights]
+        names += [self.output_normalization[k][0] for k in self.output_weights]
+        return tuple(dict.fromkeys(names))
+
+
 class MetricsAggregator:
     """指标聚合和评分"""
 
     @staticmethod
-    def aggregate_input_complexity(metrics: dict) -> float:
+    def aggregate_input_complexity(metrics: dict, weights: Mapping[str, float] = INPUT_WEIGHTS) -> float:
         """聚合输入复杂度"""
-        normalized = {
-            'cyclomatic': min(metrics.get('cyclomatic_complexity', 0) / 20, 1.0),
-            'branches': min(metrics.get('branch_count', 0) / 10, 1.0),
-            'loops': min(metrics.get('loop_count', 0) / 5, 1.0),
-            'exceptions': min(metrics.get('exception_paths', 0) / 5, 1.0),
-            'field_deps': min(metrics.get('field_dependency_count', 0) / 10, 1.0),
-            'external_calls': min(metrics.get('external_call_count', 0) / 15, 1.0),
-            'dependent_classes': min(metrics.get('dependent_class_count', 0) / 10, 1.0),
-            'param_complexity': min(metrics.get('parameter_type_complexity', 0) / 20, 1.0),
-            'nesting': min(metrics.get('object_nesting_depth', 0) / 5, 1.0),
-        }
-
-        weights = {
-            'cyclomatic': 0.20,
-            'branches': 0.10,
-            'loops': 0.10,
-            'exceptions': 0.05,
-            'field_deps': 0.10,
-            'external_calls': 0.15,
-            'dependent_classes': 0.10,
-            'param_complexity': 0.15,
-            'nesting': 0.05,
-        }
-
-        return sum(normalized[k] * weights[k] for k in weights)
+        return _aggregate(metrics, INPUT_NORMALIZATION, weights)
 
     @staticmethod
-    def aggregate_output_complexity(metrics: dict) -> float:
+    def aggregate_output_complexity(metrics: dict, weights: Mapping[str, float] = OUTPUT_WEIGHTS) -> float:
         """聚合输出复杂度"""
-        normalized = {
-            'mock': min(metrics.get('mock_requirement_score', 0) / 10, 1.0),
-            'setup': min(metrics.get('setup_complexity', 0) / 20, 1.0),
-            'return': min(metrics.get('return_type_complexity', 0) / 5, 1.0),
-            'assertion': min(metrics.get('assertion_complexity', 0) / 5, 1.0),
-        }
-
-        weights = {
-            'mock': 0.30,
-            'setup': 0.30,
-            'return': 0.20,
-            'assertion': 0.20,
-        }
-
-        return sum(normalized[k] * weights[k] for k in weights)
+        return _aggregate(metrics, OUTPUT_NORMALIZATION, weights)
 
     @staticmethod
     def calculate_overall_difficulty(input_score: float, output_score: float) -> float:
         """计算总体难度分数"""
-        return input_score * 0.6 + output_score * 0.4
+        return input_score * OVERALL_WEIGHTS[0] + output_score * OVERALL_WEIGHTS[1]
 
     @staticmethod
     def classify_difficulty(score: float) -> str:
         """难度分级"""
-        if score < 0.33:
-            return 'easy'
-        elif score < 0.67:
-            return 'medium'
+        if score < DIFFICULTY_THRESHOLDS[0]:
+            return DIFFICULTY_LEVELS[0]
+        elif score < DIFFICULTY_THRESHOLDS[1]:
+            return DIFFICULTY_LEVELS[1]
         else:
-            return 'hard'
+            return DIFFICULTY_LEVELS[2]
+
+    # =====================================================================
+    # 列式（向量化）评分：与上面的逐条计算逐位一致
+    # =====================================================================
+    @staticmethod
+    def collect_columns(metrics_list: Sequence[dict]) -> Dict[str, np.ndarray]:
+        """把一组方法的细粒度指标收集为 指标名 → float64 数组，缺失的指标取 0。"""
+        return {
+            name: np.fromiter((m.get(name, 0) for m in metrics_list), dtype=np.float64, count=len(metrics_list))
+            for name in SCORED_METRICS
+        }
+
+    @staticmethod
+    def score_columns(
+        columns: Mapping[str, np.ndarray],
+        input_weights: Optional[Mapping[str, float]] = None,
+        output_weights: Optional[Mapping[str, float]] = None,
+        config: Optional[ScoringConfig] = None,
+        percentiles: Optional["PercentileNormalizer"] = None,
+    ) -> Dict[str, np.ndarray]:
+        """
+        对列式指标一次性计算 input / output / overall 分数与难度等级。
+        归一化、加权的运算顺序与逐条计算相同，因此默认参数下结果逐位一致。
+        config 提供时使用其中的归一化上限、权重与阈值（input_weights / output_weights 仍可单独覆盖权重）。
+        percentiles 提供时，各指标先映射为语料上的百分位（严格小于该值的比例），代替 min(value / cap, 1.0)。
+        percentiles 必须包含 config 中全部指标的草图，否则抛出 ValueError。
+        """
+        config = config or ScoringConfig()
+        input_normalization = config.input_normalization
+        output_normalization = config.output_normalization
+        if percentiles is not None:
+            # 没有草图的指标会以原值参与加权（上限被换成 1.0），直接报错而不是悄悄饱和
+            missing = [name for name in config.metric_names if name not in percentiles.sketches]
+            if missing:
+                raise ValueError(f'百分位草图中缺少指标 {missing}，请用包含这些指标的语料重新生成草图')
+            columns = percentiles.transform({name: columns[name] for name in config.metric_names})
+            input_normalization = {k: (name, 1.0) for k, (name, _) in input_normalization.items()}
+            output_normalization = {k: (name, 1.0) for k, (name, _) in output_normalization.items()}
+
+        input_score = _aggregate_columns(columns, input_normalization, input_weights or config.input_weights)
+        output_score = _aggregate_columns(columns, output_normalization, output_weights or config.output_weights)
+        overall = input_score * config.overall_weights[0] + output_score * config.overall_weights[1]
+        return {
+            'input_complexity': input_score,
+            'output_complexity': output_score,
+            'overall': overall,
+            'level': MetricsAggregator.classify_columns(overall, config.thresholds),
+        }
+
+    @staticmethod
+    def classify_columns(scores: np.ndarray, thresholds: Tuple[float, float] = DIFFICULTY_THRESHOLDS) -> np.ndarray:
+        """向量化的 classify_difficulty，返回等级字符串数组"""
+        buckets = np.searchsorted(np.asarray(thresholds), scores, side='right')
+        return np.asarray(DIFFICULTY_LEVELS)[buckets]
+
+
+def _merge_terms(normalization: Dict[str, Tuple[str, float]], weights: Dict[str, float], terms: Mapping[str, dict]):
+    """把 YAML 中的 项 → {metric, cap, weight} 合并到默认配置上；weight 为 0 的项从评分中去掉"""
+    for term, spec in terms.items():
+        spec = spec or {}
+        if term not in normalization and not ('metric' in spec and 'cap' in spec):
+            raise ValueError(f'新增的评分项 {term} 需要同时给出 metric 与 cap')
+        metric, cap = normalization.get(term, (None, None))
+        normalization[term] = (spec.get('metric', metric), float(spec.get('cap', cap)))
+        if 'weight' in spec:
+            weights[term] = float(spec['weight'])
+        elif term not in weights:
+            raise ValueError(f'新增的评分项 {term} 需要给出 weight')
+        if weights[term] == 0:
+            del weights[term]
+
+
+def _aggregate(metrics: dict, normalization: Mapping[str, Tuple[str, float]], weights: Mapping[str, float]) -> float:
+    return sum(
+        min(metrics.get(normalization[k][0], 0) / normalization[k][1], 1.0) * weights[k]
+        for k in weights
+    )
+
+
+def _aggregate_columns(
+    columns: Mapping[str, np.ndarray],
+    normalization: Mapping[str, Tuple[str, float]],
+    weights: Mapping[str, float],
+) -> np.ndarray:
+    # 与 sum() 相同：从 0 开始按 weights 的顺序逐项累加
+    n = len(next(iter(columns.values()))) if columns else 0
+    total = np.zeros(n, dtype=np.float64)
+    for k in weights:
+        name, cap = normalization[k]
+        total = total + np.minimum(columns[name] / cap, 1.0) * weights[k]
+    return total
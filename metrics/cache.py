@@ -0,0 +1,222 @@
+import hashlib
+import json
+import sqlite3
+import threading
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from core.call_graph import CallGraph
+from core.method import MethodInfo
+from core.symbol_table import GlobalSymbolTable
+from core.types import TypeInfo
+
+
+# 细粒度指标的计算逻辑变化时递增，使已有缓存全部失效
+METRICS_VERSION = 1
+
+# SQLite 单条语句的参数个数上限较小，按块查询
+_QUERY_CHUNK = 500
+
+
+class ClassFingerprints:
+    """
+    类FQN → 深度指纹。
+
+    指纹覆盖指标计算会读取的类信息（类别与各字段类型），并递归包含字段类型所指向的项目类：
+    对象嵌套深度、类型复杂度都沿字段类型传递，任何可达类的字段变化都会改变指纹。
+    在"类 → 字段类型类"图上缩点后按逆拓扑序计算，同一 SCC 内的类共享指纹，整体为线性时间。
+    """
+
+    def __init__(self, symbol_table: GlobalSymbolTable):
+        self.symbol_table = symbol_table
+        self.fingerprints: Dict[str, str] = {}
+        self._build()
+
+    def get(self, fqn: str) -> Optional[str]:
+        return self.fingerprints.get(fqn)
+
+    def _build(self):
+        classes = self.symbol_table.classes
+        keys = list(classes)
+        if not keys:
+            return
+        index = {fqn: i for i, fqn in enumerate(keys)}
+
+        src, dst = [], []
+        for i, fqn in enumerate(keys):
+            for f in classes[fqn].fields.values():
+                target = index.get(f.type.resolved_fqn)
+                if target is not None and not f.type.is_primitive:
+                    src.append(i)
+                    dst.append(target)
+
+        graph = CallGraph.from_edges(keys, np.asarray(src, dtype=np.int64), np.asarray(dst, dtype=np.int64))
+        labels, count = graph.strongly_connected_components()
+        indptr, indices, _ = graph.condensation()
+        indptr, indices = indptr.tolist(), indices.tolist()
+
+        members: List[List[int]] = [[] for _ in range(count)]
+        for i, label in enumerate(labels.tolist()):
+            members[label].append(i)
+
+        # SCC 编号为逆拓扑序：下游 SCC 的编号更小，先于上游计算
+        component_fp: List[str] = []
+        for c in range(count):
+            digest = hashlib.sha1()
+            for shape in sorted(_class_shape(keys[i], classes[keys[i]]) for i in members[c]):
+                digest.update(shape.encode('utf-8'))
+            for fp in sorted(component_fp[d] for d in indices[indptr[c]:indptr[c + 1]]):
+                digest.update(fp.encode('ascii'))
+            component_fp.append(digest.hexdigest())
+
+        self.fingerprints = {fqn: component_fp[label] for fqn, label in zip(keys, labels.tolist())}
+
+
+class MetricsCache:
+    """
+    持久化的细粒度指标缓存（SQLite）。
+
+    每个方法保存一条记录：方法键 → (缓存键, 细粒度指标JSON)。缓存键由以下内容哈希得到：
+        - METRICS_VERSION 与已注册的指标名（增减插件指标会使缓存失效）；
+        - 方法源码与所属类；
+        - 参数/返回类型、调用目标（含选中的重载方法键）、字段访问的解析结果；
+        - 上述依赖类（含所属类）的深度指纹，见 ClassFingerprints。
+    任一部分变化都会使该方法的缓存失效。调用图指标依赖整个项目，不进入缓存。
+    并行计算时查询在进程池的任务分发线程中进行，连接允许跨线程使用，由锁串行化。
+    """
+
+    def __init__(self, path: str, symbol_table: GlobalSymbolTable, metric_names: Iterable[str] = ()):
+        self.path = path
+        self.symbol_table = symbol_table
+        self.metric_names = list(metric_names)
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self._lock = threading.Lock()
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS method_metrics ("
+            "method_key TEXT PRIMARY KEY, cache_key TEXT NOT NULL, metrics TEXT NOT NULL)"
+        )
+        self.conn.commit()
+
+        self.hits = 0
+        self.misses = 0
+        self._fingerprints: Optional[ClassFingerprints] = None
+
+    @property
+    def fingerprints(self) -> ClassFingerprints:
+        # 需在项目解析完成后再计算，首次使用时构建
+        if self._fingerprints is None:
+            self._fingerprints = ClassFingerprints(self.symbol_table)
+        return self._fingerprints
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def lookup(self, method_keys: Iterable[str]) -> Tuple[Dict[str, dict], Dict[str, str]]:
+        """
+        返回 (命中的 方法键 → 细粒度指标, 未命中的 方法键 → 缓存键)。
+        符号表中不存在的方法两边都不出现。
+        """
+        methods = self.symbol_table.methods
+        wanted = {key: self.cache_key(key, methods[key]) for key in method_keys if key in methods}
+
+        hits: Dict[str, dict] = {}
+        keys = list(wanted)
+        with self._lock:
+            for start in range(0, len(keys), _QUERY_CHUNK):
+                chunk = keys[start:start + _QUERY_CHUNK]
+                rows = self.conn.execute(
+                    f"SELECT method_key, cache_key, metrics FROM method_metrics "
+                    f"WHERE method_key IN ({','.join('?' * len(chunk))})",
+                    chunk,
+                ).fetchall()
+                for method_key, cache_key, metrics in rows:
+                    if wanted[method_key] == cache_key:
+                        hits[method_key] = json.loads(metrics)
+
+            pending = {key: cache_key for key, cache_key in wanted.items() if key not in hits}
+            self.hits += len(hits)
+            self.misses += len(pending)
+        return hits, pending
+
+    def store(self, rows: Iterable[Tuple[str, str, dict]]):
+        """写入 (方法键, 缓存键, 细粒度指标)，覆盖该方法的旧记录"""
+        rows = [(key, cache_key, json.dumps(metrics, ensure_ascii=False)) for key, cache_key, metrics in rows]
+        with self._lock:
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO method_metrics (method_key, cache_key, metrics) VALUES (?, ?, ?)",
+                rows,
+            )
+            self.conn.commit()
+
+    def close(self):
+        with self._lock:
+            self.conn.close()
+
+    def cache_key(self, method_key: str, method: MethodInfo) -> str:
+        class_fqn = method_key.split('#', 1)[0]
+        deps = {class_fqn}
+
+        types = [p.type for p in method.parameters]
+        if method.return_type is not None:
+            types.append(method.return_type)
+
+        fields = []
+        resolved_fields = getattr(method.control_flow, 'resolved_field_accesses', None)
+        for member in resolved_fields or ():
+            if member is None:
+                fields.append(None)
+                continue
+            owner, info = member
+            deps.add(owner)
+            types.append(info.type)
+            fields.append((owner, info.name))
+
+        calls = []
+        for call in method.method_calls:
+            if call.resolved_fqn:
+                deps.add(call.resolved_fqn)
+            # 被调方法键随重载选择变化：方法源码不变时换了重载同样使缓存失效
+            callee_key = getattr(call, 'resolved_method_key', None)
+            if callee_key:
+                deps.add(callee_key.split('#', 1)[0])
+            calls.append((call.resolved_fqn, callee_key, getattr(call, 'argument_count', None)))
+
+        type_tokens = [_type_token(t) for t in types]
+        for t in types:
+            _collect_type_classes(t, deps)
+
+        fingerprints = self.fingerprints
+        payload = json.dumps(
+            [
+                METRICS_VERSION,
+                self.metric_names,
+                method_key,
+                method.content,
+                type_tokens,
+                calls,
+                fields if resolved_fields is not None else None,
+                sorted((fqn, fingerprints.get(fqn)) for fqn in deps),
+            ],
+            ensure_ascii=False,
+        )
+        return hashlib.sha1(payload.encode('utf-8')).hexdigest()
+
+
+def _type_token(t: TypeInfo) -> str:
+    generics = ','.join(_type_token(g) for g in t.generics)
+    return f"{t.raw}|{t.base}|{t.resolved_fqn}|{int(t.is_primitive)}|{t.array_dimension}<{generics}>"
+
+
+def _collect_type_classes(t: TypeInfo, out: set):
+    if t.resolved_fqn and not t.is_primitive:
+        out.add(t.resolved_fqn)
+    for g in t.generics:
+        _collect_type_classes(g, out)
+
+
+def _class_shape(fqn: str, cls) -> str:
+    fields = ';'.join(f"{name}:{_type_token(f.type)}" for name, f in cls.fields.items())
+    return f"{fqn}|{cls.kind}|{fields}\n"
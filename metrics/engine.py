@@ -0,0 +1,388 @@
+import heapq
+import multiprocessing
+from collections import deque
+from itertools import islice
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from loguru import logger
+
+from core.call_graph import CallGraphMetrics
+from core.project import ProjectContext
+from .complexity_calculator import ComplexityCalculator
+from .input_metrics import InputMetricsCalculator
+from .output_metrics import OutputMetricsCalculator
+from .aggregator import MetricsAggregator
+from .cache import MetricsCache
+from .registry import DEFAULT_REGISTRY, MetricContext, MetricRegistry
+from .nesting import MAX_NESTING_DEPTH
+from .output_metrics import MAX_MOCK_COMPLEXITY
+
+
+# 调用图指标所在的类别名；它依赖整个调用图，不写入指标缓存
+GRAPH_CATEGORY = '调用图结构'
+
+# Top-K 求上界时精确计算的轻量指标；其余参与评分的指标（参数类型复杂度、嵌套深度、Mock、Setup）取上界
+BOUND_EXACT_METRICS = (
+    'cyclomatic_complexity', 'branch_count', 'loop_count', 'exception_paths',
+    'field_dependency_count', 'external_call_count', 'dependent_class_count',
+    'return_type_complexity', 'assertion_complexity',
+)
+
+# 每批向量化评分的方法数；并行模式下也是分发给子进程的任务粒度
+DEFAULT_BATCH_SIZE = 512
+
+# 并行计算时，fork 出的子进程通过该全局变量以 copy-on-write 方式共享引擎（及其引用的项目）
+_WORKER_ENGINE: Optional["DifficultyEngine"] = None
+
+
+def _compute_worker(task: Tuple[List[str], Optional[Dict[str, dict]]]) -> List[dict]:
+    method_keys, cached = task
+    return _WORKER_ENGINE.compute_batch(method_keys, cached)
+
+
+class DifficultyEngine:
+    """
+    批量计算方法难度指标。
+
+    计算器实例与 方法键 → 所属类FQN 的映射只构建一次，供所有方法复用。
+    graph_metrics 为整个调用图一次性算好的图指标，提供时输出"调用图结构"类别（不参与评分）。
+    cache 提供时，按批计算前先查缓存，只重新计算失效的方法，并把新结果写回缓存。
+    registry 为指标注册表（默认 DEFAULT_REGISTRY，含已加载的插件指标），按需只计算用到的指标。
+    """
+
+    def __init__(
+        self,
+        project: ProjectContext,
+        graph_metrics: Optional[CallGraphMetrics] = None,
+        cache: Optional[MetricsCache] = None,
+        registry: Optional[MetricRegistry] = None,
+    ):
+        self.project = project
+        self.graph_metrics = graph_metrics
+        self.cache = cache
+        self.registry = registry or DEFAULT_REGISTRY
+
+        self.complexity_calc = ComplexityCalculator()
+        self.input_calc = InputMetricsCalculator(project.symbols)
+        self.output_calc = OutputMetricsCalculator()
+        self.aggregator = MetricsAggregator()
+
+        self.method_classes = self._build_method_classes()
+
+    def _build_method_classes(self) -> Dict[str, str]:
+        """方法键 → 所属类FQN"""
+        symbols = self.project.symbols
+        method_classes = {}
+        for fqn, cls in symbols.classes.items():
+            for name in cls.methods:
+                for key in symbols.get_overloads(fqn, name):
+                    method_classes[key] = fqn
+        return method_classes
+
+    def compute_all(self, method_keys: Optional[Iterable[str]] = None) -> List[dict]:
+        """计算一组方法（默认全部方法）的难度指标"""
+        return list(self.iter_compute(method_keys))
+
+    def iter_compute(
+        self,
+        method_keys: Optional[Iterable[str]] = None,
+        jobs: int = 1,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+    ) -> Iterator[dict]:
+        """
+        按批计算并逐条产出结果，顺序与 method_keys 一致。
+        jobs > 1 时按批分发给 fork 出的子进程，子进程以 copy-on-write 方式共享已加载的项目，
+        每批完成后即可产出，无需等待全部方法计算完毕。
+        """
+        if method_keys is None:
+            method_keys = self.project.symbols.methods
+
+        # 缓存只在主进程中读写：每批的未命中项按顺序排队，结果按同样的顺序返回后写回
+        pending_batches = deque()
+
+        def tasks():
+            for batch in _batched(method_keys, batch_size):
+                cached, pending = self.cache.lookup(batch) if self.cache is not None else (None, None)
+                pending_batches.append(pending)
+                yield batch, cached
+
+        if jobs > 1 and "fork" not in multiprocessing.get_all_start_methods():
+            logger.warning("当前平台不支持 fork，难度计算退回单进程执行")
+            jobs = 1
+
+        if jobs <= 1:
+            for batch, cached in tasks():
+                results = self.compute_batch(batch, cached)
+                self._store(results, pending_batches.popleft())
+                yield from results
+            return
+
+        global _WORKER_ENGINE
+        _WORKER_ENGINE = self
+        try:
+            with multiprocessing.get_context("fork").Pool(jobs) as pool:
+                for results in pool.imap(_compute_worker, tasks()):
+                    self._store(results, pending_batches.popleft())
+                    yield from results
+        finally:
+            _WORKER_ENGINE = None
+
+    def iter_metrics(self, names: Iterable[str], method_keys: Optional[Iterable[str]] = None) -> Iterator[dict]:
+        """
+        只计算指定指标（不评分、不读写缓存、不含调用图指标），用于筛选等只需少量指标的场景。
+        """
+        names = tuple(names)
+        self.registry.plan(names)  # 提前检查指标名
+        if method_keys is None:
+            method_keys = self.project.symbols.methods
+        for key in method_keys:
+            values = self.compute_metrics(key, names)
+            if values is None:
+                yield {'error': f'Method not found: {key}'}
+            else:
+                yield {'method_fqn': key, '细粒度指标': self.registry.group(values, names)}
+
+    def _store(self, results: List[dict], pending: Optional[Dict[str, str]]):
+        """把本批新计算的细粒度指标写入缓存（不含调用图指标）"""
+        if not pending:
+            return
+        rows = []
+        for result in results:
+            cache_key = pending.get(result.get('method_fqn'))
+            if cache_key is not None:
+                fine_grained = {k: v for k, v in result['细粒度指标'].items() if k != GRAPH_CATEGORY}
+                rows.append((result['method_fqn'], cache_key, fine_grained))
+        self.cache.store(rows)
+
+    def compute_batch(self, method_keys: Iterable[str], cached: Optional[Dict[str, dict]] = None) -> List[dict]:
+        """
+        计算一批方法的难度指标。
+        细粒度指标逐方法计算（cached 中已有的直接复用），评分部分按列一次性向量化完成。
+        """
+        results: List[Optional[dict]] = []
+        scored = []   # (结果下标, 方法键, 细粒度指标)
+        for key in method_keys:
+            if cached and key in cached:
+                fine_grained = self._with_graph_metrics(key, cached[key])
+            else:
+                fine_grained = self.compute_fine_grained(key)
+            if fine_grained is None:
+                results.append({'error': f'Method not found: {key}'})
+                continue
+            scored.append((len(results), key, fine_grained))
+            results.append(None)
+
+        columns = self.aggregator.collect_columns([_flatten(fg) for _, _, fg in scored])
+        scores = self.aggregator.score_columns(columns)
+        for row, (pos, key, fine_grained) in enumerate(scored):
+            results[pos] = _build_result(
+                key,
+                fine_grained,
+                float(scores['input_complexity'][row]),
+                float(scores['output_complexity'][row]),
+                float(scores['overall'][row]),
+                str(scores['level'][row]),
+            )
+        return results
+
+    def top_k(self, k: int, method_keys: Optional[Iterable[str]] = None) -> List[dict]:
+        """
+        总体难度最高的 k 个方法，按分数降序、方法键升序排列，与对全部方法完整评分后排序的结果相同。
+
+        先为每个方法计算分数上界（轻量指标取精确值，昂贵指标取上界），按上界从高到低逐个完整计算，
+        用小顶堆维护当前前 k 名；上界已不可能进入前 k 名时，其余方法不再计算昂贵指标。
+        各项归一化与加权都是单调的，上界与精确分数按同样的顺序求和，因此上界不小于精确分数。
+        cache 提供时，命中缓存的方法直接以缓存指标的精确分数作为上界，新计算的方法写回缓存。
+        """
+        if method_keys is None:
+            method_keys = self.project.symbols.methods
+        if k <= 0:
+            return []
+        method_keys = list(method_keys)
+
+        cached, pending = self.cache.lookup(method_keys) if self.cache is not None else ({}, {})
+        aggregator = self.aggregator
+        candidates = []
+        for key in method_keys:
+            if key in cached:
+                cached[key] = self._with_graph_metrics(key, cached[key])
+                all_metrics = _flatten(cached[key])
+                bound = aggregator.calculate_overall_difficulty(
+                    aggregator.aggregate_input_complexity(all_metrics),
+                    aggregator.aggregate_output_complexity(all_metrics),
+                )
+            else:
+                bound = self.score_upper_bound(key)
+            if bound is not None:
+                candidates.append((-bound, key))
+        candidates.sort()
+
+        heap = []   # (分数, _Descending(方法键), 细粒度指标, input 分数, output 分数)：堆顶为当前第 k 名
+        evaluated = 0
+        computed = []
+        for neg_bound, key in candidates:
+            if len(heap) == k:
+                worst_score, worst_key = heap[0][0], heap[0][1].key
+                if -neg_bound < worst_score:
+                    break
+                if -neg_bound == worst_score and key > worst_key:
+                    continue
+
+            fine_grained = cached.get(key)
+            if fine_grained is None:
+                fine_grained = self.compute_fine_grained(key)
+                evaluated += 1
+                computed.append({'method_fqn': key, '细粒度指标': fine_grained})
+            all_metrics = _flatten(fine_grained)
+            input_score = aggregator.aggregate_input_complexity(all_metrics)
+            output_score = aggregator.aggregate_output_complexity(all_metrics)
+            entry = (
+                aggregator.calculate_overall_difficulty(input_score, output_score),
+                _Descending(key), fine_grained, input_score, output_score,
+            )
+            if len(heap) < k:
+                heapq.heappush(heap, entry)
+            elif entry[:2] > heap[0][:2]:
+                heapq.heapreplace(heap, entry)
+
+        if self.cache is not None:
+            self._store(computed, pending)
+        logger.info("【Top-K】{} 个方法中完整计算了 {} 个", len(candidates), evaluated)
+
+        ranked = sorted(heap, key=lambda e: (-e[0], e[1].key))
+        return [
+            _build_result(
+                wrapped.key, fine_grained, input_score, output_score, overall,
+                aggregator.classify_difficulty(overall),
+            )
+            for overall, wrapped, fine_grained, input_score, output_score in ranked
+        ]
+
+    def score_upper_bound(self, method_key: str) -> Optional[float]:
+        """总体难度分数的上界，不触发类型图与 Mock 相关的计算；方法不存在时返回 None"""
+        values = self.compute_metrics(method_key, BOUND_EXACT_METRICS)
+        if values is None:
+            return None
+        method = self.project.symbols.methods[method_key]
+        input_calc = self.input_calc
+
+        param_bound = sum(input_calc.type_complexity_upper_bound(p.type) for p in method.parameters)
+        nesting_bound = MAX_NESTING_DEPTH if any(
+            not p.type.is_primitive and p.type.resolved_fqn for p in method.parameters
+        ) else 0
+
+        resolved = getattr(method.control_flow, 'resolved_field_accesses', None)
+        if resolved is not None:
+            field_bound = sum(input_calc.type_complexity_upper_bound(member[1].type) for member in resolved if member)
+        else:
+            field_bound = len(method.control_flow.field_accesses) * (4 + MAX_NESTING_DEPTH)
+
+        values['parameter_type_complexity'] = param_bound
+        values['object_nesting_depth'] = nesting_bound
+        values['mock_requirement_score'] = MAX_MOCK_COMPLEXITY if values['external_call_count'] else 0.0
+        values['setup_complexity'] = param_bound + field_bound
+
+        aggregator = self.aggregator
+        return aggregator.calculate_overall_difficulty(
+            aggregator.aggregate_input_complexity(values),
+            aggregator.aggregate_output_complexity(values),
+        )
+
+    def compute(self, method_key: str) -> dict:
+        """计算单个方法的难度指标"""
+        fine_grained = self.compute_fine_grained(method_key)
+        if fine_grained is None:
+            return {'error': f'Method not found: {method_key}'}
+
+        # 聚合所有指标用于评分
+        all_metrics = _flatten(fine_grained)
+
+        # 计算维度聚合分数
+        aggregator = self.aggregator
+        input_score = aggregator.aggregate_input_complexity(all_metrics)
+        output_score = aggregator.aggregate_output_complexity(all_metrics)
+        overall_score = aggregator.calculate_overall_difficulty(input_score, output_score)
+        difficulty_level = aggregator.classify_difficulty(overall_score)
+
+        return _build_result(method_key, fine_grained, input_score, output_score, overall_score, difficulty_level)
+
+    def compute_fine_grained(self, method_key: str) -> Optional[dict]:
+        """计算单个方法的细粒度指标（按类别分组）；方法不存在时返回 None"""
+        values = self.compute_metrics(method_key)
+        if values is None:
+            return None
+        return self._with_graph_metrics(method_key, self.registry.group(values))
+
+    def compute_metrics(self, method_key: str, names: Optional[Iterable[str]] = None) -> Optional[Dict[str, object]]:
+        """
+        只计算 names（默认全部已注册指标）及其依赖，返回 指标名 → 值（含用到的中间结果）；
+        方法不存在时返回 None。只需要圈复杂度等轻量指标时，不会触发类型图相关的计算。
+        """
+        method = self.project.symbols.methods.get(method_key)
+        if not method:
+            return None
+        plan = self.registry.plan(names)
+        ctx = MetricContext(self, method, method_key, self.method_classes.get(method_key, ''))
+        return self.registry.evaluate(plan, ctx)
+
+    def _with_graph_metrics(self, method_key: str, fine_grained: dict) -> dict:
+        if self.graph_metrics is not None:
+            graph_category = self.graph_metrics.for_method(method_key)
+            if graph_category is not None:
+                fine_grained[GRAPH_CATEGORY] = graph_category
+        return fine_grained
+
+
+class _Descending:
+    """反转比较顺序的方法键：Top-K 小顶堆中，同分时方法键较大者视为更差"""
+
+    __slots__ = ('key',)
+
+    def __init__(self, key: str):
+        self.key = key
+
+    def __lt__(self, other: "_Descending") -> bool:
+        return self.key > other.key
+
+    def __gt__(self, other: "_Descending") -> bool:
+        return self.key < other.key
+
+    def __eq__(self, other: "_Descending") -> bool:
+        return self.key == other.key
+
+
+def _batched(items: Iterable[str], size: int) -> Iterator[List[str]]:
+    it = iter(items)
+    while True:
+        batch = list(islice(it, size))
+        if not batch:
+            return
+        yield batch
+
+
+def _flatten(fine_grained: dict) -> dict:
+    """把按类别分组的细粒度指标展平为 指标名 → 值"""
+    all_metrics = {}
+    for category in fine_grained.values():
+        all_metrics.update(category)
+    return all_metrics
+
+
+def _build_result(
+    method_key: str,
+    fine_grained: dict,
+    input_score: float,
+    output_score: float,
+    overall_score: float,
+    difficulty_level: str,
+) -> dict:
+    return {
+        'method_fqn': method_key,
+        '细粒度指标': fine_grained,
+        '维度聚合分数': {
+            'input_complexity': round(input_score, 2),
+            'output_complexity': round(output_score, 2),
+        },
+        '总体难度分数': round(overall_score, 2),
+        '难度等级': difficulty_level,
+    }
@@ -1,7 +1,13 @@
-from typing import Set
+from typing import Optional, Set
 from core.method import MethodInfo
 from core.types import TypeInfo
 from core.symbol_table import GlobalSymbolTable
+from .nesting import NestingDepthIndex, MAX_NESTING_DEPTH
+
+
+# 类型复杂度：String/包装类为 2，集合取泛型参数的最大复杂度（无泛型为 3），自定义对象为 4 + 嵌套层数
+SIMPLE_TYPES = ('String', 'Integer', 'Long', 'Double', 'Float', 'Boolean', 'Character', 'Byte', 'Short')
+COLLECTION_TYPES = ('List', 'Map', 'Set', 'Collection', 'ArrayList', 'HashMap', 'HashSet', 'LinkedList')
 
 
 class InputMetricsCalculator:
@@ -9,6 +15,8 @@ class InputMetricsCalculator:
 
     def __init__(self, symbol_table: GlobalSymbolTable):
         self.symbol_table = symbol_table
+        # 类FQN → 嵌套深度，首次查询时按 SCC 一次性计算
+        self.nesting_index = NestingDepthIndex(symbol_table)
 
     def calculate_field_dependency(self, method: MethodInfo) -> int:
         """计算字段依赖数"""
@@ -84,7 +92,7 @@ class InputMetricsCalculator:
         for param in method.parameters:
             complexity = self.calculate_type_complexity(param.type)
             total_complexity += complexity
-            nesting = self.calculate_nesting_depth(param.type, set())
+            nesting = self.calculate_nesting_depth(param.type)
             max_nesting = max(max_nesting, nesting)
 
         return {
@@ -93,10 +101,21 @@ class InputMetricsCalculator:
             'object_nesting_depth': max_nesting,
         }
 
-    def calculate_field_type_complexity(self, method: MethodInfo) -> int:
+    def calculate_field_type_complexity(self, method: MethodInfo, class_fqn: str = '') -> int:
         """计算字段类型复杂度"""
+        # resolve_all 已把字段访问解析为 (声明类, FieldInfo)，直接读取；旧的解析结果没有该字段时退回按名字查找
+        resolved = getattr(method.control_flow, 'resolved_field_accesses', None)
+        if resolved is not None:
+            return sum(self.calculate_type_complexity(member[1].type) for member in resolved if member)
+
         total_complexity = 0
         for field_name in method.control_flow.field_accesses:
+            # this.xxx 先在所属类及其祖先的继承字段表中查找
+            if class_fqn and field_name.startswith('this.'):
+                member = self.symbol_table.lookup_field(class_fqn, field_name[len('this.'):])
+                if member:
+                    total_complexity += self.calculate_type_complexity(member[1].type)
+                    continue
             # 尝试从符号表获取字段类型
             for cls in self.symbol_table.classes.values():
                 if field_name in cls.fields:
@@ -112,24 +131,47 @@ class InputMetricsCalculator:
         base = type_info.base or type_info.raw
 
         # String/包装类
-        if base in ['String', 'Integer', 'Long', 'Double', 'Float', 'Boolean', 'Character', 'Byte', 'Short']:
+        if base in SIMPLE_TYPES:
             return 2
 
         # 集合类：返回泛型参数的最大复杂度
-        if base in ['List', 'Map', 'Set', 'Collection', 'ArrayList', 'HashMap', 'HashSet', 'LinkedList']:
+        if base in COLLECTION_TYPES:
             if not type_info.generics:
                 return 3
             return max(self.calculate_type_complexity(arg) for arg in type_info.generics)
 
         # 自定义对象：4 + 嵌套层数
-        nesting = self.calculate_nesting_depth(type_info, set())
+        nesting = self.calculate_nesting_depth(type_info)
         return 4 + nesting
 
-    def calculate_nesting_depth(self, type_info: TypeInfo, visited: Set[str], depth: int = 0) -> int:
+    def type_complexity_upper_bound(self, type_info: TypeInfo) -> int:
+        """
+        calculate_type_complexity 的上界：规则相同，只是把对象嵌套深度取为上限，不遍历类型图。
+        """
+        if type_info.is_primitive:
+            return 1
+
+        base = type_info.base or type_info.raw
+        if base in SIMPLE_TYPES:
+            return 2
+        if base in COLLECTION_TYPES:
+            if not type_info.generics:
+                return 3
+            return max(self.type_complexity_upper_bound(arg) for arg in type_info.generics)
+        return 4 + (MAX_NESTING_DEPTH if type_info.resolved_fqn else 0)
+
+    def calculate_nesting_depth(self, type_info: TypeInfo, visited: Optional[Set[str]] = None, depth: int = 0) -> int:
         """计算对象嵌套深度"""
         if type_info.is_primitive or depth > 5:
             return depth
 
+        if not visited:
+            # 路径上尚无已访问类时，结果只取决于类本身，直接查记忆化的深度
+            fqn = type_info.resolved_fqn
+            if not fqn:
+                return depth
+            return min(MAX_NESTING_DEPTH, depth + self.nesting_index.depth(fqn))
+
         fqn = type_info.resolved_fqn
         if not fqn or fqn in visited:
             return depth
@@ -0,0 +1,131 @@
+from typing import Dict, List, Optional, Set
+
+from core.symbol_table import GlobalSymbolTable
+
+
+# 与 calculate_nesting_depth 原有的 depth > 5 截断一致：嵌套深度最大为 6
+MAX_NESTING_DEPTH = 6
+
+
+class NestingDepthIndex:
+    """
+    按类 FQN 记忆化的对象嵌套深度。
+
+    嵌套深度定义与递归版本相同：从类出发沿字段类型前进，每经过一个字段深度 +1，
+    遇到基本类型、非项目类、无法解析的类型或路径上已出现的类时停止，结果截断为 MAX_NESTING_DEPTH。
+
+    在"类 → 字段类型类"构成的图上按需做 Tarjan SCC，按逆拓扑序计算：
+        - 离开当前 SCC 的字段直接使用下游 SCC 已算好的深度（下游不可能回到路径上的类）；
+        - 只有同一 SCC 内部才需要按路径展开，且展开深度受截断上限约束，达到上限即提前返回。
+    每个类只计算一次，之后为 O(1) 查询。
+    注意：结果反映首次查询时的类型解析状态。
+    """
+
+    def __init__(self, symbol_table: GlobalSymbolTable):
+        self.symbol_table = symbol_table
+        self.depths: Dict[str, int] = {}
+
+    def depth(self, fqn: str) -> int:
+        cached = self.depths.get(fqn)
+        if cached is not None:
+            return cached
+        if self.symbol_table.get_class(fqn) is None:
+            return 0
+        self._compute_from(fqn)
+        return self.depths[fqn]
+
+    # =====================================================================
+    # 内部实现
+    # =====================================================================
+    def _field_targets(self, fqn: str) -> List[Optional[str]]:
+        """类的每个字段 → 字段类型对应的项目类 FQN（不是项目类时为 None）"""
+        cls = self.symbol_table.get_class(fqn)
+        targets = []
+        for field in cls.fields.values():
+            target = None if field.type.is_primitive else field.type.resolved_fqn
+            if target is not None and self.symbol_table.get_class(target) is None:
+                target = None
+            targets.append(target)
+        return targets
+
+    def _compute_from(self, start: str):
+        """
+        从 start 出发做迭代式 Tarjan，每完成一个 SCC 就计算其中各类的深度。
+        """
+        targets: Dict[str, List[Optional[str]]] = {}
+        order: Dict[str, int] = {}
+        low: Dict[str, int] = {}
+        stack: List[str] = []
+        on_stack: Set[str] = set()
+
+        def visit(node: str):
+            order[node] = low[node] = len(order)
+            stack.append(node)
+            on_stack.add(node)
+            targets[node] = self._field_targets(node)
+
+        visit(start)
+        work = [(start, 0)]
+        while work:
+            node, pos = work[-1]
+            succ = targets[node]
+
+            descended = False
+            while pos < len(succ):
+                nxt = succ[pos]
+                pos += 1
+                if nxt is None or nxt in self.depths:
+                    continue
+                if nxt not in order:
+                    work[-1] = (node, pos)
+                    visit(nxt)
+                    work.append((nxt, 0))
+                    descended = True
+                    break
+                if nxt in on_stack and order[nxt] < low[node]:
+                    low[node] = order[nxt]
+            if descended:
+                continue
+
+            work.pop()
+            if work:
+                parent = work[-1][0]
+                if low[node] < low[parent]:
+                    low[parent] = low[node]
+
+            if low[node] == order[node]:
+                component = set()
+                while True:
+                    member = stack.pop()
+                    on_stack.discard(member)
+                    component.add(member)
+                    if member == node:
+                        break
+                # 同一 SCC 的结果互相依赖路径，全部算完后再写入
+                results = {
+                    member: self._explore(member, 0, {member}, component, targets)
+                    for member in component
+                }
+                self.depths.update(results)
+
+    def _explore(self, fqn: str, depth: int, path: Set[str], component: Set[str], targets) -> int:
+        if depth >= MAX_NESTING_DEPTH:
+            return depth
+
+        best = depth
+        for target in targets[fqn]:
+            next_depth = depth + 1
+            if target is None or target in path:
+                value = next_depth
+            elif target not in component:
+                value = min(MAX_NESTING_DEPTH, next_depth + self.depths[target])
+            else:
+                path.add(target)
+                value = self._explore(target, next_depth, path, component, targets)
+                path.discard(target)
+
+            if value > best:
+                best = value
+                if best >= MAX_NESTING_DEPTH:
+                    return MAX_NESTING_DEPTH
+        return best
@@ -3,6 +3,10 @@ from core.types import TypeInfo
 from typing import Optional, List
 
 
+# Mock 复杂度的上限
+MAX_MOCK_COMPLEXITY = 30.0
+
+
 class OutputMetricsCalculator:
     """计算输出复杂度指标"""
 
@@ -50,7 +54,7 @@ class OutputMetricsCalculator:
         matcher_score = OutputMetricsCalculator._calculate_matcher_complexity(external_calls)
 
         total = base_score + method_score + return_score + matcher_score
-        return min(total, 30.0)  # 限制最大值
+        return min(total, MAX_MOCK_COMPLEXITY)  # 限制最大值
 
     @staticmethod
     def _calculate_mock_return_complexity(calls: List[MethodCallInfo]) -> float:
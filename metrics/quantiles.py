@@ -0,0 +1,146 @@
+from typing import Dict, Iterable, List, Mapping, Optional
+
+import numpy as np
+
+
+# 每层压缩器的容量；误差约为 O(1/k)，内存为 O(k · log(n/k))
+DEFAULT_SKETCH_CAPACITY = 2048
+
+
+class QuantileSketch:
+    """
+    流式、可合并的分位数草图（KLL 式压缩器）。
+
+    第 h 层的每个元素代表 2^h 个原始值。某层超过容量时排序，随机取奇数位或偶数位的元素提升到上一层，
+    其余丢弃，总权重保持不变。数据量不超过容量时不发生压缩，结果是精确的。
+    随机数生成器带固定种子，同样的输入顺序得到同样的结果。
+    """
+
+    def __init__(self, capacity: int = DEFAULT_SKETCH_CAPACITY, seed: int = 0):
+        self.capacity = capacity
+        self.levels: List[np.ndarray] = [np.empty(0, dtype=np.float64)]
+        self.count = 0
+        self._rng = np.random.default_rng(seed)
+
+    def update(self, values: np.ndarray):
+        """批量加入一组值（NaN 被忽略）"""
+        values = np.asarray(values, dtype=np.float64).ravel()
+        values = values[~np.isnan(values)]
+        if not len(values):
+            return
+        self.count += len(values)
+        self.levels[0] = np.concatenate((self.levels[0], values))
+        self._compress()
+
+    def merge(self, other: "QuantileSketch"):
+        """把另一个草图合并进来（逐层拼接后压缩）"""
+        while len(self.levels) < len(other.levels):
+            self.levels.append(np.empty(0, dtype=np.float64))
+        for h, items in enumerate(other.levels):
+            self.levels[h] = np.concatenate((self.levels[h], items))
+        self.count += other.count
+        self._compress()
+
+    def _compress(self):
+        h = 0
+        while h < len(self.levels):
+            items = self.levels[h]
+            if len(items) > self.capacity:
+                items = np.sort(items)
+                # 奇数个时最大的元素留在本层，其余成对压缩
+                keep = items[len(items) - len(items) % 2:]
+                paired = items[:len(items) - len(keep)]
+                promoted = paired[int(self._rng.integers(2))::2]
+                self.levels[h] = keep
+                if h + 1 == len(self.levels):
+                    self.levels.append(np.empty(0, dtype=np.float64))
+                self.levels[h + 1] = np.concatenate((self.levels[h + 1], promoted))
+            h += 1
+
+    def _weighted_items(self):
+        values = np.concatenate(self.levels)
+        weights = np.concatenate([np.full(len(items), 2.0 ** h) for h, items in enumerate(self.levels)])
+        order = np.argsort(values, kind='stable')
+        values = values[order]
+        cumulative = np.concatenate(([0.0], np.cumsum(weights[order])))
+        return values, cumulative
+
+    def cdf(self, x: np.ndarray) -> np.ndarray:
+        """
+        严格小于 x 的比例 P(X < x)，取值在 [0, 1)。
+        语料最小值（如大量并列的 0）映射为 0，与 cap 归一化一致；空草图返回全 0。
+        """
+        x = np.asarray(x, dtype=np.float64)
+        if self.count == 0:
+            return np.zeros_like(x)
+        values, cumulative = self._weighted_items()
+        return cumulative[np.searchsorted(values, x, side='left')] / cumulative[-1]
+
+    def quantile(self, q: np.ndarray) -> np.ndarray:
+        """q ∈ [0, 1] 对应的近似分位数"""
+        values, cumulative = self._weighted_items()
+        if not len(values):
+            return np.full_like(np.asarray(q, dtype=np.float64), np.nan)
+        ranks = np.asarray(q, dtype=np.float64) * cumulative[-1]
+        pos = np.searchsorted(cumulative[1:], ranks, side='left')
+        return values[np.minimum(pos, len(values) - 1)]
+
+
+class PercentileNormalizer:
+    """
+    指标名 → QuantileSketch。
+    可以逐个项目（或逐块）update，也可以合并其他项目上得到的归一化器，
+    然后把各指标列映射到其在整个语料上的百分位。
+    """
+
+    def __init__(self, capacity: int = DEFAULT_SKETCH_CAPACITY):
+        self.capacity = capacity
+        self.sketches: Dict[str, QuantileSketch] = {}
+
+    def update(self, columns: Mapping[str, np.ndarray], names: Optional[Iterable[str]] = None):
+        for name in names if names is not None else columns:
+            if name in columns:
+                self._sketch(name).update(columns[name])
+
+    def merge(self, other: "PercentileNormalizer"):
+        for name, sketch in other.sketches.items():
+            self._sketch(name).merge(sketch)
+
+    def transform(self, columns: Mapping[str, np.ndarray]) -> Dict[str, np.ndarray]:
+        """有草图的列替换为百分位，其余列原样返回"""
+        return {
+            name: self.sketches[name].cdf(column) if name in self.sketches else column
+            for name, column in columns.items()
+        }
+
+    def _sketch(self, name: str) -> QuantileSketch:
+        sketch = self.sketches.get(name)
+        if sketch is None:
+            sketch = self.sketches[name] = QuantileSketch(self.capacity)
+        return sketch
+
+    # =====================================================================
+    # 持久化：每个草图保存为 (值, 层号) 两列，便于跨项目合并
+    # =====================================================================
+    def save(self, path: str):
+        arrays = {}
+        for name, sketch in self.sketches.items():
+            arrays[f"{name}.values"] = np.concatenate(sketch.levels)
+            arrays[f"{name}.levels"] = np.concatenate(
+                [np.full(len(items), h, dtype=np.int16) for h, items in enumerate(sketch.levels)]
+            )
+            arrays[f"{name}.count"] = np.asarray(sketch.count, dtype=np.int64)
+        np.savez_compressed(path, capacity=np.asarray(self.capacity), **arrays)
+
+    @classmethod
+    def load(cls, path: str) -> "PercentileNormalizer":
+        with np.load(path, allow_pickle=False) as data:
+            normalizer = cls(int(data['capacity']))
+            names = [f[:-len('.values')] for f in data.files if f.endswith('.values')]
+            for name in names:
+                values, levels = data[f"{name}.values"], data[f"{name}.levels"]
+                sketch = normalizer._sketch(name)
+                height = int(levels.max()) + 1 if len(levels) else 1
+                sketch.levels = [values[levels == h] for h in range(height)]
+                sketch.count = int(data[f"{name}.count"])
+        return normalizer
@@ -0,0 +1,293 @@
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+
+@dataclass(frozen=True)
+class MetricSpec:
+    """
+    一个指标（或中间结果）的定义。
+
+    compute:
+        compute(ctx, *inputs)，ctx 为 MetricContext，inputs 按声明顺序传入所依赖指标的值。
+
+    inputs:
+        依赖的其他指标名。
+
+    category:
+        输出时所属的类别（如 "函数内部复杂度"）；为 None 时是中间结果，只供其他指标使用，不出现在输出中。
+    """
+
+    name: str
+    compute: Callable[..., Any]
+    inputs: Tuple[str, ...] = ()
+    category: Optional[str] = None
+
+
+class MetricContext:
+    """单个方法的求值上下文：指标函数通过 engine 访问计算器与符号表"""
+
+    __slots__ = ('engine', 'method', 'method_key', 'class_fqn')
+
+    def __init__(self, engine, method, method_key: str, class_fqn: str):
+        self.engine = engine
+        self.method = method
+        self.method_key = method_key
+        self.class_fqn = class_fqn
+
+
+class MetricRegistry:
+    """
+    指标注册表。每个指标声明自己的输入，按所需输出构建依赖 DAG，只计算用得到的指标，
+    共享的中间结果只计算一次。
+
+    输出的类别顺序、类别内指标顺序均为注册顺序。
+    插件通过 register / metric 向注册表（通常是 DEFAULT_REGISTRY）添加新指标，
+    同名指标需显式 replace=True 才能覆盖。
+    """
+
+    def __init__(self):
+        self.specs: Dict[str, MetricSpec] = {}
+        self._plans: Dict[Optional[Tuple[str, ...]], Tuple[MetricSpec, ...]] = {}
+
+    def register(
+        self,
+        name: str,
+        compute: Callable[..., Any],
+        inputs: Iterable[str] = (),
+        category: Optional[str] = None,
+        replace: bool = False,
+    ) -> MetricSpec:
+        if name in self.specs and not replace:
+            raise ValueError(f'指标已注册: {name}')
+        spec = MetricSpec(name, compute, tuple(inputs), category)
+        self.specs[name] = spec
+        self._plans.clear()
+        return spec
+
+    def metric(self, name: str, inputs: Iterable[str] = (), category: Optional[str] = None, replace: bool = False):
+        """装饰器形式的 register"""
+        def decorator(compute):
+            self.register(name, compute, inputs, category, replace)
+            return compute
+        return decorator
+
+    def copy(self) -> "MetricRegistry":
+        registry = MetricRegistry()
+        registry.specs = dict(self.specs)
+        return registry
+
+    @property
+    def outputs(self) -> List[str]:
+        """全部可输出的指标名（不含中间结果）"""
+        return [name for name, spec in self.specs.items() if spec.category is not None]
+
+    def plan(self, outputs: Optional[Iterable[str]] = None) -> Tuple[MetricSpec, ...]:
+        """
+        计算 outputs（默认全部可输出指标）所需的指标，按依赖拓扑排序。
+        同一组输出的计划会被缓存。
+        """
+        key = None if outputs is None else tuple(outputs)
+        cached = self._plans.get(key)
+        if cached is not None:
+            return cached
+
+        order: List[MetricSpec] = []
+        state: Dict[str, int] = {}   # 1: 访问中, 2: 已完成
+
+        for root in (self.outputs if key is None else key):
+            if root not in self.specs:
+                raise KeyError(f'未知的指标: {root}')
+            if state.get(root) == 2:
+                continue
+            # 迭代式 DFS 后序：(指标名, 下一个待访问输入的位置)
+            state[root] = 1
+            work = [(root, 0)]
+            while work:
+                name, pos = work[-1]
+                inputs = self.specs[name].inputs
+                if pos < len(inputs):
+                    work[-1] = (name, pos + 1)
+                    dep = inputs[pos]
+                    if dep not in self.specs:
+                        raise KeyError(f'指标 {name} 依赖未知的指标: {dep}')
+                    if state.get(dep) == 1:
+                        raise ValueError(f'指标依赖存在环: {dep} <-> {name}')
+                    if dep not in state:
+                        state[dep] = 1
+                        work.append((dep, 0))
+                    continue
+                work.pop()
+                state[name] = 2
+                order.append(self.specs[name])
+
+        plan = tuple(order)
+        self._plans[key] = plan
+        return plan
+
+    @staticmethod
+    def evaluate(plan: Tuple[MetricSpec, ...], ctx: MetricContext) -> Dict[str, Any]:
+        values: Dict[str, Any] = {}
+        for spec in plan:
+            values[spec.name] = spec.compute(ctx, *[values[name] for name in spec.inputs])
+        return values
+
+    def group(self, values: Dict[str, Any], names: Optional[Iterable[str]] = None) -> Dict[str, Dict[str, Any]]:
+        """
+        把指标值按类别分组（按注册顺序），只包含 names（默认全部可输出指标）。
+        值为 None 的指标表示对该方法不可用（如旧版本解析结果缺少所需信息），不输出。
+        """
+        wanted = None if names is None else set(names)
+        grouped: Dict[str, Dict[str, Any]] = {}
+        for name, spec in self.specs.items():
+            if spec.category is None or values.get(name) is None or (wanted is not None and name not in wanted):
+                continue
+            grouped.setdefault(spec.category, {})[name] = values[name]
+        return grouped
+
+
+# 内置指标与插件共用的注册表
+DEFAULT_REGISTRY = MetricRegistry()
+register_metric = DEFAULT_REGISTRY.metric
+
+
+# =====================================================================
+# 内置指标：类别与顺序与原 calculate_method_difficulty 的输出一致
+# =====================================================================
+@register_metric('cyclomatic_complexity', category='函数内部复杂度')
+def _cyclomatic_complexity(ctx):
+    return ctx.engine.complexity_calc.calculate_cyclomatic_complexity(ctx.method)
+
+
+@register_metric('branch_count', category='函数内部复杂度')
+def _branch_count(ctx):
+    return ctx.engine.complexity_calc.calculate_branch_count(ctx.method)
+
+
+@register_metric('loop_count', category='函数内部复杂度')
+def _loop_count(ctx):
+    return ctx.engine.complexity_calc.calculate_loop_count(ctx.method)
+
+
+@register_metric('exception_paths', category='函数内部复杂度')
+def _exception_paths(ctx):
+    return ctx.engine.complexity_calc.calculate_exception_paths(ctx.method)
+
+
+@register_metric('field_dependency_count', category='上下文依赖复杂度')
+def _field_dependency_count(ctx):
+    return ctx.engine.input_calc.calculate_field_dependency(ctx.method)
+
+
+@register_metric('external_call_count', category='上下文依赖复杂度')
+def _external_call_count(ctx):
+    return ctx.engine.input_calc.calculate_external_calls(ctx.method, ctx.class_fqn)
+
+
+@register_metric('static_dependency_count', category='上下文依赖复杂度')
+def _static_dependency_count(ctx):
+    return ctx.engine.input_calc.calculate_static_dependency(ctx.method)
+
+
+@register_metric('dependent_class_count', category='跨文件模块复杂度')
+def _dependent_class_count(ctx):
+    return ctx.engine.input_calc.calculate_dependent_classes(ctx.method)
+
+
+@register_metric('cross_package_call_count', category='跨文件模块复杂度')
+def _cross_package_call_count(ctx):
+    return ctx.engine.input_calc.calculate_cross_package_calls(ctx.method, ctx.class_fqn)
+
+
+# 参数类型复杂度与嵌套深度需要遍历类型图，放在中间结果里一起计算
+@register_metric('parameter_type_metrics')
+def _parameter_type_metrics(ctx):
+    return ctx.engine.input_calc.calculate_parameter_complexity(ctx.method)
+
+
+@register_metric('parameter_count', category='输入构造复杂度')
+def _parameter_count(ctx):
+    return len(ctx.method.parameters)
+
+
+@register_metric('parameter_type_complexity', inputs=('parameter_type_metrics',), category='输入构造复杂度')
+def _parameter_type_complexity(ctx, parameter_type_metrics):
+    return parameter_type_metrics['parameter_type_complexity']
+
+
+@register_metric('object_nesting_depth', inputs=('parameter_type_metrics',), category='输入构造复杂度')
+def _object_nesting_depth(ctx, parameter_type_metrics):
+    return parameter_type_metrics['object_nesting_depth']
+
+
+@register_metric('field_type_complexity')
+def _field_type_complexity(ctx):
+    return ctx.engine.input_calc.calculate_field_type_complexity(ctx.method, ctx.class_fqn)
+
+
+@register_metric('mock_requirement_score', category='测试结构复杂度')
+def _mock_requirement_score(ctx):
+    return ctx.engine.output_calc.calculate_mock_complexity(ctx.method, ctx.class_fqn)
+
+
+@register_metric('setup_complexity', inputs=('parameter_type_complexity', 'field_type_complexity'),
+                 category='测试结构复杂度')
+def _setup_complexity(ctx, parameter_type_complexity, field_type_complexity):
+    return ctx.engine.output_calc.calculate_setup_complexity(parameter_type_complexity, field_type_complexity)
+
+
+@register_metric('minimum_test_case_count', inputs=('cyclomatic_complexity',), category='测试范围')
+def _minimum_test_case_count(ctx, cyclomatic_complexity):
+    return cyclomatic_complexity
+
+
+@register_metric('object_collaboration_count',
+                 inputs=('parameter_count', 'field_dependency_count', 'dependent_class_count'),
+                 category='交互复杂度')
+def _object_collaboration_count(ctx, parameter_count, field_dependency_count, dependent_class_count):
+    return parameter_count + field_dependency_count + dependent_class_count
+
+
+@register_metric('return_type_complexity', category='可观测性难度')
+def _return_type_complexity(ctx):
+    return ctx.engine.output_calc.calculate_return_complexity(ctx.method.return_type)
+
+
+@register_metric('side_effect_count', category='可观测性难度')
+def _side_effect_count(ctx):
+    return ctx.engine.output_calc.calculate_side_effect_indicator(ctx.method)
+
+
+@register_metric('assertion_complexity', inputs=('external_call_count',), category='断言构造难度')
+def _assertion_complexity(ctx, external_call_count):
+    return ctx.engine.output_calc.calculate_assertion_complexity(ctx.method, external_call_count)
+
+
+# 以下指标直接读取解析阶段统计的 token_stats，不需要额外的解析或遍历
+@register_metric('token_stats')
+def _token_stats(ctx):
+    return getattr(ctx.method, 'token_stats', None)
+
+
+@register_metric('halstead_volume', inputs=('token_stats',), category='代码度量')
+def _halstead_volume(ctx, token_stats):
+    return token_stats.volume if token_stats is not None else None
+
+
+@register_metric('halstead_difficulty', inputs=('token_stats',), category='代码度量')
+def _halstead_difficulty(ctx, token_stats):
+    return token_stats.difficulty if token_stats is not None else None
+
+
+@register_metric('halstead_effort', inputs=('token_stats',), category='代码度量')
+def _halstead_effort(ctx, token_stats):
+    return token_stats.effort if token_stats is not None else None
+
+
+@register_metric('distinct_operand_count', inputs=('token_stats',), category='代码度量')
+def _distinct_operand_count(ctx, token_stats):
+    return token_stats.distinct_operands if token_stats is not None else None
+
+
+@register_metric('max_control_nesting_depth', inputs=('token_stats',), category='代码度量')
+def _max_control_nesting_depth(ctx, token_stats):
+    return token_stats.max_control_depth if token_stats is not None else None
@@ -0,0 +1,45 @@
+from typing import Dict, Iterable, List, Tuple
+
+import numpy as np
+
+
+# 方法键列的名字；其余每一列为一个细粒度指标
+KEY_COLUMN = 'method_fqn'
+
+
+def collect_metric_columns(results: Iterable[dict]) -> Tuple[List[str], Dict[str, np.ndarray]]:
+    """
+    把 calculate_difficulty 的结果转成列式：(方法键列表, 指标名 → float64 数组)。
+    出错的结果（没有 method_fqn）被跳过；某个方法缺少的指标取 0，与评分时的默认值一致。
+    """
+    keys: List[str] = []
+    rows: List[dict] = []
+    for result in results:
+        if 'method_fqn' not in result:
+            continue
+        flat = {}
+        for category in result['细粒度指标'].values():
+            flat.update(category)
+        keys.append(result['method_fqn'])
+        rows.append(flat)
+
+    names = list(dict.fromkeys(name for row in rows for name in row))
+    columns = {
+        name: np.fromiter((row.get(name, 0) for row in rows), dtype=np.float64, count=len(rows))
+        for name in names
+    }
+    return keys, columns
+
+
+def save_metric_columns(path: str, method_keys: List[str], columns: Dict[str, np.ndarray]):
+    """以 .npz 保存：method_fqn 列为定长 Unicode 数组，不依赖 pickle"""
+    if KEY_COLUMN in columns:
+        raise ValueError(f'指标名与方法键列重名: {KEY_COLUMN}')
+    np.savez_compressed(path, **{KEY_COLUMN: np.asarray(method_keys, dtype=np.str_)}, **columns)
+
+
+def load_metric_columns(path: str) -> Tuple[List[str], Dict[str, np.ndarray]]:
+    with np.load(path, allow_pickle=False) as data:
+        keys = data[KEY_COLUMN].tolist()
+        columns = {name: data[name] for name in data.files if name != KEY_COLUMN}
+    return keys, columns
@@ -1,11 +1,13 @@
 # parser/body_parser.py
 from __future__ import annotations
-from typing import Optional
+import zlib
+from array import array
+from typing import Dict, List, Optional, Tuple
 
 from tree_sitter import Node
 
 from core.variables import LocalVariableInfo
-from core.method import MethodCallInfo
+from core.method import MethodCallInfo, TokenStats
 from core.types import TypeInfo
 
 from parser.utils import query_captures
@@ -27,13 +29,7 @@ CALL_QUERY = """
 (method_invocation) @call
 """
 
-CALL_ATTR_QUERY = """
-(method_invocation
-    object: (_) @object
-    name: (_) @name
-    arguments: (argument_list) @args
-)
-"""
+COMMENT_NODE_TYPES = ("line_comment", "block_comment")
 
 CONTROL_FLOW_QUERIES = {
     'if': '(if_statement) @if',
@@ -50,6 +46,29 @@ CONTROL_FLOW_QUERIES = {
 
 FIELD_ACCESS_QUERY = '(field_access) @field'
 
+# 计入控制结构嵌套深度的节点
+CONTROL_NODE_TYPES = frozenset((
+    'if_statement', 'for_statement', 'enhanced_for_statement', 'while_statement', 'do_statement',
+    'switch_expression', 'try_statement', 'try_with_resources_statement', 'synchronized_statement',
+))
+
+# 整体作为一个操作数的节点（不再下探其内部的引号、转义等）
+ATOMIC_OPERAND_TYPES = frozenset(('string_literal', 'character_literal'))
+
+# 叶子中属于操作数的具名节点；其余叶子（关键字、运算符、类型关键字）为运算符
+OPERAND_LEAF_TYPES = frozenset((
+    'identifier', 'type_identifier', 'this', 'super', 'true', 'false', 'null_literal',
+))
+
+# 成对符号只记开符号，语句/参数分隔符不计
+IGNORED_TOKENS = frozenset((';', ',', ')', ']', '}'))
+
+# 结构指纹只保留至少覆盖这么多个叶子的子树（过滤单个标识符、字面量这类平凡子树）
+MIN_SHINGLE_LEAVES = 4
+
+# 叶子按节点类型哈希：标识符、字面量只保留类型，关键字与运算符的类型即其文本
+_LEAF_HASHES: Dict[str, int] = {}
+
 
 def parse_method_body(method_ctx, body_node: Optional[Node], code: str):
     """
@@ -58,6 +77,8 @@ def parse_method_body(method_ctx, body_node: Optional[Node], code: str):
         - 方法调用 MethodCallInfo
     """
     if body_node is None:
+        method_ctx.token_stats = TokenStats()
+        method_ctx.structure_fingerprint = array('I')
         return
 
     # -------- 1) 局部变量 --------
@@ -81,15 +102,19 @@ def parse_method_body(method_ctx, body_node: Optional[Node], code: str):
     # -------- 2) 方法调用 --------
     call_nodes = query_captures(CALL_QUERY, "call", body_node)
     for cnode in call_nodes:
-        attrs = query_captures(CALL_ATTR_QUERY, None, cnode)
-
-        obj = attrs.get("object", [None])[0]
-        name = attrs.get("name", [None])[0]
+        # 直接取本节点的字段：对子树做 query 会把参数里嵌套调用的 object/name 混进来
+        obj = cnode.child_by_field_name("object")
+        name = cnode.child_by_field_name("name")
+        args = cnode.child_by_field_name("arguments")
 
         call = MethodCallInfo(
             qualifier=obj.text.decode("utf-8") if obj else None,
             method_name=name.text.decode("utf-8") if name else "",
             argument_types=[],
+            argument_count=(
+                sum(1 for a in args.named_children if a.type not in COMMENT_NODE_TYPES)
+                if args else None
+            ),
             span=None,
             content=cnode.text.decode("utf-8"),
         )
@@ -113,4 +138,86 @@ def parse_method_body(method_ctx, body_node: Optional[Node], code: str):
     for fnode in field_nodes:
         field_text = fnode.text.decode("utf-8")
         if field_text not in method_ctx.control_flow.field_accesses:
-            method_ctx.control_flow.field_accesses.append(field_text)
\ No newline at end of file
+            method_ctx.control_flow.field_accesses.append(field_text)
+
+    # -------- 5) 词法 / 结构统计 --------
+    method_ctx.token_stats, method_ctx.structure_fingerprint = collect_body_stats(body_node)
+
+
+def collect_body_stats(body_node: Node) -> Tuple[TokenStats, array]:
+    """
+    用 TreeCursor 遍历一次方法体语法树：按叶子类型区分运算符与操作数（Halstead），
+    并跟踪控制结构的嵌套深度。直接复用已解析的语法树，不重新分词。
+
+    同一次遍历中自底向上计算每个子树的结构哈希：crc32(节点类型, 各子节点哈希)，叶子只取节点类型，
+    因此变量改名、字面量取值不同的克隆得到相同的哈希。覆盖至少 MIN_SHINGLE_LEAVES 个叶子的子树哈希
+    去重排序后作为结构指纹（array('I')），包括方法体本身的哈希，注释不参与。
+    """
+    operators = set()
+    operands = set()
+    total_operators = 0
+    total_operands = 0
+
+    depth = 0
+    max_depth = 0
+    entered = []   # 每个已进入的内部节点是否增加了嵌套深度
+
+    # 已进入的内部节点：类型哈希、子节点哈希、叶子数；栈底为哨兵
+    type_hashes: List[int] = [0]
+    child_hashes: List[List[int]] = [[]]
+    leaf_counts: List[int] = [0]
+    shingles = set()
+
+    cursor = body_node.walk()
+    while True:
+        node = cursor.node
+        node_type = node.type
+        if node_type in COMMENT_NODE_TYPES:
+            pass
+        elif node_type in ATOMIC_OPERAND_TYPES or node.child_count == 0:
+            text = node.text
+            if node_type in ATOMIC_OPERAND_TYPES or node_type in OPERAND_LEAF_TYPES or node_type.endswith('_literal'):
+                operands.add(text)
+                total_operands += 1
+            elif node.is_named or text.decode('utf-8') not in IGNORED_TOKENS:
+                operators.add(text)
+                total_operators += 1
+
+            leaf_hash = _LEAF_HASHES.get(node_type)
+            if leaf_hash is None:
+                leaf_hash = _LEAF_HASHES[node_type] = zlib.crc32(node_type.encode('utf-8'))
+            child_hashes[-1].append(leaf_hash)
+            leaf_counts[-1] += 1
+        else:
+            # else if 视为与外层 if 同级
+            control = node_type in CONTROL_NODE_TYPES and not (
+                node_type == 'if_statement' and cursor.field_name == 'alternative'
+            )
+            if control:
+                depth += 1
+                if depth > max_depth:
+                    max_depth = depth
+            entered.append(control)
+            type_hashes.append(zlib.crc32(node_type.encode('utf-8')))
+            child_hashes.append([])
+            leaf_counts.append(0)
+            cursor.goto_first_child()
+            continue
+
+        # 当前子树处理完毕：移到下一个兄弟，没有则逐层返回；
+        # 栈中只剩哨兵时根节点（方法体本身）已出栈，其哈希已计入指纹
+        while len(type_hashes) > 1 and not cursor.goto_next_sibling():
+            cursor.goto_parent()
+            if entered.pop():
+                depth -= 1
+
+            subtree_hash = zlib.crc32(array('I', child_hashes.pop()).tobytes(), type_hashes.pop())
+            leaves = leaf_counts.pop()
+            if leaves >= MIN_SHINGLE_LEAVES:
+                shingles.add(subtree_hash)
+            child_hashes[-1].append(subtree_hash)
+            leaf_counts[-1] += leaves
+
+        if len(type_hashes) == 1:
+            stats = TokenStats(len(operators), len(operands), total_operators, total_operands, max_depth)
+            return stats, array('I', sorted(shingles))
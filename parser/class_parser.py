@@ -8,6 +8,7 @@ from core.clazz import ClassInfo
 from parser.field_parser import parse_fields
 from parser.method_parser import parse_methods
 from parser.javadoc_parser import extract_javadoc
+from parser.type_parser import parse_type_parameters
 
 
 def parse_classes(root: Node, code: str) -> List[ClassInfo]:
@@ -43,6 +44,7 @@ def parse_single_class(node: Node, code: str, outer: Optional[ClassInfo], collec
         content=node.text.decode("utf-8"),
         superclass_name=superclass,
         interface_names=interfaces,
+        type_parameters=parse_type_parameters(node.child_by_field_name("type_parameters"), code),
         modifiers=set(modifiers),
         annotations=[],
         javadoc=extract_javadoc(node),
@@ -75,25 +77,27 @@ def _get_super_name(node: Node) -> Optional[str]:
     super_node = node.child_by_field_name("superclass")
     if super_node is None:
         return None
-    txt = super_node.text.decode("utf-8").strip()
-    parts = txt.split()
-    return parts[1] if len(parts) >= 2 else None
+    for ch in super_node.named_children:
+        return ch.text.decode("utf-8").strip()
+    return None
 
 
 def _get_interface_names(node: Node) -> List[str]:
     result: List[str] = []
-    itf = node.child_by_field_name("super_interfaces")
+
+    # class/enum 的 implements 列表挂在 interfaces 字段上；
+    # interface 的 extends 列表没有字段名，只能按节点类型查找
+    itf = node.child_by_field_name("interfaces")
+    if itf is None:
+        itf = next((ch for ch in node.children if ch.type == "extends_interfaces"), None)
     if itf is None:
         return result
 
-    txt = itf.text.decode("utf-8").strip()
-    if txt.startswith("implements"):
-        txt = txt[len("implements"):].strip()
-
-    for part in txt.split(","):
-        part = part.strip()
-        if part:
-            result.append(part)
+    for type_list in itf.named_children:
+        if type_list.type != "type_list":
+            continue
+        for t in type_list.named_children:
+            result.append(t.text.decode("utf-8").strip())
     return result
 
 
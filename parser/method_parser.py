@@ -6,7 +6,7 @@ from tree_sitter import Node
 
 from core.method import MethodInfo
 from core.variables import ParameterInfo
-from parser.type_parser import parse_type_node
+from parser.type_parser import parse_type_node, parse_type_parameters
 from parser.body_parser import parse_method_body
 from parser.utils import query_captures
 from parser.javadoc_parser import extract_javadoc
@@ -70,6 +70,7 @@ def _parse_single_method(node: Node, code: str) -> MethodInfo:
         content=node.text.decode("utf-8"),
         return_type=parse_type_node(ret_node, code),
         parameters=_parse_parameters(params_node, code),
+        type_parameters=parse_type_parameters(node.child_by_field_name("type_parameters"), code),
         modifiers=set(_extract_modifiers(node)),
         annotations=[],
         local_variables=[],
@@ -117,9 +118,11 @@ def _parse_parameters(params_node: Node, code: str):
         return params
 
     for p in params_node.children:
-        if p.type != "formal_parameter":
+        if p.type not in ("formal_parameter", "spread_parameter"):
             continue
 
+        # 可变参数（T... xs）的名字在 variable_declarator 里
+        is_varargs = p.type == "spread_parameter"
         type_node = None
         name_node = None
         for c in p.children:
@@ -127,13 +130,20 @@ def _parse_parameters(params_node: Node, code: str):
                 type_node = c
             if c.type == "identifier":
                 name_node = c
+            elif is_varargs and c.type == "variable_declarator":
+                name_node = c.child_by_field_name("name")
 
         if type_node and name_node:
+            ptype = parse_type_node(type_node, code)
+            if is_varargs:
+                # T... 在方法内部即 T[]
+                ptype.array_dimension += 1
             params.append(
                 ParameterInfo(
                     name=name_node.text.decode("utf-8"),
                     content=p.text.decode("utf-8"),
-                    type=parse_type_node(type_node, code),
+                    type=ptype,
+                    is_varargs=is_varargs,
                 )
             )
     return params
@@ -7,6 +7,7 @@ from loguru import logger
 from tree_sitter import Parser
 from configs.config import JAVA_LANGUAGE
 
+from core.classpath import ClasspathIndex
 from core.project import ProjectContext
 from core.file import FileInfo
 from parser.file_parser import parse_file
@@ -15,19 +16,28 @@ from parser.file_parser import parse_file
 class JavaProjectParser:
     """
     支持 main/test 分别解析的项目解析器。
+
+    classpath:
+        可选的外部类路径索引，用于解析 JDK / 依赖库中的类型。
     """
 
-    def __init__(self):
+    def __init__(self, classpath: Optional[ClasspathIndex] = None):
         self.parser = Parser()
         self.parser.language = JAVA_LANGUAGE
+        self.classpath = classpath
 
-    def parse_project(self, project_root: str, main_src: str, test_src: str) -> ProjectContext:
+    def parse_project(self, project_root: str, main_src: str, test_src: str,
+                      jobs: int = 1, lazy: bool = False) -> ProjectContext:
+        """
+        jobs > 1 时二阶段语义解析使用多进程并行（见 ProjectContext.resolve_all）。
+        lazy=True 时不执行完整的 resolve_all，改为按需解析（见 ProjectContext.resolve_lazy）。
+        """
         logger.info("开始解析 Java 项目 ...")
         logger.info(f"项目根路径: {project_root}")
         logger.info(f"业务代码路径（main）: {main_src}")
         logger.info(f"测试代码路径（test）: {test_src}")
 
-        project = ProjectContext(root_path=project_root)
+        project = ProjectContext(root_path=project_root, classpath=self.classpath)
 
         # ---------- 解析 main ----------
         logger.info("开始扫描业务代码文件（main） ...")
@@ -35,7 +45,7 @@ class JavaProjectParser:
         logger.info(f"共找到 {len(main_files)} 个 main 源文件")
 
         for f in main_files:
-            logger.debug(f"[main] 解析文件: {f}")
+            logger.debug("[main] 解析文件: {}", f)
             file_ctx = self.parse_java_file(str(f))
             if file_ctx:
                 project.add_main_file(file_ctx)
@@ -46,13 +56,18 @@ class JavaProjectParser:
         logger.info(f"共找到 {len(test_files)} 个 test 源文件")
 
         for f in test_files:
-            logger.debug(f"[test] 解析文件: {f}")
+            logger.debug("[test] 解析文件: {}", f)
             file_ctx = self.parse_java_file(str(f))
             if file_ctx:
                 project.add_test_file(file_ctx)
 
+        if lazy:
+            project.resolve_lazy()
+            logger.info("文件解析完成，语义解析将在访问时按需执行")
+            return project
+
         logger.info("文件解析完成，开始执行二阶段语义解析 resolve_all() ...")
-        project.resolve_all()
+        project.resolve_all(jobs=jobs)
         logger.info("项目语义解析全部完成！")
 
         return project
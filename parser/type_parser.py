@@ -1,6 +1,6 @@
 # parser/type_parser.py
 from __future__ import annotations
-from typing import Optional
+from typing import Dict, Optional
 from core.types import TypeInfo
 
 PRIMITIVES = {"int", "float", "double", "boolean", "char", "byte", "short", "long"}
@@ -37,4 +37,24 @@ def parse_type_node(node, code: str) -> Optional[TypeInfo]:
         is_primitive=is_primitive,
         is_fqn=is_fqn,
         generics=[],   # 泛型若要拆可再扩展
-    )
\ No newline at end of file
+    )
+
+
+def parse_type_parameters(node, code: str) -> Dict[str, Optional[TypeInfo]]:
+    """
+    解析类或方法声明上的 type_parameters 节点：类型参数名 → 第一个上界（没有上界时为 None）。
+    例如 <K extends Comparable<K> & Serializable, V> → {"K": Comparable<K>, "V": None}。
+    """
+    params: Dict[str, Optional[TypeInfo]] = {}
+    if node is None:
+        return params
+    for param in node.named_children:
+        if param.type != "type_parameter":
+            continue
+        name = next((ch for ch in param.named_children if ch.type == "type_identifier"), None)
+        if name is None:
+            continue
+        bound = next((ch for ch in param.named_children if ch.type == "type_bound"), None)
+        first = bound.named_children[0] if bound is not None and bound.named_children else None
+        params[name.text.decode("utf-8")] = parse_type_node(first, code)
+    return params
@@ -6,6 +6,7 @@ from pathlib import Path
 from loguru import logger
 
 from parser.project_parser import JavaProjectParser
+from core.classpath import ClasspathIndex, default_m2_archives, jdk_archives
 
 
 def print_project_summary(project):
@@ -99,6 +100,11 @@ def main():
     parser.add_argument("--save", "-s", type=str, default="", help="保存解析后的project到指定路径（二进制文件）")
     parser.add_argument("--load", "-l", type=str, default="", help="从指定路径加载已解析的project（二进制文件）")
     parser.add_argument("--force-parse", "-f", action="store_true", help="强制重新解析，即使指定了load路径")
+    parser.add_argument("--jobs", "-j", type=int, default=1, help="二阶段语义解析使用的进程数（默认1，单进程）")
+    parser.add_argument("--classpath", "-cp", nargs="*", default=[], help="外部类路径：jar / jmod 文件或包含它们的目录")
+    parser.add_argument("--m2", action="store_true", help="将本地 Maven 仓库中项目 pom.xml 声明的依赖（没有 pom.xml 时为每个构件的最高版本）加入类路径")
+    parser.add_argument("--java-home", type=str, default="", help="JDK 根目录，将其 jmods/ 或 lib/ 加入类路径")
+    parser.add_argument("--classpath-cache", type=str, default="", help="类路径索引缓存文件（默认 ~/.cache/java-parser/classpath-index.json）")
 
     args = parser.parse_args()
 
@@ -125,14 +131,25 @@ def main():
             logger.error(f"测试代码路径不存在: {args.test_src}")
             return
 
+        classpath = None
+        archives = list(args.classpath)
+        if args.m2:
+            archives.extend(default_m2_archives(args.project_root))
+        if args.java_home:
+            archives.extend(jdk_archives(args.java_home))
+        if archives:
+            logger.info("构建外部类路径索引 ...")
+            classpath = ClasspathIndex.build(archives, cache_path=args.classpath_cache or None)
+
         logger.info("初始化解析器 ...")
-        project_parser = JavaProjectParser()
+        project_parser = JavaProjectParser(classpath=classpath)
 
         logger.info("开始解析 Java 项目 ...")
         project = project_parser.parse_project(
             project_root=args.project_root,
             main_src=args.main_src,
-            test_src=args.test_src
+            test_src=args.test_src,
+            jobs=args.jobs,
         )
 
         logger.info("解析完成。")
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+import argparse
+import json
+import sys
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from metrics.aggregator import DIFFICULTY_LEVELS, MetricsAggregator, ScoringConfig
+from metrics.quantiles import PercentileNormalizer
+from metrics.store import load_metric_columns
+
+
+def build_percentiles(args, config: ScoringConfig, columns) -> PercentileNormalizer:
+    """
+    构建参照语料上的分位数草图：逐个文件流式加入，语料不必整体装入内存。
+    """
+    if args.sketch:
+        print(f"Loading quantile sketches from {args.sketch}...", file=sys.stderr)
+        return PercentileNormalizer.load(args.sketch)
+
+    percentiles = PercentileNormalizer()
+    if not args.reference:
+        percentiles.update(columns, config.metric_names)
+        return percentiles
+
+    for path in args.reference:
+        print(f"Adding reference corpus {path}...", file=sys.stderr)
+        _, reference = load_metric_columns(path)
+        percentiles.update(reference, config.metric_names)
+    return percentiles
+
+
+def main():
+    parser = argparse.ArgumentParser(description='基于已保存的列式细粒度指标，按新的权重/阈值重新评分')
+    parser.add_argument('columns', help='calculate_difficulty.py --columns 保存的 .npz 文件')
+    parser.add_argument('--config', help='评分配置 YAML（见 scoring_config.yaml），省略时使用默认权重')
+    parser.add_argument('--output', help='输出JSON文件路径')
+    parser.add_argument('--percentile', action='store_true',
+                        help='按百分位归一化（等同于配置中的 normalization: percentile）')
+    parser.add_argument('--reference', nargs='+',
+                        help='百分位的参照语料：一个或多个 .npz 指标文件（默认为待评分文件本身）')
+    parser.add_argument('--sketch', help='直接加载已保存的分位数草图，代替 --reference')
+    parser.add_argument('--save-sketch', help='保存参照语料上的分位数草图，供之后复用或与其他项目合并')
+
+    args = parser.parse_args()
+
+    config = ScoringConfig.from_yaml(args.config) if args.config else ScoringConfig()
+
+    print(f"Loading metric columns from {args.columns}...", file=sys.stderr)
+    method_keys, columns = load_metric_columns(args.columns)
+
+    missing = [name for name in config.metric_names if name not in columns]
+    if missing:
+        print(f"指标列缺失，按 0 处理: {missing}", file=sys.stderr)
+        for name in missing:
+            columns[name] = np.zeros(len(method_keys), dtype=np.float64)
+
+    percentiles = None
+    if args.percentile or config.normalization == 'percentile':
+        percentiles = build_percentiles(args, config, columns)
+        if args.save_sketch:
+            percentiles.save(args.save_sketch)
+            print(f"Quantile sketches saved to {args.save_sketch}", file=sys.stderr)
+
+    try:
+        scores = MetricsAggregator.score_columns(columns, config=config, percentiles=percentiles)
+    except ValueError as e:
+        parser.error(str(e))
+
+    levels = scores['level']
+    counts = {level: int(np.count_nonzero(levels == level)) for level in DIFFICULTY_LEVELS}
+    print(f"Rescored {len(method_keys)} methods: {counts}", file=sys.stderr)
+
+    # 保留两位小数的方式与 calculate_difficulty.py 相同
+    results = [
+        {
+            'method_fqn': key,
+            '维度聚合分数': {
+                'input_complexity': round(input_score, 2),
+                'output_complexity': round(output_score, 2),
+            },
+            '总体难度分数': round(overall, 2),
+            '难度等级': level,
+        }
+        for key, input_score, output_score, overall, level in zip(
+            method_keys,
+            scores['input_complexity'].tolist(),
+            scores['output_complexity'].tolist(),
+            scores['overall'].tolist(),
+            levels.tolist(),
+        )
+    ]
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+        print(f"Results saved to {args.output}", file=sys.stderr)
+    else:
+        print(json.dumps(results, ensure_ascii=False, indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,33 @@
+import sys
+from pathlib import Path
+
+import pytest
+from loguru import logger
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from parser.project_parser import JavaProjectParser  # noqa: E402
+
+FIXTURE_PROJECT = Path(__file__).resolve().parent / 'fixtures' / 'java_project'
+
+
+def parse_fixture(**kwargs):
+    """解析测试用的小型 Java 项目"""
+    return JavaProjectParser().parse_project(
+        str(FIXTURE_PROJECT),
+        str(FIXTURE_PROJECT / 'src' / 'main' / 'java'),
+        str(FIXTURE_PROJECT / 'src' / 'test' / 'java'),
+        **kwargs,
+    )
+
+
+@pytest.fixture(autouse=True, scope='session')
+def _quiet_logger():
+    logger.remove()
+    yield
+
+
+@pytest.fixture(scope='session')
+def eager_project():
+    return parse_fixture()
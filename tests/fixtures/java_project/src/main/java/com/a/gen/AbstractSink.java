@@ -0,0 +1,6 @@
+package com.a.gen;
+public abstract class AbstractSink<E extends Number> implements Sink<E> {
+    protected int count;
+    public abstract void accept(E item);
+    public <X extends Number> void drain(X limit) { count = 0; }
+}
@@ -0,0 +1,4 @@
+package com.a.gen;
+public class IntSink extends AbstractSink<Integer> {
+    public void accept(Integer item) { if (item > 0) { count++; } }
+}
@@ -0,0 +1,5 @@
+package com.a.gen;
+public class Pipe {
+    private Sink<String> sink;
+    public void push(String s) { sink.accept(s); }
+}
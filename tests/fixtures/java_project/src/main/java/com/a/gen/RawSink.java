@@ -0,0 +1,5 @@
+package com.a.gen;
+public class RawSink implements Sink {
+    public void accept(Object item) { }
+    public void drain(Number limit) { }
+}
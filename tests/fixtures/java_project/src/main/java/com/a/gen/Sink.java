@@ -0,0 +1,5 @@
+package com.a.gen;
+public interface Sink<T> {
+    void accept(T item);
+    <X extends Number> void drain(X limit);
+}
@@ -0,0 +1,7 @@
+package com.a.gen;
+public class StrSink implements Sink<String> {
+    private int length;
+    public void accept(String item) { if (item != null) { length += item.length(); } }
+    public void accept(Integer other) { length = other; }
+    public <Y extends Number> void drain(Y limit) { length = 0; }
+}
@@ -0,0 +1,3 @@
+package com.a.model;
+import java.util.List;
+public class Address { public String street; public Geo geo; public List<String> lines; }
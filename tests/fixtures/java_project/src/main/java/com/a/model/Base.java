@@ -0,0 +1,10 @@
+package com.a.model;
+import java.util.List;
+public abstract class Base implements Named {
+    protected Address addr;
+    protected int id;
+    public String getName() { return "x"; }
+    public void helper() { if (id > 0) { id++; } }
+    public abstract void run(int x);
+    public static class Inner { public static class Deep { int z; public void deepM() {} } }
+}
@@ -0,0 +1,3 @@
+package com.a.model;
+import java.util.Map;
+public class Geo { public double lat; public Map<String, Address> near; }
@@ -0,0 +1,2 @@
+package com.a.model;
+public interface Named extends Comparable<Named> { String getName(); }
@@ -0,0 +1,11 @@
+package com.a.model;
+import com.a.util.Fmt;
+public class User extends Base {
+    private String name;
+    public User(int id) { this.id = id; }
+    public void run(int n) {
+        if (this.addr.geo.lat > n) { helper(); }
+        String s = Fmt.fmt("%s %s", name, n);
+    }
+    public String label() { return Fmt.fmt("user"); }
+}
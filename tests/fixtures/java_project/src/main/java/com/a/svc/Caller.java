@@ -0,0 +1,5 @@
+package com.a.svc;
+public class Caller {
+    private H h;
+    public void go() { h.handle(null); }
+}
@@ -0,0 +1,6 @@
+package com.a.svc;
+import com.a.model.User;
+public class HImpl implements H {
+    private int seen;
+    public void handle(User u) { if (u != null) { seen++; } }
+}
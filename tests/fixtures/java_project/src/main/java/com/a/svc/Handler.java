@@ -0,0 +1,3 @@
+package com.a.svc;
+import com.a.model.User;
+public interface Handler { void handle(User u); }
@@ -0,0 +1,17 @@
+package com.a.svc;
+import com.a.model.*;
+import java.util.List;
+public class UserService {
+    private Named named;
+    private User user;
+    public String process(User u, Address a, List<String> xs) {
+        named.getName();
+        u.run(3);
+        user.helper();
+        String s = u.getName();
+        int n = xs.size();
+        return s + a.street + n;
+    }
+    public void recurse(int n) { if (n > 0) recurse2(n - 1); }
+    public void recurse2(int n) { recurse(n); }
+}
@@ -0,0 +1,5 @@
+package com.a.util;
+public class Fmt {
+    public static String fmt(String f) { return f; }
+    public static String fmt(String f, Object... args) { return String.format(f, args); }
+}
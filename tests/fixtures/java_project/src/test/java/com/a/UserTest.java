@@ -0,0 +1,3 @@
+package com.a;
+import com.a.model.User;
+public class UserTest { public void testRun() { new User().run(1); } }
@@ -0,0 +1,5 @@
+package com.a.svc;
+import com.a.model.User;
+public class UserServiceTest {
+    public void testProcess() { UserService s = new UserService(); s.process(new User(1), null, null); s.recurse(3); }
+}
@@ -0,0 +1,63 @@
+import zipfile
+from pathlib import Path
+
+from core.classpath import ClasspathIndex, default_m2_archives
+from parser.project_parser import JavaProjectParser
+
+
+def _write(path: Path, text: str):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(text, encoding='utf-8')
+
+
+def _jar(path: Path, entries):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with zipfile.ZipFile(path, 'w') as zf:
+        for entry in entries:
+            zf.writestr(entry, b'')
+
+
+def test_explicit_classpath_import_shadows_project_wildcard(tmp_path):
+    main = tmp_path / 'src' / 'main' / 'java'
+    _write(main / 'com' / 'x' / 'List.java', 'package com.x;\npublic class List {}\n')
+    _write(main / 'com' / 'x' / 'Helper.java', 'package com.x;\npublic class Helper {}\n')
+    _write(main / 'com' / 'y' / 'Uses.java', (
+        'package com.y;\n'
+        'import java.util.List;\n'
+        'import com.x.*;\n'
+        'public class Uses { List<String> items; Helper helper; String name; }\n'
+    ))
+    (tmp_path / 'src' / 'test' / 'java').mkdir(parents=True)
+    _jar(tmp_path / 'rt.jar', ['java/util/List.class', 'java/lang/String.class'])
+    classpath = ClasspathIndex.build([str(tmp_path / 'rt.jar')], cache_path=str(tmp_path / 'cp.json'))
+
+    project = JavaProjectParser(classpath=classpath).parse_project(
+        str(tmp_path), str(main), str(tmp_path / 'src' / 'test' / 'java'))
+    fields = project.symbols.classes['com.y.Uses'].fields
+    assert fields['items'].type.resolved_fqn == 'java.util.List'
+    assert fields['helper'].type.resolved_fqn == 'com.x.Helper'
+    assert fields['name'].type.resolved_fqn == 'java.lang.String'
+
+
+def test_m2_archives_pick_one_version_per_artifact(tmp_path, monkeypatch):
+    repo = tmp_path / '.m2' / 'repository'
+    for version in ('1.7.36', '2.0.0-beta', '2.0.0'):
+        _jar(repo / 'org' / 'slf4j' / 'slf4j-api' / version / f'slf4j-api-{version}.jar', ['org/slf4j/Logger.class'])
+    _jar(repo / 'org' / 'slf4j' / 'slf4j-api' / '2.1.0' / 'slf4j-api-2.1.0-sources.jar', ['org/slf4j/Logger.java'])
+    _jar(repo / 'junit' / 'junit' / '4.13.2' / 'junit-4.13.2.jar', ['org/junit/Test.class'])
+    monkeypatch.setenv('HOME', str(tmp_path))
+
+    names = [Path(a).name for a in default_m2_archives()]
+    assert names == ['junit-4.13.2.jar', 'slf4j-api-2.0.0.jar']
+
+    # 有 pom.xml 时只取声明的依赖，未写版本时用 dependencyManagement 中的版本
+    _write(tmp_path / 'project' / 'pom.xml', (
+        '<project xmlns="http://maven.apache.org/POM/4.0.0">'
+        '<dependencyManagement><dependencies><dependency>'
+        '<groupId>org.slf4j</groupId><artifactId>slf4j-api</artifactId><version>1.7.36</version>'
+        '</dependency></dependencies></dependencyManagement>'
+        '<dependencies><dependency><groupId>org.slf4j</groupId><artifactId>slf4j-api</artifactId></dependency>'
+        '</dependencies></project>'
+    ))
+    names = [Path(a).name for a in default_m2_archives(str(tmp_path / 'project'))]
+    assert names == ['slf4j-api-1.7.36.jar']
@@ -0,0 +1,122 @@
+from itertools import combinations
+from pathlib import Path
+
+from filters.clone_index import CloneIndex
+from parser.project_parser import JavaProjectParser
+
+SOURCES = {
+    'Orders.java': '''
+package com.c;
+public class Orders {
+    int total(int[] prices, int discount) {
+        int sum = 0;
+        for (int i = 0; i < prices.length; i++) {
+            if (prices[i] > discount) { sum += prices[i] - discount; }
+        }
+        return sum;
+    }
+    int totalPlusOne(int[] prices, int discount) {
+        int sum = 0;
+        for (int i = 0; i < prices.length; i++) {
+            if (prices[i] > discount) { sum += prices[i] - discount; }
+        }
+        sum += 1;
+        return sum;
+    }
+    String describe(int[] prices, int discount) {
+        return "prices " + prices.length + " discount " + discount + " sum";
+    }
+}
+''',
+    'Invoices.java': '''
+package com.c;
+public class Invoices {
+    int amount(int[] items, int rebate) {
+        int acc = 1;
+        for (int k = 0; k < items.length; k++) {
+            if (items[k] > rebate) { acc += items[k] - rebate; }
+        }
+        return acc;
+    }
+    void log(String msg) {
+        if (msg != null) { System.out.println(msg.trim()); }
+        else { System.out.println("none"); }
+    }
+    void warn(String text) {
+        if (text != null) { System.err.println(text.trim()); }
+        else { System.err.println("none"); }
+    }
+}
+''',
+}
+
+
+def _parse(tmp_path: Path):
+    main = tmp_path / 'src' / 'main' / 'java'
+    for name, text in SOURCES.items():
+        path = main / 'com' / 'c' / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(text, encoding='utf-8')
+    (tmp_path / 'src' / 'test' / 'java').mkdir(parents=True)
+    return JavaProjectParser().parse_project(str(tmp_path), str(main), str(tmp_path / 'src' / 'test' / 'java'))
+
+
+def _fingerprint(project, key):
+    return project.symbols.methods[key].structure_fingerprint
+
+
+def test_renamed_variable_clone_has_same_fingerprint(tmp_path):
+    project = _parse(tmp_path)
+    assert _fingerprint(project, 'com.c.Orders#total(int,int)') == \
+        _fingerprint(project, 'com.c.Invoices#amount(int,int)')
+
+
+def test_fingerprint_includes_whole_body_hash(tmp_path):
+    project = _parse(tmp_path)
+    # totalPlusOne 包含 total 的全部语句，只有 total 方法体本身的哈希是 total 独有的
+    total = set(_fingerprint(project, 'com.c.Orders#total(int,int)'))
+    longer = set(_fingerprint(project, 'com.c.Orders#totalPlusOne(int,int)'))
+    assert len(total - longer) == 1
+
+
+def test_shared_vocabulary_is_not_a_clone(tmp_path):
+    project = _parse(tmp_path)
+    index = CloneIndex()
+    index.add_project(project)
+    groups = index.clone_groups(0.5)
+    describe = 'com.c.Orders#describe(int,int)'
+    assert all(describe not in group for group in groups)
+    assert ['com.c.Invoices#amount(int,int)', 'com.c.Orders#total(int,int)',
+            'com.c.Orders#totalPlusOne(int,int)'] in groups
+
+
+def test_clone_index_matches_brute_force_jaccard(tmp_path):
+    project = _parse(tmp_path)
+    index = CloneIndex()
+    index.add_project(project)
+    sets = {key: set(fp) for key, fp in zip(index.keys, index.fingerprints)}
+
+    for threshold in (1.0, 0.8, 0.5, 0.2):
+        expected = {
+            (a, b) for a, b in combinations(sorted(sets), 2)
+            if len(sets[a] & sets[b]) / len(sets[a] | sets[b]) >= threshold
+        }
+        pairs = {tuple(sorted((a, b))) for a, b, _ in index.clone_pairs(threshold)}
+        assert pairs == expected
+
+        # 克隆组即这些方法对的连通分量
+        parent = {key: key for key in sets}
+
+        def find(x):
+            while parent[x] != x:
+                x = parent[x]
+            return x
+
+        for a, b in expected:
+            parent[find(a)] = find(b)
+        components = {}
+        for key in sets:
+            components.setdefault(find(key), []).append(key)
+        expected_groups = sorted((sorted(g) for g in components.values() if len(g) > 1),
+                                 key=lambda g: (-len(g), g[0]))
+        assert index.clone_groups(threshold) == expected_groups
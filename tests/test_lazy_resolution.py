@@ -0,0 +1,88 @@
+import json
+
+import pytest
+
+from conftest import parse_fixture
+from get_context import collect_method_context, find_target_method
+from metrics.engine import DifficultyEngine
+
+
+def _method_keys():
+    return list(parse_fixture(lazy=True).symbols.methods)
+
+
+def _resolution(method):
+    """方法的第二阶段解析结果：调用目标、分派目标、字段访问与 override 关系"""
+    return (
+        [(c.resolved_fqn, c.resolved_method_key, c.polymorphic_targets) for c in method.method_calls],
+        [(r[0], r[1].name) if r else None for r in method.control_flow.resolved_field_accesses or []],
+        method.override_parent.name if method.override_parent else None,
+    )
+
+
+@pytest.mark.parametrize('method_key', _method_keys())
+def test_single_method_metrics_match_full_resolution(eager_project, method_key):
+    # 与 calculate_difficulty.py --method 相同：按需解析，字段类型展开 6 层
+    lazy = parse_fixture(lazy=True)
+    lazy.ensure_method_resolved(method_key, depth=6)
+
+    expected = DifficultyEngine(eager_project).compute(method_key)
+    assert DifficultyEngine(lazy).compute(method_key) == expected
+    assert _resolution(lazy.symbols.methods[method_key]) == _resolution(eager_project.symbols.methods[method_key])
+
+
+@pytest.mark.parametrize('method_key', _method_keys())
+def test_method_context_matches_full_resolution(eager_project, method_key):
+    # 与 get_context.py 相同：按需解析，只展开 1 层
+    lazy = parse_fixture(lazy=True)
+    method, cls = find_target_method(lazy.symbols, method_key)
+    lazy.ensure_method_resolved(method_key, depth=1)
+
+    expected = collect_method_context(*find_target_method(eager_project.symbols, method_key), eager_project.symbols)
+    actual = collect_method_context(method, cls, lazy.symbols)
+    assert json.dumps(actual, sort_keys=True, default=str) == json.dumps(expected, sort_keys=True, default=str)
+
+
+def test_lazy_field_chain_resolves_every_hop():
+    lazy = parse_fixture(lazy=True)
+    method = lazy.ensure_method_resolved('com.a.model.User#run(int)', depth=0)
+    assert [(r[0], r[1].name) for r in method.control_flow.resolved_field_accesses] == [
+        ('com.a.model.Geo', 'lat'), ('com.a.model.Address', 'geo'), ('com.a.model.Base', 'addr'),
+    ]
+
+
+def test_lazy_interface_dispatch_finds_unvisited_implementations():
+    lazy = parse_fixture(lazy=True)
+    method = lazy.ensure_method_resolved('com.a.svc.Caller#go()', depth=0)
+    assert method.method_calls[0].polymorphic_targets == ['com.a.svc.HImpl#handle(User)']
+    assert lazy.symbols.methods['com.a.svc.HImpl#handle(User)'].override_parent is \
+        lazy.symbols.methods['com.a.svc.H#handle(User)']
+
+
+@pytest.mark.parametrize('lazy', [False, True])
+def test_generic_interface_implementation_overrides(lazy):
+    project = parse_fixture(lazy=lazy)
+    methods = project.symbols.methods
+    push = project.ensure_method_resolved('com.a.gen.Pipe#push(String)', depth=0) if lazy \
+        else methods['com.a.gen.Pipe#push(String)']
+    for key in list(methods):
+        if lazy and key.startswith('com.a.gen.'):
+            project.ensure_method_resolved(key, depth=0)
+
+    def parent(key):
+        return methods[key].override_parent
+
+    # implements Sink<String>：accept(String) 实现 accept(T)，accept(Integer) 是新方法
+    assert parent('com.a.gen.StrSink#accept(String)') is methods['com.a.gen.Sink#accept(T)']
+    assert parent('com.a.gen.StrSink#accept(Integer)') is None
+    # 方法自身的类型参数擦除为上界
+    assert parent('com.a.gen.StrSink#drain(Y)') is methods['com.a.gen.Sink#drain(X)']
+    # 类型实参沿 extends AbstractSink<Integer> → implements Sink<E> 逐层代入
+    assert parent('com.a.gen.AbstractSink#accept(E)') is methods['com.a.gen.Sink#accept(T)']
+    assert parent('com.a.gen.IntSink#accept(Integer)') is methods['com.a.gen.AbstractSink#accept(E)']
+    # 原始类型按擦除签名匹配
+    assert parent('com.a.gen.RawSink#accept(Object)') is methods['com.a.gen.Sink#accept(T)']
+
+    assert sorted(push.method_calls[0].polymorphic_targets) == [
+        'com.a.gen.IntSink#accept(Integer)', 'com.a.gen.RawSink#accept(Object)', 'com.a.gen.StrSink#accept(String)',
+    ]
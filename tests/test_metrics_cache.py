@@ -0,0 +1,22 @@
+from conftest import parse_fixture
+from metrics import MetricsCache
+from metrics.registry import DEFAULT_REGISTRY
+
+
+def test_cache_key_tracks_chosen_overload_and_argument_count(tmp_path):
+    project = parse_fixture()
+    cache = MetricsCache(str(tmp_path / 'metrics.sqlite'), project.symbols, DEFAULT_REGISTRY.outputs)
+    key = 'com.a.model.User#label()'
+    method = project.symbols.methods[key]
+    call = next(c for c in method.method_calls if c.method_name == 'fmt')
+    assert call.resolved_method_key == 'com.a.util.Fmt#fmt(String)'
+    original = cache.cache_key(key, method)
+
+    # 方法源码不变，只是选中了另一个重载
+    call.resolved_method_key = 'com.a.util.Fmt#fmt(String,Object)'
+    switched = cache.cache_key(key, method)
+    assert switched != original
+
+    call.argument_count += 1
+    assert cache.cache_key(key, method) != switched
+    cache.close()
@@ -0,0 +1,14 @@
+import pytest
+
+from conftest import parse_fixture
+
+
+@pytest.mark.parametrize('rerun', [False, True])
+def test_parallel_type_resolution_matches_serial_diagnostics(rerun):
+    serial, parallel = parse_fixture(jobs=1), parse_fixture(jobs=2)
+    if rerun:
+        # 再次解析时已解析的槽位不计数
+        serial.resolve_all(jobs=1)
+        parallel.resolve_all(jobs=2)
+    assert parallel.diagnostics.resolved_count == serial.diagnostics.resolved_count
+    assert parallel.diagnostics.unresolved == serial.diagnostics.unresolved
@@ -0,0 +1,36 @@
+import numpy as np
+import pytest
+
+from metrics.aggregator import SCORED_METRICS, MetricsAggregator
+from metrics.quantiles import QuantileSketch, PercentileNormalizer
+
+
+def test_cdf_maps_corpus_minimum_to_zero():
+    sketch = QuantileSketch()
+    sketch.update(np.array([0, 0, 0, 0, 1, 2, 3, 4], dtype=np.float64))
+    assert sketch.cdf(np.array([0.0, 1.0, 4.0, 5.0])).tolist() == [0.0, 0.5, 0.875, 1.0]
+
+
+def test_percentile_scoring_keeps_all_zero_methods_easy():
+    # 大多数方法所有指标都是 0（getter、委托），少数方法较复杂
+    n = 100
+    columns = {name: np.zeros(n) for name in SCORED_METRICS}
+    for name in SCORED_METRICS:
+        columns[name][-10:] = np.arange(1, 11)
+
+    percentiles = PercentileNormalizer()
+    percentiles.update(columns)
+    scores = MetricsAggregator.score_columns(columns, percentiles=percentiles)
+
+    assert np.all(scores['overall'][:-10] == 0.0)
+    assert set(scores['level'][:-10]) == {'easy'}
+    assert scores['level'][-1] == 'hard'
+
+
+def test_percentile_scoring_rejects_metric_without_sketch():
+    columns = {name: np.arange(10, dtype=np.float64) for name in SCORED_METRICS}
+    percentiles = PercentileNormalizer()
+    # 例如草图生成时还没有某个插件指标
+    percentiles.update(columns, SCORED_METRICS[1:])
+    with pytest.raises(ValueError, match=SCORED_METRICS[0]):
+        MetricsAggregator.score_columns(columns, percentiles=percentiles)
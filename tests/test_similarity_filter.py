@@ -0,0 +1,53 @@
+import random
+from types import SimpleNamespace
+
+from filters.method_filter import SimilarityFilter
+
+
+def _methods(n, seed=0):
+    rng = random.Random(seed)
+    vocab = [f'w{i}' for i in range(400)]
+    bases = [rng.sample(vocab, rng.randint(5, 30)) for _ in range(n // 5)]
+    methods = []
+    for i in range(n):
+        if i % 7 == 0:
+            body = 'return null;'     # many identical trivial bodies
+        elif i % 11 == 0:
+            body = ''
+        else:
+            tokens = list(rng.choice(bases))
+            for _ in range(rng.randint(0, 2)):
+                tokens.append(rng.choice(vocab))
+            body = ' '.join(tokens)
+        methods.append(SimpleNamespace(
+            package_name='p', class_name=f'C{i % 9}', name=f'm{i}', signature=f'm{i}()',
+            body=body, cyclomatic_complexity=rng.randint(1, 4),
+        ))
+    return methods
+
+
+def _pairwise(methods, threshold):
+    f = SimilarityFilter(threshold)
+    keys = [f._method_key(m) for m in methods]
+    tokens = [f._tokenize(m.body) for m in methods]
+    filtered = set()
+    for i in range(len(methods)):
+        if keys[i] in filtered:
+            continue
+        for j in range(i + 1, len(methods)):
+            if keys[j] in filtered:
+                continue
+            if f._jaccard_similarity(tokens[i], tokens[j]) >= threshold:
+                if methods[i].cyclomatic_complexity >= methods[j].cyclomatic_complexity:
+                    filtered.add(keys[j])
+                else:
+                    filtered.add(keys[i])
+    return filtered
+
+
+def test_lsh_filter_matches_pairwise_scan_with_identical_bodies():
+    methods = _methods(600)
+    for threshold in (1.0, 0.85, 0.6):
+        f = SimilarityFilter(threshold)
+        f.analyze_similarity(methods)
+        assert f.methods_to_filter == _pairwise(methods, threshold)
@@ -0,0 +1,18 @@
+from core.call_graph import CallGraph
+from metrics import DifficultyEngine, MetricsCache
+from metrics.registry import DEFAULT_REGISTRY
+
+
+def test_top_k_with_cache_matches_uncached(eager_project, tmp_path):
+    graph_metrics = CallGraph.from_symbols(eager_project.symbols).analyze()
+    expected = DifficultyEngine(eager_project, graph_metrics).top_k(5)
+    assert len(expected) == 5
+
+    # 第一次运行写入缓存，第二次运行从缓存取指标
+    path = str(tmp_path / 'metrics.sqlite')
+    for run in range(2):
+        cache = MetricsCache(path, eager_project.symbols, DEFAULT_REGISTRY.outputs)
+        assert DifficultyEngine(eager_project, graph_metrics, cache).top_k(5) == expected
+        if run == 1:
+            assert cache.hits > 0
+        cache.close()